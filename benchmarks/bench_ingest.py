@@ -0,0 +1,44 @@
+"""
+Cost of due-date parsing on the task ingest path.
+
+Times ``dateutil.parser.parse`` against ``tasklib.dates.parse_date`` for
+ISO and free-form strings, then a bulk ``add_tasks`` import with ISO due
+dates. Run from the repository root:
+
+    python benchmarks/bench_ingest.py [count]
+"""
+
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dateutil import parser as date_parser
+
+from tasklib.dates import parse_date
+from tasklib.manager import TaskManager
+
+
+def main() -> None:
+    """Print per-call parse costs and the bulk ingest time."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    start = datetime(2026, 1, 1)
+    iso_dates = [(start + timedelta(minutes=i)).isoformat() for i in range(count)]
+    free_form = [f"Jan {1 + i % 28} 2026 {1 + i % 12}pm" for i in range(count)]
+
+    print(f"dates: {count}")
+    for label, dates in (("ISO 8601", iso_dates), ("free-form", free_form)):
+        for name, parse in (("dateutil", date_parser.parse), ("parse_date", parse_date)):
+            seconds = min(timeit.repeat(lambda: [parse(d) for d in dates], number=1, repeat=3))
+            print(f"{label:10} {name:11} {seconds / count * 1e6:8.2f} us/date")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TaskManager(storage_path=str(Path(tmp) / "tasks.json"))
+        rows = [{"title": f"Task {i}", "due_date": due} for i, due in enumerate(iso_dates)]
+        seconds = timeit.timeit(lambda: manager.add_tasks(rows), number=1)
+    print(f"add_tasks  {count} rows in {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
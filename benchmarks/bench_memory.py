@@ -0,0 +1,67 @@
+"""
+Memory footprint of Task instances.
+
+Compares bytes per task for the slotted ``Task``, created the way
+``TaskManager.add_task`` creates it, against the previous
+``__dict__``-backed layout. Run from the repository root:
+
+    python benchmarks/bench_memory.py [count]
+"""
+
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from tasklib.models import Priority, Status, Task
+
+
+@dataclass
+class DictTask:
+    """The pre-slots Task layout, kept here for comparison."""
+
+    title: str
+    description: str = ""
+    priority: Priority = Priority.MEDIUM
+    status: Status = Status.TODO
+    due_date: Optional[datetime] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+
+def bytes_per_task(
+    factory: Callable[..., object], count: int, timestamps: Callable[[], Dict[str, datetime]]
+) -> float:
+    """Measure the average allocation per task, including its field values."""
+    due = datetime.now() + timedelta(days=7)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [factory(title=f"Task {i}", due_date=due, **timestamps()) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tasks
+    return (after - before) / count
+
+
+def shared_timestamps() -> Dict[str, datetime]:
+    """Creation timestamps as TaskManager.add_task assigns them."""
+    now = datetime.now()
+    return {"created_at": now, "updated_at": now}
+
+
+def main() -> None:
+    """Print bytes per task for both layouts."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    before = bytes_per_task(DictTask, count, dict)
+    after = bytes_per_task(Task, count, shared_timestamps)
+    print(f"tasks:            {count}")
+    print(f"__dict__ layout:  {before:8.1f} bytes/task")
+    print(f"slotted layout:   {after:8.1f} bytes/task")
+    print(f"saved:            {before - after:8.1f} bytes/task ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Throughput of the tasks.json save and load paths.
+
+Compares the original ``asdict`` + ``json.dump(indent=2)`` round trip with
+``encode_tasks``/``decode_tasks``. Run from the repository root:
+
+    python benchmarks/bench_serialization.py [count]
+"""
+
+import json
+import sys
+import timeit
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from tasklib.models import Priority, Status, Task
+from tasklib.storage import decode_tasks, encode_tasks, orjson
+
+
+def legacy_to_dict(task: Task) -> dict:
+    """Task.to_dict as it was implemented with dataclasses.asdict."""
+    data = asdict(task)
+    data["priority"] = task.priority.value
+    data["status"] = task.status.value
+    data["created_at"] = task.created_at.isoformat()
+    data["updated_at"] = task.updated_at.isoformat()
+    if task.due_date:
+        data["due_date"] = task.due_date.isoformat()
+    return data
+
+
+def legacy_from_dict(data: dict) -> Task:
+    """Task.from_dict as it was implemented with a copied dict."""
+    data = data.copy()
+    data["priority"] = Priority(data["priority"])
+    data["status"] = Status(data["status"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+    if data.get("due_date"):
+        data["due_date"] = datetime.fromisoformat(data["due_date"])
+    return Task(**data)
+
+
+def make_tasks(count: int) -> list:
+    """Build a deterministic mix of tasks."""
+    now = datetime(2026, 1, 1)
+    priorities, statuses = list(Priority), list(Status)
+    return [
+        Task(
+            title=f"Task {i}",
+            description=f"Description for task {i}",
+            priority=priorities[i % len(priorities)],
+            status=statuses[i % len(statuses)],
+            due_date=now + timedelta(hours=i) if i % 2 else None,
+            created_at=now,
+            updated_at=now + timedelta(minutes=i % 3),
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    """Time both implementations and check the output is identical."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tasks = make_tasks(count)
+
+    legacy_text = json.dumps([legacy_to_dict(t) for t in tasks], indent=2)
+    assert encode_tasks(tasks) == legacy_text, "output is not byte-compatible"
+
+    results = {
+        "save (legacy)": lambda: json.dumps([legacy_to_dict(t) for t in tasks], indent=2),
+        "save (current)": lambda: encode_tasks(tasks),
+        "load (legacy)": lambda: [legacy_from_dict(d) for d in json.loads(legacy_text)],
+        "load (current)": lambda: decode_tasks(legacy_text),
+    }
+    print(f"tasks: {count}, orjson: {'yes' if orjson is not None else 'no'}")
+    for name, func in results.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:16} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Read throughput of a shared TaskManager as reader threads are added.
+
+Runs filter and search queries from 1 to 8 threads against one
+thread-safe manager while a single writer thread keeps adding and
+completing tasks, and reports reads per second. Run from the repository
+root:
+
+    python benchmarks/bench_threads.py [count] [seconds]
+
+Pure-Python queries hold the GIL, so totals stay roughly flat as threads
+are added; the numbers show the locking overhead and that the writer is
+not starved.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status
+
+
+def run(manager: TaskManager, readers: int, seconds: float) -> None:
+    """Print read and write counts for one reader-thread count."""
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(slot: int) -> None:
+        while not stop.is_set():
+            manager.filter_tasks(status=Status.TODO, priority=Priority.HIGH)
+            manager.search_tasks("Task 1", limit=10)
+            reads[slot] += 2
+
+    def writer() -> None:
+        while not stop.is_set():
+            task_id = manager.add_task(title="Written", priority=Priority.HIGH)
+            manager.update_task(task_id, status=Status.COMPLETED)
+            writes[0] += 2
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    manager.flush()
+    print(
+        f"{readers} readers {sum(reads) / seconds:10.0f} reads/s"
+        f" {writes[0] / seconds:8.0f} writes/s"
+    )
+
+
+def main() -> None:
+    """Populate a manager and measure each thread count."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    priorities = list(Priority)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TaskManager(
+            storage_path=str(Path(tmp) / "tasks.json"), text_index=True, background_save=True
+        )
+        manager.add_tasks(
+            {"title": f"Task {i}", "priority": priorities[i % len(priorities)]}
+            for i in range(count)
+        )
+        print(f"tasks: {count}")
+        for readers in (1, 2, 4, 8):
+            run(manager, readers, seconds)
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
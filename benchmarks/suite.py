@@ -0,0 +1,288 @@
+"""
+Regression benchmarks for the TaskManager and Task hot paths.
+
+Times each tracked operation on synthetic collections and records its
+peak traced memory, then optionally compares the results with a saved
+baseline and exits with status 1 if any operation got slower or used
+more memory than the threshold allows. Run from the repository root:
+
+    python benchmarks/suite.py --sizes 1k,100k --output baseline.json
+    # ... change the code ...
+    python benchmarks/suite.py --sizes 1k,100k --compare baseline.json
+
+Sizes accept ``k`` and ``M`` suffixes; ``1M`` takes a few minutes.
+Timings are the best of ``--repeat`` runs; memory is measured in a
+separate run under ``tracemalloc`` so tracing does not skew the times.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+from tasklib.storage import JournalStorage, JSONStorage
+
+WORDS = (
+    "report deploy review invoice backup migrate release audit design meeting "
+    "update database client server budget roadmap hiring security testing docs"
+).split()
+
+# Number of add_task calls timed per run, whatever the collection size.
+ADD_COUNT = 500
+
+# An operation returns the callable to time, given the collection size and
+# a scratch directory; the callable returns how many operations it ran.
+Benchmark = Callable[[int, Path], Callable[[], int]]
+
+
+def generate_tasks(count: int, seed: int = 0) -> List[Task]:
+    """
+    Build a reproducible synthetic collection.
+
+    Titles and descriptions are drawn from a small vocabulary, priorities
+    and statuses are spread over all values, and three quarters of the
+    tasks have a due date within 60 days either side of today.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    priorities, statuses = list(Priority), list(Status)
+    tasks = []
+    for i in range(count):
+        created = today - timedelta(days=90, seconds=count - i)
+        due = None
+        if rng.random() < 0.75:
+            due = today + timedelta(minutes=rng.randint(-60 * 24 * 60, 60 * 24 * 60))
+        tasks.append(
+            Task(
+                title=f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+                description=" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))),
+                priority=rng.choice(priorities),
+                status=rng.choice(statuses),
+                due_date=due,
+                id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                created_at=created,
+                updated_at=created,
+            )
+        )
+    return tasks
+
+
+def _manager(size: int, tmp: Path, **kwargs: Any) -> TaskManager:
+    """Create a manager holding ``size`` synthetic tasks, without saving them."""
+    manager = TaskManager(storage_path=str(tmp / "tasks.json"), lazy=True, **kwargs)
+    manager.tasks = generate_tasks(size)
+    return manager
+
+
+def bench_to_dict(size: int, tmp: Path) -> Callable[[], int]:
+    tasks = generate_tasks(size)
+    return lambda: len([task.to_dict() for task in tasks])
+
+
+def bench_from_dict(size: int, tmp: Path) -> Callable[[], int]:
+    data = [task.to_dict() for task in generate_tasks(size)]
+    return lambda: len([Task.from_dict(item) for item in data])
+
+
+def bench_save(size: int, tmp: Path) -> Callable[[], int]:
+    manager = _manager(size, tmp)
+
+    def run() -> int:
+        manager.save(force=True)
+        return 1
+
+    return run
+
+
+def bench_load(size: int, tmp: Path) -> Callable[[], int]:
+    JSONStorage(tmp / "tasks.json").save(generate_tasks(size))
+    manager = TaskManager(storage_path=str(tmp / "tasks.json"), lazy=True)
+
+    def run() -> int:
+        manager.load()
+        return 1
+
+    return run
+
+
+def bench_add_task(size: int, tmp: Path) -> Callable[[], int]:
+    storage = JournalStorage(tmp / "journal.json", compact_threshold=10 * ADD_COUNT)
+    manager = TaskManager(storage=storage, lazy=True)
+    manager.tasks = generate_tasks(size)
+    manager.save()
+    due = (datetime.now() + timedelta(days=3)).isoformat()
+
+    def run() -> int:
+        for i in range(ADD_COUNT):
+            manager.add_task(title=f"New {i}", priority=Priority.HIGH, due_date=due)
+        return ADD_COUNT
+
+    return run
+
+
+def bench_filter_tasks(size: int, tmp: Path) -> Callable[[], int]:
+    manager = _manager(size, tmp)
+
+    def run() -> int:
+        manager.filter_tasks(status=Status.TODO)
+        manager.filter_tasks(priority=Priority.HIGH, sort_by="due_date", limit=50)
+        manager.filter_tasks(overdue_only=True)
+        return 3
+
+    return run
+
+
+def bench_search_tasks(size: int, tmp: Path) -> Callable[[], int]:
+    manager = _manager(size, tmp)
+
+    def run() -> int:
+        manager.search_tasks("deploy")
+        manager.search_tasks("budget review", ranked=True, limit=20)
+        return 2
+
+    return run
+
+
+def bench_indexed_search(size: int, tmp: Path) -> Callable[[], int]:
+    manager = _manager(size, tmp, text_index=True)
+
+    def run() -> int:
+        manager.search_tasks("deploy")
+        manager.search_tasks("budget review", ranked=True, limit=20)
+        return 2
+
+    return run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "Task.to_dict": bench_to_dict,
+    "Task.from_dict": bench_from_dict,
+    "TaskManager.save": bench_save,
+    "TaskManager.load": bench_load,
+    "TaskManager.add_task": bench_add_task,
+    "TaskManager.filter_tasks": bench_filter_tasks,
+    "TaskManager.search_tasks": bench_search_tasks,
+    "TaskManager.search_tasks[index]": bench_indexed_search,
+}
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``1000``, ``100k`` or ``1M``."""
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1].lower(), 1)
+    return int(text[:-1] if multiplier > 1 else text) * multiplier
+
+
+def measure(benchmark: Benchmark, size: int, repeat: int) -> Dict[str, float]:
+    """Return the best time per operation and the peak traced memory of one run."""
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            run = benchmark(size, Path(tmp))
+            start = time.perf_counter()
+            ops = run()
+            best = min(best, (time.perf_counter() - start) / ops)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run = benchmark(size, Path(tmp))
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": float(peak)}
+
+
+def run_suite(
+    sizes: List[int], names: List[str], repeat: int
+) -> Iterator[Tuple[str, Dict[str, float]]]:
+    """Measure every selected benchmark at every size."""
+    for size in sizes:
+        for name in names:
+            yield f"{name}@{size}", measure(BENCHMARKS[name], size, repeat)
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    memory_threshold: float,
+) -> List[str]:
+    """
+    List the results that regressed against the baseline.
+
+    Args:
+        results: Current measurements
+        baseline: Earlier measurements; keys missing from either side are skipped
+        threshold: Largest allowed relative slowdown, e.g. 0.1 for 10%
+        memory_threshold: Largest allowed relative growth of peak memory
+
+    Returns:
+        One message per regressed metric
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, limit in (("seconds", threshold), ("peak_bytes", memory_threshold)):
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + limit):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(f"{key} {metric}: +{change:.0%} (limit {limit:.0%})")
+    return regressions
+
+
+def main() -> None:
+    """Run the suite and optionally save or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1k,100k", help="comma-separated collection sizes")
+    parser.add_argument(
+        "--only", default="", help="comma-separated benchmark names; default is all"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown")
+    parser.add_argument(
+        "--memory-threshold", type=float, default=0.10, help="allowed peak memory growth"
+    )
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for key, result in run_suite(sizes, names, args.repeat):
+        results[key] = result
+        print(
+            f"{key:42} {result['seconds'] * 1e6:12.2f} us/op"
+            f" {result['peak_bytes'] / 1e6:10.2f} MB peak"
+        )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
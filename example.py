@@ -76,11 +76,12 @@ def main():
     
     # Display summary
     print("\n📊 Summary:")
-    all_tasks = manager.get_tasks()
-    print(f"  Total tasks: {len(all_tasks)}")
-    print(f"  TODO: {len(manager.filter_tasks(status=Status.TODO))}")
-    print(f"  In Progress: {len(manager.filter_tasks(status=Status.IN_PROGRESS))}")
-    print(f"  Completed: {len(manager.filter_tasks(status=Status.COMPLETED))}")
+    stats = manager.stats()
+    print(f"  Total tasks: {stats.total}")
+    print(f"  TODO: {stats.by_status[Status.TODO]}")
+    print(f"  In Progress: {stats.by_status[Status.IN_PROGRESS]}")
+    print(f"  Completed: {stats.by_status[Status.COMPLETED]}")
+    print(f"  Overdue: {stats.overdue}")
     
     print("\n" + "=" * 60)
     print("Example completed! Tasks saved to example_tasks.json")
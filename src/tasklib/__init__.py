@@ -5,8 +5,40 @@ This module provides a TaskManager class for managing tasks with priorities,
 statuses, and due dates.
 """
 
-from tasklib.models import Task, Priority, Status
+from tasklib.models import Task, TaskStats, Priority, Status
 from tasklib.manager import TaskManager
+from tasklib.feed import ChangeEvent, ChangeFeed
+from tasklib.cache import CacheStats, QueryCache
+from tasklib.bulk import ImportReport, RowError
+from tasklib.metrics import Metrics, OperationMetrics
+from tasklib.storage import Durability, Storage, JSONStorage, NDJSONStorage, JournalStorage
+from tasklib.binary import BinaryStorage
+from tasklib.sqlite import SQLiteTaskManager
+from tasklib.aio import AsyncTaskManager
+from tasklib.sharding import ShardedTaskManager
 
 __version__ = "0.1.0"
-__all__ = ["Task", "Priority", "Status", "TaskManager"]
+__all__ = [
+    "Task",
+    "TaskStats",
+    "Priority",
+    "Status",
+    "TaskManager",
+    "SQLiteTaskManager",
+    "AsyncTaskManager",
+    "ShardedTaskManager",
+    "ChangeEvent",
+    "ChangeFeed",
+    "CacheStats",
+    "QueryCache",
+    "ImportReport",
+    "RowError",
+    "Metrics",
+    "OperationMetrics",
+    "Durability",
+    "Storage",
+    "JSONStorage",
+    "NDJSONStorage",
+    "JournalStorage",
+    "BinaryStorage",
+]
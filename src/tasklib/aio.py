@@ -0,0 +1,261 @@
+"""asyncio front end for the task manager."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Mapping, Optional, TypeVar, Union
+
+from tasklib.manager import TaskManager
+from tasklib.models import Task, TaskStats, Priority, Status
+from tasklib.storage import Storage
+
+T = TypeVar("T")
+
+
+class AsyncTaskManager:
+    """
+    Task manager for asyncio applications.
+
+    Wraps a thread-safe :class:`~tasklib.manager.TaskManager` with
+    ``background_save`` enabled. Every call runs on a dedicated worker
+    thread, in the order the calls were made, so the event loop never
+    waits for a lock or a disk write. Mutations return as soon as they are
+    applied in memory; a saver thread coalesces bursts of them into one
+    write. ``await flush()`` waits until everything is on disk.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "tasks.json",
+        storage: Optional[Storage] = None,
+        text_index: bool = False,
+    ):
+        """
+        Initialize the task manager.
+
+        Tasks are loaded on the worker thread by the first call, or by
+        :meth:`load`, so constructing the manager does not block.
+
+        Args:
+            storage_path: Path to JSON file for persistent storage
+            storage: Storage backend to use instead of a plain JSON file
+            text_index: Maintain an n-gram index so searches avoid a full scan
+        """
+        self.manager = TaskManager(
+            storage_path=storage_path,
+            storage=storage,
+            text_index=text_index,
+            lazy=True,
+            background_save=True,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tasklib-async")
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a manager method on the worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def load(self) -> None:
+        """Load tasks from storage."""
+        await self._run(self.manager.load)
+
+    async def save(self, force: bool = False) -> None:
+        """
+        Write the full task collection to storage.
+
+        Args:
+            force: Write even if nothing changed since the last save
+        """
+        await self._run(self.manager.save, force)
+
+    async def flush(self) -> None:
+        """
+        Wait until every mutation awaited so far has been written to storage.
+
+        Raises:
+            Exception: The error raised by a failed background write
+        """
+        loop = asyncio.get_running_loop()
+        # The default executor, so waiting does not hold up the worker thread.
+        await loop.run_in_executor(None, self.manager.flush)
+
+    async def close(self) -> None:
+        """Write outstanding changes and stop the worker and saver threads."""
+        await self._run(self.manager.close)
+        self._executor.shutdown()
+
+    async def __aenter__(self) -> "AsyncTaskManager":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def add_task(
+        self,
+        title: str,
+        description: str = "",
+        priority: Priority = Priority.MEDIUM,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> str:
+        """
+        Add a new task.
+
+        Args:
+            title: Task title
+            description: Task description
+            priority: Task priority
+            due_date: Due date as a datetime, ISO string or parseable date
+
+        Returns:
+            The ID of the created task
+        """
+        return await self._run(self.manager.add_task, title, description, priority, due_date)
+
+    async def get_task(self, task_id: str) -> Optional[Task]:
+        """Get a task by ID."""
+        return await self._run(self.manager.get_task, task_id)
+
+    async def get_tasks(self) -> List[Task]:
+        """Get all tasks."""
+        return await self._run(self.manager.get_tasks)
+
+    async def update_task(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> bool:
+        """
+        Update an existing task.
+
+        Args:
+            task_id: ID of task to update
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            True if task was updated, False if not found
+        """
+        return await self._run(
+            self.manager.update_task, task_id, title, description, priority, status, due_date
+        )
+
+    async def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task.
+
+        Args:
+            task_id: ID of task to delete
+
+        Returns:
+            True if task was deleted, False if not found
+        """
+        return await self._run(self.manager.delete_task, task_id)
+
+    async def add_tasks(self, tasks: Iterable[Mapping[str, Any]]) -> List[str]:
+        """
+        Add several tasks with a single write.
+
+        Args:
+            tasks: Keyword arguments for :meth:`add_task`, one mapping per task
+
+        Returns:
+            The IDs of the created tasks, in input order
+        """
+        return await self._run(self.manager.add_tasks, list(tasks))
+
+    async def update_tasks(
+        self,
+        task_ids: Iterable[str],
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> int:
+        """
+        Apply the same update to several tasks with a single write.
+
+        Args:
+            task_ids: IDs of tasks to update; unknown IDs are skipped
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            Number of tasks updated
+        """
+        return await self._run(
+            self.manager.update_tasks,
+            list(task_ids),
+            title,
+            description,
+            priority,
+            status,
+            due_date,
+        )
+
+    async def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        Delete several tasks with a single write.
+
+        Args:
+            task_ids: IDs of tasks to delete; unknown IDs are skipped
+
+        Returns:
+            Number of tasks deleted
+        """
+        return await self._run(self.manager.delete_tasks, list(task_ids))
+
+    async def filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+    ) -> List[Task]:
+        """
+        Filter tasks by criteria.
+
+        Args:
+            status: Filter by status
+            priority: Filter by priority
+            overdue_only: Only return overdue tasks
+
+        Returns:
+            List of matching tasks
+        """
+        return await self._run(self.manager.filter_tasks, status, priority, overdue_only)
+
+    async def search_tasks(
+        self, query: str, ranked: bool = False, limit: Optional[int] = None
+    ) -> List[Task]:
+        """
+        Search tasks by title or description.
+
+        Args:
+            query: Search query string
+            ranked: Order title matches before description-only matches
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of matching tasks, in insertion order unless ranked
+        """
+        return await self._run(self.manager.search_tasks, query, ranked, limit)
+
+    async def stats(self) -> TaskStats:
+        """
+        Summarize the collection.
+
+        Returns:
+            Counts per status and priority, overdue tasks and a due-date histogram
+        """
+        return await self._run(self.manager.stats)
@@ -0,0 +1,395 @@
+"""
+Binary snapshot storage with memory-mapped, random-access reads.
+
+A snapshot is a single little-endian file::
+
+    header       magic, version, task count and the offset of each section
+    id table     (hash, row) pairs sorted by hash, for binary search by ID
+    offsets      start of each row's record, plus the end of the last one
+    due_date     int64 microseconds per row, see tasklib.columnar.epoch_us
+    priority     int8 code per row
+    status       int8 code per row
+    records      one compact JSON object per row, in insertion order
+
+Opening a snapshot maps it without reading it. Looking up a task touches
+a few pages of the id table and its own record, and a filter reads only
+the columns it tests plus the records it returns, so a process that needs
+one task or one filter does not pay for parsing the whole collection.
+
+Convert existing JSON files with :func:`pack` and back with
+:func:`unpack`, or from the command line::
+
+    python -m tasklib.binary pack tasks.json tasks.bin
+    python -m tasklib.binary unpack tasks.bin tasks.json
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Collection, Iterator, List, Optional, Sequence, Union
+
+from tasklib.columnar import NO_DATE, PRIORITIES, STATUSES, epoch_us
+from tasklib.models import Priority, Status, Task
+from tasklib.storage import Durability, JSONStorage, Storage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+MAGIC = b"TASKBIN\x00"
+VERSION = 1
+
+# magic, version, reserved, count, then the offsets of the id table, the
+# record offsets, the due_date, priority and status columns and the records.
+_HEADER = struct.Struct("<8sIIQQQQQQQ")
+_ENTRY = struct.Struct("<QQ")
+
+_COMPLETED = STATUSES.index(Status.COMPLETED)
+
+
+def id_hash(task_id: str) -> int:
+    """Return the 64-bit hash under which a task ID is stored in the id table."""
+    return int.from_bytes(
+        hashlib.blake2b(task_id.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to a multiple of 8."""
+    return (offset + 7) & ~7
+
+
+def _int64s(data: bytes) -> Sequence[int]:
+    """Interpret little-endian bytes as int64 values."""
+    values = array("q")
+    values.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        values.byteswap()
+    return values
+
+
+def _encode_records(tasks: Collection[Task]) -> List[bytes]:
+    """Encode each task as compact JSON."""
+    if orjson is not None:
+        return [orjson.dumps(task.to_dict()) for task in tasks]
+    return [json.dumps(task.to_dict(), separators=(",", ":")).encode("utf-8") for task in tasks]
+
+
+def _record_positions(records: Sequence[bytes], start: int) -> "array[int]":
+    """Return the offset of each record laid out from ``start``, plus the end offset."""
+    positions = array("q", [0] * (len(records) + 1))
+    position = start
+    for row, record in enumerate(records):
+        positions[row] = position
+        position += len(record)
+    positions[len(records)] = position
+    return positions
+
+
+def encode_snapshot(tasks: Collection[Task]) -> bytes:
+    """
+    Encode tasks in the binary snapshot format.
+
+    Args:
+        tasks: The tasks, in insertion order
+
+    Returns:
+        The snapshot file contents
+    """
+    records = _encode_records(tasks)
+    count = len(records)
+
+    index_offset = _HEADER.size
+    offsets_offset = index_offset + _ENTRY.size * count
+    due_offset = offsets_offset + 8 * (count + 1)
+    priority_offset = due_offset + 8 * count
+    status_offset = priority_offset + count
+    records_offset = _align(status_offset + count)
+
+    entries = sorted((id_hash(task.id), row) for row, task in enumerate(tasks))
+    positions = _record_positions(records, records_offset)
+    due = array("q", (NO_DATE if t.due_date is None else epoch_us(t.due_date) for t in tasks))
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        positions.byteswap()
+        due.byteswap()
+
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            0,
+            count,
+            index_offset,
+            offsets_offset,
+            due_offset,
+            priority_offset,
+            status_offset,
+            records_offset,
+        ),
+        b"".join(_ENTRY.pack(*entry) for entry in entries),
+        positions.tobytes(),
+        due.tobytes(),
+        bytes(PRIORITIES.index(task.priority) for task in tasks),
+        bytes(STATUSES.index(task.status) for task in tasks),
+        b"\x00" * (records_offset - status_offset - count),
+    ]
+    parts.extend(records)
+    return b"".join(parts)
+
+
+class BinaryStorage(Storage):
+    """
+    Stores tasks in the binary snapshot format and reads them through ``mmap``.
+
+    Saves rewrite the whole file atomically, like :class:`JSONStorage`, so
+    the format suits collections that are read far more often than they
+    change. Use it with ``TaskManager(lazy=True)`` so that :meth:`get_task
+    <tasklib.manager.TaskManager.get_task>` and unsorted
+    :meth:`filter_tasks <tasklib.manager.TaskManager.filter_tasks>` are
+    served from the mapping until a mutation loads the collection.
+    """
+
+    random_access = True
+
+    def __init__(self, path: Union[str, Path], durability: Durability = Durability.NONE):
+        """
+        Initialize the binary storage.
+
+        Args:
+            path: Path to the snapshot file
+            durability: Whether writes are fsynced, and whether the
+                directory entry is fsynced after a rename
+        """
+        super().__init__(path, durability)
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_signature: object = None
+        self._count = 0
+        self._sections: Sequence[int] = ()
+
+    def _open(self) -> Optional[mmap.mmap]:
+        """
+        Map the current file, remapping if it was replaced since.
+
+        Returns:
+            The mapping, or None if the file does not exist
+
+        Raises:
+            ValueError: If the file is not a binary snapshot
+        """
+        signature = self.signature()
+        if self._map is not None and signature == self._mapped_signature:
+            return self._map
+        self._unmap()
+        if signature[0] is None:
+            return None
+        with open(self.path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < _HEADER.size:
+            mapping.close()
+            raise ValueError(f"{self.path} is not a task snapshot")
+        magic, version, _, count, *sections = _HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            mapping.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} task snapshot")
+        self._map, self._mapped_signature = mapping, signature
+        self._count, self._sections = count, sections
+        return mapping
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self) -> None:
+        """Unmap the snapshot and release the lock file."""
+        self._unmap()
+        super().close()
+
+    def _record(self, mapping: mmap.mmap, row: int) -> Task:
+        """Decode the task stored in a row."""
+        start, end = struct.unpack_from("<qq", mapping, self._sections[1] + 8 * row)
+        loads = orjson.loads if orjson is not None else json.loads
+        return Task.from_dict(loads(mapping[start:end]))
+
+    def load(self) -> List[Task]:
+        """Load all tasks from the snapshot."""
+        return list(self.iter_tasks())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Decode tasks one record at a time, in insertion order."""
+        mapping = self._open()
+        if mapping is None:
+            return
+        for row in range(self._count):
+            yield self._record(mapping, row)
+
+    def save(self, tasks: Collection[Task]) -> None:
+        """Write a new snapshot."""
+        data = self.metrics.call("storage.encode", encode_snapshot, tasks)
+        # Some platforms cannot replace a file that is still mapped.
+        self._unmap()
+        self._write_atomic(self.path, data)
+
+    def read_task(self, task_id: str) -> Optional[Task]:
+        """
+        Read one task by binary search over the id table.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            The task, or None if it is not stored
+        """
+        mapping = self._open()
+        if mapping is None:
+            return None
+        base = self._sections[0]
+        target = id_hash(task_id)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if _ENTRY.unpack_from(mapping, base + _ENTRY.size * middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        position = low
+        while position < self._count:
+            entry_hash, row = _ENTRY.unpack_from(mapping, base + _ENTRY.size * position)
+            if entry_hash != target:
+                break
+            task = self._record(mapping, row)
+            if task.id == task_id:
+                return task
+            position += 1
+        return None
+
+    def filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        now: Optional[datetime] = None,
+    ) -> List[Task]:
+        """
+        Read the tasks matching a filter, testing only the columns involved.
+
+        Args:
+            status: Filter by status
+            priority: Filter by priority
+            overdue_only: Only return overdue tasks
+            descending: Return the tasks in reverse insertion order
+            limit: Maximum number of tasks to return
+            offset: Number of matching tasks to skip
+            now: Current time for the overdue check; defaults to now
+
+        Returns:
+            Matching tasks in insertion order, or reversed if ``descending``
+        """
+        mapping = self._open()
+        if mapping is None:
+            return []
+        rows = self._column_rows(mapping, status, priority)
+        if overdue_only:
+            rows = self._overdue_rows(mapping, rows, now)
+        selected: Sequence[int] = range(self._count) if rows is None else rows
+        if descending:
+            selected = selected[::-1]
+        stop = None if limit is None else offset + limit
+        return [self._record(mapping, row) for row in selected[offset:stop]]
+
+    def _column_rows(
+        self, mapping: mmap.mmap, status: Optional[Status], priority: Optional[Priority]
+    ) -> Optional[List[int]]:
+        """Return the rows matching the status and priority, or None if neither is given."""
+        count = self._count
+        rows: Optional[List[int]] = None
+        for column_offset, code in (
+            (self._sections[4], None if status is None else STATUSES.index(status)),
+            (self._sections[3], None if priority is None else PRIORITIES.index(priority)),
+        ):
+            if code is None:
+                continue
+            column = mapping[column_offset : column_offset + count]
+            if rows is None:
+                rows = [match.start() for match in re.finditer(re.escape(bytes([code])), column)]
+            else:
+                rows = [row for row in rows if column[row] == code]
+        return rows
+
+    def _overdue_rows(
+        self, mapping: mmap.mmap, rows: Optional[List[int]], now: Optional[datetime]
+    ) -> List[int]:
+        """Narrow rows, or all rows if None, to open tasks due before ``now``."""
+        count = self._count
+        due_offset, status_offset = self._sections[2], self._sections[4]
+        moment = epoch_us(now if now is not None else datetime.now())
+        due = _int64s(mapping[due_offset : due_offset + 8 * count])
+        statuses = mapping[status_offset : status_offset + count]
+        return [
+            row
+            for row in (range(count) if rows is None else rows)
+            if NO_DATE < due[row] < moment and statuses[row] != _COMPLETED
+        ]
+
+
+def pack(json_path: Union[str, Path], binary_path: Union[str, Path]) -> int:
+    """
+    Convert a JSON task file to a binary snapshot.
+
+    Args:
+        json_path: Source file written by :class:`~tasklib.storage.JSONStorage`
+        binary_path: Destination snapshot
+
+    Returns:
+        Number of tasks converted
+    """
+    tasks = JSONStorage(json_path).load()
+    BinaryStorage(binary_path).save(tasks)
+    return len(tasks)
+
+
+def unpack(binary_path: Union[str, Path], json_path: Union[str, Path]) -> int:
+    """
+    Convert a binary snapshot to a JSON task file.
+
+    Args:
+        binary_path: Source snapshot
+        json_path: Destination file, in the :class:`~tasklib.storage.JSONStorage` format
+
+    Returns:
+        Number of tasks converted
+    """
+    storage = BinaryStorage(binary_path)
+    try:
+        tasks = storage.load()
+    finally:
+        storage.close()
+    JSONStorage(json_path).save(tasks)
+    return len(tasks)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Convert between JSON task files and binary snapshots."""
+    parser = argparse.ArgumentParser(prog="python -m tasklib.binary", description=main.__doc__)
+    parser.add_argument("command", choices=("pack", "unpack"))
+    parser.add_argument("source", type=Path)
+    parser.add_argument("target", type=Path)
+    args = parser.parse_args(argv)
+    convert = pack if args.command == "pack" else unpack
+    count = convert(args.source, args.target)
+    print(f"Converted {count} tasks from {args.source} to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Streaming import and export of tasks as NDJSON or CSV.
+
+Both formats hold one task per record with the fields of
+:meth:`Task.to_dict <tasklib.models.Task.to_dict>`. On import, only
+``title`` is required: a missing ``id`` is generated, ``priority`` and
+``status`` default to medium and todo, missing timestamps default to the
+time of the import, and dates that are not ISO 8601 are parsed with
+:func:`~tasklib.dates.parse_date`. In CSV files, empty cells count as
+missing and columns other than the task fields are ignored.
+"""
+
+import csv
+import json
+import os
+import stat
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from tasklib.dates import parse_date
+from tasklib.models import Task
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+FORMATS = ("ndjson", "csv")
+
+# CSV columns, in the order they are exported.
+FIELDS = (
+    "id",
+    "title",
+    "description",
+    "priority",
+    "status",
+    "due_date",
+    "created_at",
+    "updated_at",
+)
+
+_SUFFIXES = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+_DATE_FIELDS = ("due_date", "created_at", "updated_at")
+# Fields that must hold strings; priority and status are checked by their enums.
+_STRING_FIELDS = ("id", "title", "description") + _DATE_FIELDS
+
+# A raw record and its line number: a text line for NDJSON, cells for CSV.
+_Row = Tuple[int, Any]
+
+
+@dataclass(frozen=True)
+class RowError:
+    """
+    A record that could not be imported.
+
+    Attributes:
+        line: Line number of the record in the source file, counting from 1;
+            for CSV, the line the record ends on
+        message: Why the record was rejected
+    """
+
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """
+    Outcome of :meth:`TaskManager.import_tasks <tasklib.manager.TaskManager.import_tasks>`.
+
+    Attributes:
+        imported: Number of tasks added
+        errors: Rejected records, by line number
+    """
+
+    imported: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+
+def detect_format(path: Union[str, Path], fmt: Optional[str] = None) -> str:
+    """
+    Resolve the format of a file from an explicit name or its suffix.
+
+    Args:
+        path: The file
+        fmt: ``"ndjson"`` or ``"csv"``; inferred from a ``.ndjson``,
+            ``.jsonl`` or ``.csv`` suffix when None
+
+    Returns:
+        The format name
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    if fmt is None:
+        fmt = _SUFFIXES.get(Path(path).suffix.lower())
+        if fmt is None:
+            raise ValueError(f"Cannot infer the format of {path}; pass one of {FORMATS}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {FORMATS}")
+    return fmt
+
+
+def _task_from_record(record: Dict[str, Any], now: str) -> Task:
+    """Validate an imported record and build its task."""
+    data = {key: value for key, value in record.items() if value is not None and value != ""}
+    for name in _STRING_FIELDS:
+        if name in data and not isinstance(data[name], str):
+            raise ValueError(f"{name} must be a string, not {type(data[name]).__name__}")
+    data.setdefault("priority", "medium")
+    data.setdefault("status", "todo")
+    data.setdefault("created_at", now)
+    data.setdefault("updated_at", data["created_at"])
+    try:
+        return Task.from_dict(data)
+    except ValueError:
+        # Slow path for exports whose dates are not ISO 8601.
+        for key in _DATE_FIELDS:
+            if isinstance(data.get(key), str):
+                data[key] = parse_date(data[key]).isoformat()
+        return Task.from_dict(data)
+
+
+def _parse_chunk(
+    fmt: str, header: Sequence[str], rows: List[_Row], now: str
+) -> List[Tuple[int, Union[Task, RowError]]]:
+    """Parse and validate a chunk of records; executed in a pool worker."""
+    loads = orjson.loads if orjson is not None else json.loads
+    results: List[Tuple[int, Union[Task, RowError]]] = []
+    for line, raw in rows:
+        try:
+            if fmt == "csv":
+                if len(raw) != len(header):
+                    raise ValueError(f"expected {len(header)} fields, found {len(raw)}")
+                record = dict(zip(header, raw))
+            else:
+                record = loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+            results.append((line, _task_from_record(record, now)))
+        except KeyError as exc:
+            results.append((line, RowError(line, f"missing field {exc}")))
+        except (OverflowError, TypeError, ValueError) as exc:
+            results.append((line, RowError(line, str(exc))))
+    return results
+
+
+def _chunks(path: Path, fmt: str, chunk_size: int) -> Iterator[Tuple[List[str], List[_Row]]]:
+    """Read records in chunks, with the CSV header, without parsing them."""
+    rows: List[_Row] = []
+    if fmt == "csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            for cells in reader:
+                if cells:
+                    rows.append((reader.line_num, cells))
+                    if len(rows) == chunk_size:
+                        yield header, rows
+                        rows = []
+    else:
+        header = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line, text in enumerate(f, 1):
+                if text.strip():
+                    rows.append((line, text))
+                    if len(rows) == chunk_size:
+                        yield header, rows
+                        rows = []
+    if rows:
+        yield header, rows
+
+
+def read_tasks(
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    processes: Optional[int] = None,
+    chunk_size: int = 10_000,
+) -> Iterator[Tuple[int, Union[Task, RowError]]]:
+    """
+    Stream tasks from an NDJSON or CSV file.
+
+    The file is read in chunks of ``chunk_size`` records. With
+    ``processes``, the chunks are parsed in a process pool, at most two
+    per worker at a time, so memory stays bounded however large the file.
+
+    Args:
+        path: The file to read
+        fmt: ``"ndjson"`` or ``"csv"``; inferred from the suffix when None
+        processes: Number of worker processes; records are parsed in this
+            process when None
+        chunk_size: Number of records per chunk
+
+    Yields:
+        The line number of each record with its task, or the reason it
+        was rejected, in file order
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    path = Path(path)
+    fmt = detect_format(path, fmt)
+    now = datetime.now().isoformat()
+    chunks = _chunks(path, fmt, max(chunk_size, 1))
+    if processes is None:
+        for header, rows in chunks:
+            yield from _parse_chunk(fmt, header, rows, now)
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        pending: Deque["Future[List[Tuple[int, Union[Task, RowError]]]]"] = deque()
+        for header, rows in chunks:
+            pending.append(pool.submit(_parse_chunk, fmt, header, rows, now))
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_tasks(path: Union[str, Path], tasks: Iterable[Task], fmt: Optional[str] = None) -> int:
+    """
+    Write tasks to an NDJSON or CSV file, one record at a time.
+
+    The records go to a temporary file in the same directory, which then
+    replaces ``path``, so an interrupted export leaves any previous file
+    intact.
+
+    Args:
+        path: The file to write
+        tasks: The tasks to export, consumed lazily
+        fmt: ``"ndjson"`` or ``"csv"``; inferred from the suffix when None
+
+    Returns:
+        Number of tasks written
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    path = Path(path)
+    fmt = detect_format(path, fmt)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    count = 0
+    try:
+        if path.exists():
+            os.chmod(tmp_name, stat.S_IMODE(path.stat().st_mode))
+        with open(fd, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                for task in tasks:
+                    data = task.to_dict()
+                    writer.writerow(["" if data[name] is None else data[name] for name in FIELDS])
+                    count += 1
+            else:
+                for task in tasks:
+                    f.write(json.dumps(task.to_dict(), separators=(",", ":")) + "\n")
+                    count += 1
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return count
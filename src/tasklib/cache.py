@@ -0,0 +1,147 @@
+"""LRU cache of query results, invalidated by a mutation generation counter."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Hashable, List, NamedTuple, Optional, Tuple
+
+from tasklib.models import Task
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a :class:`QueryCache`.
+
+    ``expirations`` counts entries dropped because their TTL passed or a
+    task they exclude became overdue; ``invalidations`` counts entries
+    dropped because the collection changed since they were stored.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache, 0.0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry(NamedTuple):
+    # time.monotonic() after which the entry is stale, if there is a TTL.
+    expires: Optional[float]
+    # Wall-clock moment after which an overdue query could match more tasks.
+    valid_until: Optional[datetime]
+    results: Tuple[Task, ...]
+
+
+class QueryCache:
+    """
+    Least-recently-used cache of query results.
+
+    Results are tagged with the generation of the collection they were
+    computed from. The owner bumps the generation on every mutation, and
+    the first lookup or store under a new generation drops every entry,
+    so results are reused exactly as long as nothing has changed.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of results kept
+            ttl: Seconds after which a result is recomputed even if nothing
+                changed; None keeps results until they are invalidated
+
+        Raises:
+            ValueError: If ``max_size`` is less than 1 or ``ttl`` is not positive
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._generation: Optional[int] = None
+
+    def _sync(self, generation: int) -> None:
+        """Drop every entry if the collection changed; the caller holds the lock."""
+        if generation != self._generation:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: int) -> Optional[List[Task]]:
+        """
+        Look up the results of a query.
+
+        Args:
+            key: Normalized query arguments
+            generation: Current generation of the collection
+
+        Returns:
+            A new list of the cached tasks, or None on a miss
+        """
+        with self._lock:
+            self._sync(generation)
+            entry = self._entries.get(key)
+            if entry is not None and (
+                (entry.expires is not None and time.monotonic() > entry.expires)
+                or (entry.valid_until is not None and datetime.now() > entry.valid_until)
+            ):
+                self._stats.expirations += 1
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return list(entry.results)
+
+    def put(
+        self,
+        key: Hashable,
+        generation: int,
+        results: List[Task],
+        valid_until: Optional[datetime] = None,
+    ) -> None:
+        """
+        Store the results of a query.
+
+        Args:
+            key: Normalized query arguments
+            generation: Generation of the collection the results came from
+            results: The tasks returned by the query
+            valid_until: For time-dependent queries, the moment after which
+                the results may be wrong even if nothing changed
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._sync(generation)
+            self._entries[key] = _Entry(expires, valid_until, tuple(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the counters."""
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
@@ -0,0 +1,170 @@
+"""Locking and background persistence for sharing a manager across threads."""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, Optional
+
+
+class NullLock:
+    """A lock that does nothing, used when thread safety is disabled."""
+
+    _context = nullcontext()
+
+    def read(self) -> ContextManager[None]:
+        """Return a no-op context manager."""
+        return self._context
+
+    def write(self) -> ContextManager[None]:
+        """Return a no-op context manager."""
+        return self._context
+
+
+class ReadWriteLock:
+    """
+    Readers-writer lock: many concurrent readers or one writer.
+
+    Waiting writers block new readers, so a steady stream of reads cannot
+    starve writes. Both modes are reentrant for the owning thread, and a
+    thread holding the write lock may also read. Upgrading a read lock to a
+    write lock is not supported and raises :class:`RuntimeError`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock in shared mode for the duration of the block."""
+        depth = getattr(self._local, "reads", 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.reads = depth + 1
+            try:
+                yield
+            finally:
+                self._local.reads = depth
+            return
+
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.reads = 1
+        try:
+            yield
+        finally:
+            self._local.reads = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock in exclusive mode for the duration of the block."""
+        me = threading.get_ident()
+        if self._writer == me:
+            yield
+            return
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class BackgroundSaver:
+    """
+    Runs a flush callback on a daemon thread, coalescing requests.
+
+    Every :meth:`schedule` call made while a flush is pending or running
+    is served by the next single flush, so a burst of writes costs one or
+    two saves rather than one per write.
+    """
+
+    def __init__(self, flush: Callable[[], None], delay: float = 0.05):
+        """
+        Initialize and start the saver thread.
+
+        Args:
+            flush: Callback that persists all outstanding changes
+            delay: Seconds to wait after a request so more can coalesce
+        """
+        self._flush = flush
+        self._delay = delay
+        self._cond = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._closed = False
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="tasklib-saver", daemon=True)
+        self._thread.start()
+
+    def schedule(self) -> None:
+        """Request a flush."""
+        with self._cond:
+            self._requested += 1
+            self._cond.notify_all()
+
+    def wait(self) -> None:
+        """
+        Block until every flush requested so far has completed.
+
+        Raises:
+            BaseException: The error raised by the most recent failed flush
+        """
+        with self._cond:
+            target = self._requested
+            while self._completed < target and self._thread.is_alive():
+                self._cond.wait()
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush outstanding requests and stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._completed == self._requested and not self._closed:
+                    self._cond.wait()
+                if self._completed == self._requested:
+                    return
+                closed = self._closed
+            if self._delay and not closed:
+                time.sleep(self._delay)
+            with self._cond:
+                target = self._requested
+            error: Optional[BaseException] = None
+            try:
+                self._flush()
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc
+            with self._cond:
+                if error is not None:
+                    self.error = error
+                self._completed = target
+                self._cond.notify_all()
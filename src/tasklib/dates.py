@@ -0,0 +1,46 @@
+"""Date parsing helpers."""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Union
+
+from dateutil import parser as date_parser
+
+
+def parse_date(value: Union[str, datetime]) -> datetime:
+    """
+    Parse a due date.
+
+    ISO 8601 strings are handled by :meth:`datetime.fromisoformat`. Other
+    strings fall back to ``dateutil``, whose results are cached because it
+    is much slower and free-form inputs tend to repeat. Fields missing from
+    the string, as in ``"17:00"`` or ``"Friday"``, are taken from today's
+    date, so cached results are only reused on the same day.
+
+    Args:
+        value: A datetime, returned unchanged, or a date string
+
+    Returns:
+        The parsed datetime
+
+    Raises:
+        ValueError: If the string cannot be parsed, including dates out of
+            the range of :class:`datetime`
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return _parse_free_form(value, date.today())
+    except OverflowError as exc:
+        raise ValueError(f"Date out of range: {value!r}") from exc
+
+
+@lru_cache(maxsize=1024)
+def _parse_free_form(value: str, today: date) -> datetime:
+    # Passing the default explicitly makes the result depend only on the cache key.
+    parsed: datetime = date_parser.parse(value, default=datetime.combine(today, time()))
+    return parsed
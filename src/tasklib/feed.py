@@ -0,0 +1,149 @@
+"""Ordered feed of task mutations for downstream consumers."""
+
+import copy
+import threading
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+from tasklib.models import Task
+
+# Event types, keyed by the storage op that produces them.
+_EVENT_TYPES = {"add": "created", "update": "updated", "delete": "deleted"}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    One entry of the change feed.
+
+    Attributes:
+        seq: Position in the feed; consecutive events differ by one
+        type: ``"created"``, ``"updated"``, ``"deleted"``, or ``"reset"``
+            when the whole collection was reloaded and consumers must
+            rescan it
+        task_id: ID of the task, or None for a reset
+        task: Copy of the task as of the event; for a deletion, the task
+            as it was removed. None for a reset
+    """
+
+    seq: int
+    type: str
+    task_id: Optional[str]
+    task: Optional[Task]
+
+
+Subscriber = Callable[[ChangeEvent], None]
+
+
+class ChangeFeed:
+    """
+    Sequence-numbered change events with a bounded history.
+
+    The last ``capacity`` events are kept in a ring buffer for
+    :meth:`changes_since`; subscribers receive every event as it is
+    published.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize the feed.
+
+        Args:
+            capacity: Number of past events to keep; 0 keeps none, so only
+                subscribers see events
+        """
+        self._events: Deque[ChangeEvent] = deque(maxlen=capacity)
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Events up to this sequence number can no longer be replayed.
+        self._floor = 0
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest event, 0 if there has been none."""
+        return self._seq
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """
+        Call ``callback`` with every event published from now on.
+
+        Args:
+            callback: Receives each :class:`ChangeEvent`, in order
+
+        Returns:
+            A function that cancels the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, changes: Iterable[Tuple[str, Task]]) -> None:
+        """
+        Record mutations and notify subscribers.
+
+        Args:
+            changes: Storage op (``"add"``, ``"update"`` or ``"delete"``)
+                and task pairs, in the order they happened
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+            capacity = self._events.maxlen
+            if not subscribers and capacity is not None:
+                # Only the events the buffer will keep need to be built.
+                changes = list(changes)
+                skipped = max(len(changes) - capacity, 0)
+                self._seq += skipped
+                changes = changes[skipped:]
+            events = []
+            for op, task in changes:
+                self._seq += 1
+                events.append(ChangeEvent(self._seq, _EVENT_TYPES[op], task.id, copy.copy(task)))
+            self._events.extend(events)
+            if len(self._events) == self._events.maxlen:
+                self._floor = self._seq - len(self._events)
+        self._notify(subscribers, events)
+
+    def reset(self) -> None:
+        """Publish a reset event and forget the history, after a full reload."""
+        with self._lock:
+            self._seq += 1
+            event = ChangeEvent(self._seq, "reset", None, None)
+            self._events.clear()
+            self._floor = self._seq
+            subscribers = list(self._subscribers)
+        self._notify(subscribers, [event])
+
+    def _notify(self, subscribers: List[Subscriber], events: List[ChangeEvent]) -> None:
+        for event in events:
+            for callback in subscribers:
+                callback(event)
+
+    def changes_since(self, seq: int) -> Optional[List[ChangeEvent]]:
+        """
+        Get the events after a sequence number.
+
+        Args:
+            seq: The last sequence number the caller has processed, or 0
+
+        Returns:
+            The later events in order, or None if some of them are no
+            longer buffered, or a reset happened since, so the caller must
+            rescan the collection
+        """
+        with self._lock:
+            if seq < self._floor:
+                return None
+            if not self._events or seq >= self._seq:
+                return []
+            # Sequence numbers in the buffer are consecutive, so index directly.
+            start = seq - self._events[0].seq + 1
+            return list(islice(self._events, max(start, 0), None))
@@ -0,0 +1,306 @@
+"""Secondary indexes maintained by the task manager."""
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from tasklib.models import Status, Task
+
+
+def _naive(value: datetime) -> datetime:
+    """Convert an aware datetime to naive local time so all keys compare."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def match_score(query: str, title: str, description: str) -> int:
+    """
+    Score a lowercased query against lowercased task text.
+
+    Args:
+        query: Lowercased search string
+        title: Lowercased task title
+        description: Lowercased task description
+
+    Returns:
+        2 for a title match, plus 1 for a description match; 0 if neither
+    """
+    return (2 if query in title else 0) + (1 if query in description else 0)
+
+
+class TaskIndex:
+    """
+    Base class for secondary indexes.
+
+    The manager calls :meth:`add` after a task enters the collection or
+    has been modified, :meth:`remove` before a task is modified, and
+    :meth:`delete` before it leaves the collection, so an index always
+    sees the values it stored.
+    """
+
+    def add(self, task: Task) -> None:
+        """Add a task to the index."""
+        raise NotImplementedError
+
+    def remove(self, task: Task) -> None:
+        """Remove a task from the index."""
+        raise NotImplementedError
+
+    def delete(self, task: Task) -> None:
+        """
+        Remove a task that is leaving the collection.
+
+        The default implementation is :meth:`remove`; indexes that keep
+        a removed task's position for when it is added back override it.
+        """
+        self.remove(task)
+
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """
+        Add several tasks.
+
+        The default implementation adds them one at a time; indexes with
+        a cheaper bulk build override it.
+        """
+        for task in tasks:
+            self.add(task)
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        raise NotImplementedError
+
+
+class AttributeIndex(TaskIndex):
+    """Buckets tasks by the value of a single attribute."""
+
+    def __init__(self, attribute: str):
+        """
+        Initialize the index.
+
+        Args:
+            attribute: Name of the task attribute to bucket on
+        """
+        self.attribute = attribute
+        self._buckets: Dict[Hashable, Dict[str, Task]] = {}
+
+    def add(self, task: Task) -> None:
+        """Add a task to the bucket for its current value."""
+        self._buckets.setdefault(getattr(task, self.attribute), {})[task.id] = task
+
+    def remove(self, task: Task) -> None:
+        """Remove a task from the bucket for its current value."""
+        bucket = self._buckets.get(getattr(task, self.attribute))
+        if bucket is not None:
+            bucket.pop(task.id, None)
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        self._buckets.clear()
+
+    def get(self, value: Any) -> Dict[str, Task]:
+        """
+        Get the tasks whose attribute equals a value.
+
+        Args:
+            value: Attribute value to look up
+
+        Returns:
+            Mapping of task ID to task; must not be modified by the caller
+        """
+        return self._buckets.get(value, {})
+
+
+class DueDateIndex(TaskIndex):
+    """Keeps tasks with a due date sorted by that date."""
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._entries: List[Tuple[datetime, str]] = []
+        self._tasks: Dict[str, Task] = {}
+
+    def _accepts(self, task: Task) -> bool:  # pylint: disable=unused-argument
+        """Whether a task with a due date belongs in the index; a hook for subclasses."""
+        return True
+
+    def add(self, task: Task) -> None:
+        """Insert a task at the position of its due date."""
+        if task.due_date is None or not self._accepts(task):
+            return
+        insort(self._entries, (_naive(task.due_date), task.id))
+        self._tasks[task.id] = task
+
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """Add several tasks with one sort instead of an insertion each."""
+        for task in tasks:
+            if task.due_date is not None and self._accepts(task):
+                self._entries.append((_naive(task.due_date), task.id))
+                self._tasks[task.id] = task
+        self._entries.sort()
+
+    def remove(self, task: Task) -> None:
+        """Remove a task from the index."""
+        if task.due_date is None or not self._accepts(task):
+            return
+        key = (_naive(task.due_date), task.id)
+        pos = bisect_left(self._entries, key)
+        if pos < len(self._entries) and self._entries[pos] == key:
+            del self._entries[pos]
+        self._tasks.pop(task.id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        self._entries.clear()
+        self._tasks.clear()
+
+    def due_before(self, moment: datetime) -> Dict[str, Task]:
+        """
+        Get tasks due strictly before a moment.
+
+        Args:
+            moment: Upper bound (exclusive) for the due date
+
+        Returns:
+            Mapping of task ID to task, ordered by due date
+        """
+        end = bisect_left(self._entries, (_naive(moment),))
+        return {task_id: self._tasks[task_id] for _, task_id in self._entries[:end]}
+
+    def due_between(self, start: datetime, end: datetime) -> List[Task]:
+        """
+        Get tasks due in a half-open interval, in O(log n + k).
+
+        Args:
+            start: Lower bound (inclusive) for the due date
+            end: Upper bound (exclusive) for the due date
+
+        Returns:
+            Tasks ordered by due date
+        """
+        lo = bisect_left(self._entries, (_naive(start),))
+        hi = bisect_left(self._entries, (_naive(end),), lo)
+        return [self._tasks[task_id] for _, task_id in self._entries[lo:hi]]
+
+    def first_due(self, moment: datetime) -> Optional[Task]:
+        """
+        Get the earliest task due at or after a moment, in O(log n).
+
+        Args:
+            moment: Lower bound (inclusive) for the due date
+        """
+        pos = bisect_left(self._entries, (_naive(moment),))
+        if pos == len(self._entries):
+            return None
+        return self._tasks[self._entries[pos][1]]
+
+    def count_before(self, moment: datetime) -> int:
+        """
+        Count tasks due strictly before a moment, in O(log n).
+
+        Args:
+            moment: Upper bound (exclusive) for the due date
+        """
+        return bisect_left(self._entries, (_naive(moment),))
+
+    def iter_groups(self, descending: bool = False) -> Iterator[List[Task]]:
+        """
+        Iterate over tasks in due date order, grouping tasks due at the same moment.
+
+        Args:
+            descending: Start with the latest due date
+
+        Yields:
+            Lists of tasks sharing a due date
+        """
+        entries = reversed(self._entries) if descending else iter(self._entries)
+        for _, group in groupby(entries, key=itemgetter(0)):
+            yield [self._tasks[task_id] for _, task_id in group]
+
+
+class OpenDueDateIndex(DueDateIndex):
+    """Keeps tasks that have a due date and are not completed sorted by that date."""
+
+    def _accepts(self, task: Task) -> bool:
+        """Whether a task is open, so it belongs in the index."""
+        return task.status is not Status.COMPLETED
+
+
+class TextIndex(TaskIndex):
+    """
+    N-gram inverted index over task titles and descriptions.
+
+    Every lowercased n-gram of a task's text maps to the IDs containing it.
+    A query is answered by intersecting the postings of its own n-grams and
+    verifying the survivors, which keeps the substring semantics of a plain
+    ``in`` check. Queries shorter than ``n`` fall back to scanning the
+    cached lowercased text.
+    """
+
+    def __init__(self, n: int = 3):
+        """
+        Initialize the index.
+
+        Args:
+            n: Length of the indexed character n-grams
+        """
+        self.n = n
+        self._postings: Dict[str, Set[str]] = {}
+        self._text: Dict[str, Tuple[str, str]] = {}
+
+    def _grams(self, text: str) -> Set[str]:
+        return {text[i : i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, task: Task) -> None:
+        """Index the title and description of a task."""
+        title, description = task.title.lower(), task.description.lower()
+        self._text[task.id] = (title, description)
+        for gram in self._grams(title) | self._grams(description):
+            self._postings.setdefault(gram, set()).add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """Remove a task using the text it was indexed with."""
+        text = self._text.pop(task.id, None)
+        if text is None:
+            return
+        for gram in self._grams(text[0]) | self._grams(text[1]):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(task.id)
+                if not posting:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        self._postings.clear()
+        self._text.clear()
+
+    def search(self, query: str) -> Dict[str, int]:
+        """
+        Find tasks whose title or description contains a query.
+
+        Args:
+            query: Search string; matching is case-insensitive
+
+        Returns:
+            Mapping of matching task ID to its :func:`match_score`
+        """
+        query = query.lower()
+        if len(query) < self.n:
+            candidates: Set[str] = set(self._text)
+        else:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in self._grams(query)), key=len
+            )
+            candidates = postings[0].intersection(*postings[1:])
+
+        scores = {}
+        for task_id in candidates:
+            score = match_score(query, *self._text[task_id])
+            if score:
+                scores[task_id] = score
+        return scores
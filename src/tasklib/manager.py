@@ -1,57 +1,573 @@
 """Task manager implementation."""
 
+# TaskManager is the library's single entry point, and its query, locking and
+# persistence helpers share its private state, so they stay in one module.
+# pylint: disable=too-many-lines
+
+import copy
+import heapq
 import json
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
 from pathlib import Path
-from typing import List, Optional
+from dataclasses import fields
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from datetime import datetime
-from dateutil import parser as date_parser
 
-from tasklib.models import Task, Priority, Status
+from tasklib.bulk import ImportReport, RowError, read_tasks, write_tasks
+from tasklib.cache import CacheStats, QueryCache
+from tasklib.columnar import ColumnarIndex
+from tasklib.concurrency import BackgroundSaver, NullLock, ReadWriteLock
+from tasklib.dates import parse_date
+from tasklib.feed import ChangeEvent, ChangeFeed
+from tasklib.indexes import (
+    AttributeIndex,
+    DueDateIndex,
+    OpenDueDateIndex,
+    TaskIndex,
+    TextIndex,
+    _naive,
+    match_score,
+)
+from tasklib.metrics import Metrics, OperationMetrics
+from tasklib.models import DUE_BUCKETS, Task, TaskStats, Priority, Status
+from tasklib.storage import JSONStorage, Storage
+
+# Fields that queries can be sorted by.
+SORT_FIELDS = ("priority", "due_date", "created_at", "updated_at")
+
+_PRIORITY_RANK = {priority: rank for rank, priority in enumerate(Priority)}
+
+# A filter matching at least 1/_SCAN_RATIO of all tasks walks every task in
+# sort order instead of sorting its candidates.
+_SCAN_RATIO = 8
+
+# Methods timed when metrics are enabled.
+_TIMED_METHODS = (
+    "load",
+    "refresh",
+    "save",
+    "add_task",
+    "get_task",
+    "update_task",
+    "delete_task",
+    "add_tasks",
+    "update_tasks",
+    "delete_tasks",
+    "import_tasks",
+    "export_tasks",
+    "stats",
+    "filter_tasks",
+    "search_tasks",
+)
 
+T = TypeVar("T")
 
-class TaskManager:
+
+class TaskManager:  # pylint: disable=too-many-public-methods
     """
     Manages a collection of tasks with persistent storage.
 
     Provides methods to create, read, update, and delete tasks,
-    as well as filter and search functionality.
+    as well as filter and search functionality. Tasks are indexed by ID,
+    status, priority and due date; modify them through :meth:`update_task`
+    so the indexes stay in sync.
+
+    A manager is not thread-safe unless created with ``thread_safe=True``,
+    which guards it with a readers-writer lock. Processes sharing one file
+    must all pass ``shared=True``.
     """
 
-    def __init__(self, storage_path: str = "tasks.json"):
+    def __init__(
+        self,
+        storage_path: str = "tasks.json",
+        storage: Optional[Storage] = None,
+        text_index: bool = False,
+        lazy: bool = False,
+        thread_safe: bool = False,
+        background_save: bool = False,
+        shared: bool = False,
+        metrics: Union[bool, Metrics] = False,
+        columnar: bool = False,
+        feed_size: int = 1000,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+    ):
         """
         Initialize the task manager.
 
         Args:
             storage_path: Path to JSON file for persistent storage
+            storage: Storage backend to use instead of a plain JSON file
+            text_index: Maintain an n-gram index so searches avoid a full scan
+            lazy: Defer loading until tasks are first needed; until then
+                :meth:`iter_tasks` streams straight from storage
+            thread_safe: Allow concurrent use from several threads; reads
+                run in parallel and writes are serialized
+            background_save: Persist mutations on a background thread that
+                coalesces bursts of writes; implies ``thread_safe``. Call
+                :meth:`flush` to wait for pending writes and :meth:`close`
+                before exiting
+            shared: Let several processes use the same storage. Every
+                operation first picks up changes made by other processes,
+                and mutations hold an exclusive file lock from that refresh
+                until they are written, so no update is lost. With
+                :class:`~tasklib.storage.JournalStorage` the refresh only
+                reads the new journal records
+            metrics: Record per-operation counts, latencies, tasks scanned
+                and bytes written; pass a :class:`~tasklib.metrics.Metrics`
+                to share one registry, or True for a private one. Read the
+                measurements with :meth:`metrics`
+            columnar: Keep a NumPy column store of priorities, statuses and
+                dates, so filters on several criteria run as vectorized
+                masks and :meth:`count_by` and :meth:`to_table` are
+                available; requires ``numpy``
+            feed_size: Number of past change events kept for
+                :meth:`changes_since`
+            cache_size: Keep the results of up to this many distinct
+                :meth:`filter_tasks` and :meth:`search_tasks` queries and
+                reuse them until the collection changes; 0 disables the
+                cache. See :meth:`cache_stats`
+            cache_ttl: Seconds after which a cached result is recomputed
+                even if nothing changed; None keeps it until a mutation
+
+        Raises:
+            ValueError: If ``shared`` is combined with ``background_save``,
+                or ``cache_ttl`` is not positive
+            ImportError: If ``columnar`` is set and numpy is not installed
         """
-        self.storage_path = Path(storage_path)
-        self.tasks: List[Task] = []
-        self.load()
+        if shared and background_save:
+            raise ValueError("background_save cannot be used with shared storage")
+        self.storage = storage if storage is not None else JSONStorage(storage_path)
+        self.storage_path = self.storage.path
+        # Insertion-ordered id -> Task index; the order is the order of get_tasks().
+        self._tasks: Dict[str, Task] = {}
+        # Insertion sequence number per task, used to order index lookups.
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._by_status = AttributeIndex("status")
+        self._by_priority = AttributeIndex("priority")
+        self._by_due_date = DueDateIndex()
+        self._open_due = OpenDueDateIndex()
+        self._indexes: List[TaskIndex] = [
+            self._by_status,
+            self._by_priority,
+            self._by_due_date,
+            self._open_due,
+        ]
+        self._text_index: Optional[TextIndex] = None
+        if text_index:
+            self._text_index = TextIndex()
+            self._indexes.append(self._text_index)
+        self._feed = ChangeFeed(feed_size)
+        self._columns: Optional[ColumnarIndex] = None
+        if columnar:
+            self._columns = ColumnarIndex()
+            self._indexes.append(self._columns)
+        # Bumped by every in-memory mutation; cached query results are only
+        # reused while it is unchanged.
+        self._generation = 0
+        self._cache: Optional[QueryCache] = None
+        if cache_size > 0:
+            self._cache = QueryCache(cache_size, cache_ttl)
+        # Mutations awaiting a single flush, and how to undo them, inside batch().
+        self._pending: Optional[List[Tuple[str, Task]]] = None
+        self._undo: List[Tuple[str, Task, Any]] = []
+        self._loaded = False
+        # True while in-memory state has changes that storage has not seen.
+        self._dirty = False
+        self._thread_safe = thread_safe or background_save
+        self._lock = ReadWriteLock() if self._thread_safe else NullLock()
+        # Serializes storage writes between save() and the background saver.
+        self._io_lock = threading.Lock()
+        # Mutations waiting for the background saver.
+        self._unsaved: List[Tuple[str, Task]] = []
+        self._saver: Optional[BackgroundSaver] = None
+        if background_save:
+            self._saver = BackgroundSaver(self._flush_unsaved)
+        self._shared = shared
+        # Storage fingerprint as of the last time this manager read or wrote it.
+        self._signature: Any = None
+        self._metrics: Optional[Metrics] = None
+        if metrics:
+            self._metrics = metrics if isinstance(metrics, Metrics) else Metrics()
+            self.storage.metrics = self._metrics
+            # Timed wrappers shadow the methods on this instance only, so
+            # managers without metrics pay nothing for them.
+            for name in _TIMED_METHODS:
+                setattr(self, name, self._metrics.wrap(name, getattr(self, name)))
+        if not lazy:
+            self.load()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in insertion order, as a new list."""
+        self._ensure_loaded()
+        with self._lock.read():
+            return list(self._tasks.values())
+
+    @tasks.setter
+    def tasks(self, tasks: List[Task]) -> None:
+        with self._lock.write():
+            if self._loaded:
+                self._feed.reset()
+            self._loaded = True
+            self._dirty = True
+            self._generation += 1
+            self._tasks = {}
+            self._order = {}
+            for task in tasks:
+                self._tasks[task.id] = task
+                self._order[task.id] = self._next_order
+                self._next_order += 1
+            for index in self._indexes:
+                index.clear()
+                index.add_many(self._tasks.values())
+
+    def _insert(self, task: Task) -> None:
+        """Add a task to the collection and all indexes."""
+        self._generation += 1
+        self._tasks[task.id] = task
+        self._order[task.id] = self._next_order
+        self._next_order += 1
+        for index in self._indexes:
+            index.add(task)
+
+    def _insert_many(self, tasks: List[Task]) -> None:
+        """Add several new tasks, building each index in bulk."""
+        self._generation += 1
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._order[task.id] = self._next_order
+            self._next_order += 1
+        for index in self._indexes:
+            index.add_many(tasks)
+
+    def _remove(self, task: Task) -> None:
+        """Remove a task from the collection and all indexes."""
+        self._generation += 1
+        del self._tasks[task.id]
+        del self._order[task.id]
+        for index in self._indexes:
+            index.delete(task)
+
+    def _assign(self, task: Task, source: Task) -> None:
+        """Copy every field of ``source`` onto ``task``, keeping indexes in sync."""
+        self._generation += 1
+        for index in self._indexes:
+            index.remove(task)
+        for field in fields(task):
+            setattr(task, field.name, getattr(source, field.name))
+        for index in self._indexes:
+            index.add(task)
+
+    def _storage_lock(self, shared: bool = False) -> ContextManager[None]:
+        """Return the cross-process storage lock when the storage is shared."""
+        return self.storage.lock(shared) if self._shared else nullcontext()
 
     def load(self) -> None:
-        """Load tasks from storage file."""
-        if self.storage_path.exists():
+        """Load tasks from storage."""
+        with self._lock.write(), self._storage_lock(shared=True):
+            self._signature = self.storage.signature()
+            self.tasks = self.storage.load()
+            self._unsaved.clear()
+            self._dirty = False
+
+    def refresh(self) -> bool:
+        """
+        Pick up changes that other processes wrote to storage.
+
+        Only changed storage is read, and when the backend supports it only
+        the changes themselves are applied. Tasks that are still present
+        keep their identity. Unsaved in-memory changes are discarded if the
+        storage has to be reloaded in full.
+
+        Returns:
+            True if anything was reloaded
+        """
+        with self._lock.write(), self._storage_lock(shared=True):
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        """Apply external changes; the caller holds the locks."""
+        signature = self.storage.signature()
+        if signature == self._signature:
+            return False
+        changes = self.storage.load_changes()
+        if changes is None:
+            self.load()
+            return True
+        applied: List[Tuple[str, Task]] = []
+        for _, task_id, task in changes:
+            current = self._tasks.get(task_id)
+            if task is None:
+                if current is not None:
+                    self._remove(current)
+                    applied.append(("delete", current))
+            elif current is not None:
+                self._assign(current, task)
+                applied.append(("update", current))
+            else:
+                self._insert(task)
+                applied.append(("add", task))
+        self._signature = signature
+        self._feed.publish(applied)
+        return True
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Hold the write lock around a mutation.
+
+        For a shared manager, also hold the storage lock and refresh first,
+        so the mutation applies to, and is written over, the latest state.
+        """
+        with self._lock.write(), self._storage_lock():
+            if not self._shared:
+                yield
+                return
+            self._refresh()
             try:
-                with open(self.storage_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.tasks = [Task.from_dict(task_data) for task_data in data]
-            except (json.JSONDecodeError, KeyError, ValueError):
-                self.tasks = []
+                yield
+            finally:
+                self._signature = self.storage.signature()
+
+    def _ensure_loaded(self) -> None:
+        """Load tasks on first use, and pick up other processes' changes when shared."""
+        if not self._loaded:
+            with self._lock.write():
+                if not self._loaded:
+                    self.load()
+        elif self._shared and self.storage.signature() != self._signature:
+            self.refresh()
+
+    def save(self, force: bool = False) -> None:
+        """
+        Save all tasks to storage.
+
+        Args:
+            force: Write even if nothing changed since the last save
+        """
+        self._ensure_loaded()
+        guard = self._exclusive() if self._shared else self._lock.read()
+        with guard, self._io_lock:
+            if not (self._dirty or force):
+                return
+            self.storage.save(self._tasks.values())
+            self._unsaved.clear()
+            self._dirty = False
+
+    def flush(self) -> None:
+        """
+        Wait until every mutation made so far has been written to storage.
+
+        Only needed with ``background_save``; otherwise writes are
+        synchronous and this returns immediately.
+        """
+        if self._saver is not None:
+            self._saver.wait()
+
+    def close(self) -> None:
+        """Write outstanding changes, stop the background saver and release storage."""
+        if self._saver is not None:
+            saver, self._saver = self._saver, None
+            saver.close()
+            self.save()
+        self.storage.close()
+
+    def __enter__(self) -> "TaskManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest change event, 0 if there has been none."""
+        return self._feed.seq
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` with a :class:`~tasklib.feed.ChangeEvent` for every change.
+
+        Events are delivered in sequence order once a mutation has been
+        handed to storage, so changes rolled back inside :meth:`batch` are
+        never seen; a batch delivers its events together when it commits.
+        Changes picked up by :meth:`refresh` are delivered too, and a full
+        reload delivers a ``"reset"`` event. Callbacks run on the mutating
+        thread while it holds the manager's lock, so they must be quick and
+        must not wait on other threads using this manager; exceptions they
+        raise propagate to the caller of the mutation.
+
+        Args:
+            callback: Receives each event
+
+        Returns:
+            A function that cancels the subscription
+        """
+        return self._feed.subscribe(callback)
+
+    def changes_since(self, seq: int) -> Optional[List[ChangeEvent]]:
+        """
+        Get the change events after a sequence number.
+
+        Only the last ``feed_size`` events are kept. A consumer remembers
+        the ``seq`` of the last event it processed, or :attr:`last_seq`
+        when it last read the whole collection, and asks for what followed.
+
+        Args:
+            seq: The last sequence number the caller has processed
+
+        Returns:
+            The later events in order, or None if some are no longer
+            available, or the collection was reloaded since, in which case
+            the caller must rescan with :meth:`get_tasks`
+        """
+        with self._lock.read():
+            return self._feed.changes_since(seq)
+
+    def _flush_unsaved(self) -> None:
+        """
+        Write mutations queued for the background saver.
+
+        The read lock is held only while the queue is taken and the tasks
+        are copied, so writers are not blocked for the duration of the I/O.
+        ``_io_lock``, taken after the read lock as in :meth:`save`, stays
+        held until the write completes so saves and flushes do not overlap.
+        """
+        with ExitStack() as io_lock:
+            with self._lock.read():
+                io_lock.enter_context(self._io_lock)
+                queued, self._unsaved = self._unsaved, []
+                if not queued:
+                    return
+                # Copies, so that mutations made during the write are not torn.
+                ops = [(op, copy.copy(task)) for op, task in queued]
+                tasks = [copy.copy(task) for task in self._tasks.values()]
+            try:
+                self.storage.record_many(ops, tasks)
+            except BaseException:
+                # A single list operation, safe without the manager lock; the
+                # mutations are retried by the next flush.
+                self._unsaved[:0] = queued
+                raise
+            self._dirty = bool(self._unsaved)
+
+    def _persist(self, ops: List[Tuple[str, Task]]) -> None:
+        """Hand mutations to storage, or to the background saver, and publish them."""
+        if self._saver is not None:
+            self._unsaved.extend(ops)
+            self._saver.schedule()
         else:
-            self.tasks = []
+            if len(ops) == 1:
+                self.storage.record(ops[0][0], ops[0][1], self._tasks.values())
+            else:
+                self.storage.record_many(ops, self._tasks.values())
+            self._dirty = False
+        self._feed.publish(ops)
+
+    def _record(self, op: str, task: Task) -> None:
+        """Persist a single mutation, or queue it while a batch is open."""
+        self._dirty = True
+        if self._pending is not None:
+            self._pending.append((op, task))
+        else:
+            self._persist([(op, task)])
+
+    def _log_undo(self, op: str, task: Task) -> None:
+        """Remember how to revert a mutation that is about to happen."""
+        if self._pending is None:
+            return
+        state: Any = None
+        if op == "update":
+            state = copy.copy(task)
+        elif op == "delete":
+            state = self._order[task.id]
+        self._undo.append((op, task, state))
 
-    def save(self) -> None:
-        """Save tasks to storage file."""
-        with open(self.storage_path, "w", encoding="utf-8") as f:
-            data = [task.to_dict() for task in self.tasks]
-            json.dump(data, f, indent=2)
+    def _rollback(self, savepoint: int) -> None:
+        """Revert in-memory mutations logged after a savepoint."""
+        reorder = False
+        while len(self._undo) > savepoint:
+            op, task, state = self._undo.pop()
+            if op == "add":
+                self._remove(task)
+            elif op == "update":
+                self._assign(task, state)
+            else:
+                self._generation += 1
+                self._tasks[task.id] = task
+                self._order[task.id] = state
+                for index in self._indexes:
+                    index.add(task)
+                reorder = True
+        if reorder:
+            order = self._order
+            self._tasks = dict(sorted(self._tasks.items(), key=lambda item: order[item[0]]))
+            if self._columns is not None:
+                # Restored tasks must also regain their rows' positions.
+                self._columns.clear()
+                for task in self._tasks.values():
+                    self._columns.add(task)
+
+    @contextmanager
+    def batch(self) -> Iterator["TaskManager"]:
+        """
+        Group mutations so they are persisted with a single write.
+
+        Saving is suspended inside the block and the queued mutations are
+        flushed once when the outermost block exits. If an exception
+        escapes a block, every mutation made inside that block is reverted
+        in memory and the exception is re-raised. Blocks may be nested.
+        On a thread-safe manager the block holds the write lock.
+
+        Yields:
+            This task manager
+        """
+        self._ensure_loaded()
+        with self._exclusive():
+            outermost = self._pending is None
+            if outermost:
+                self._pending = []
+            savepoint = len(self._undo)
+            pending_mark = len(self._pending or [])
+            try:
+                yield self
+            except BaseException:
+                self._rollback(savepoint)
+                if self._pending is not None:
+                    del self._pending[pending_mark:]
+                if outermost:
+                    self._pending = None
+                    self._undo.clear()
+                raise
+            if outermost:
+                ops, self._pending = self._pending or [], None
+                self._undo.clear()
+                if ops:
+                    self._persist(ops)
 
     def add_task(
         self,
         title: str,
         description: str = "",
         priority: Priority = Priority.MEDIUM,
-        due_date: Optional[str] = None,
+        due_date: Optional[Union[str, datetime]] = None,
     ) -> str:
         """
         Add a new task.
@@ -60,30 +576,92 @@ class TaskManager:
             title: Task title
             description: Task description
             priority: Task priority
-            due_date: Due date as ISO string or parseable date
+            due_date: Due date as a datetime, ISO string or parseable date
 
         Returns:
             The ID of the created task
         """
         due_date_obj = None
         if due_date:
-            due_date_obj = date_parser.parse(due_date)
+            due_date_obj = self._parse_date(due_date)
+
+        now = datetime.now()
+        task = Task(
+            title=title,
+            description=description,
+            priority=priority,
+            due_date=due_date_obj,
+            created_at=now,
+            updated_at=now,
+        )
+        return self.put_task(task)
+
+    def put_task(self, task: Task) -> str:
+        """
+        Add a fully built task, keeping its ID and timestamps.
+
+        Args:
+            task: The task to add; the manager takes ownership of it
+
+        Returns:
+            The ID of the task
 
-        task = Task(title=title, description=description, priority=priority, due_date=due_date_obj)
-        self.tasks.append(task)
-        self.save()
+        Raises:
+            ValueError: If a task with the same ID already exists
+        """
+        self._ensure_loaded()
+        with self._exclusive():
+            if task.id in self._tasks:
+                raise ValueError(f"Task {task.id} already exists")
+            self._log_undo("add", task)
+            self._insert(task)
+            self._record("add", task)
         return task.id
 
     def get_task(self, task_id: str) -> Optional[Task]:
-        """Get a task by ID."""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        """
+        Get a task by ID.
+
+        Until a lazy manager loads, a random-access storage backend answers
+        without loading; the task returned is then a fresh copy.
+        """
+        if not self._loaded and self.storage.random_access:
+            # The read lock keeps a load, and the save that unmaps the file,
+            # from starting while storage is being read.
+            with self._lock.read():
+                if not self._loaded:
+                    with self._storage_lock(shared=True):
+                        return self.storage.read_task(task_id)
+        self._ensure_loaded()
+        with self._lock.read():
+            return self._tasks.get(task_id)
 
     def get_tasks(self) -> List[Task]:
         """Get all tasks."""
-        return self.tasks.copy()
+        self._ensure_loaded()
+        with self._lock.read():
+            return list(self._tasks.values())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Iterate over all tasks without copying them into a list.
+
+        On a lazy manager that has not loaded yet, tasks are streamed from
+        storage and nothing is kept in memory. The manager must not be
+        modified while the iterator is in use, except on a thread-safe
+        manager, which iterates over a snapshot.
+
+        Yields:
+            Tasks in insertion order
+        """
+        if not self._loaded:
+            yield from self.storage.iter_tasks()
+        elif self._thread_safe:
+            with self._lock.read():
+                snapshot = list(self._tasks.values())
+            yield from snapshot
+        else:
+            yield from self._tasks.values()
 
     def update_task(
         self,
@@ -92,7 +670,7 @@ class TaskManager:
         description: Optional[str] = None,
         priority: Optional[Priority] = None,
         status: Optional[Status] = None,
-        due_date: Optional[str] = None,
+        due_date: Optional[Union[str, datetime]] = None,
     ) -> bool:
         """
         Update an existing task.
@@ -108,23 +686,22 @@ class TaskManager:
         Returns:
             True if task was updated, False if not found
         """
-        task = self.get_task(task_id)
-        if not task:
-            return False
+        self._ensure_loaded()
+        due_date_obj = self._parse_date(due_date) if due_date is not None else None
 
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
-        if priority is not None:
-            task.priority = priority
-        if status is not None:
-            task.status = status
-        if due_date is not None:
-            task.due_date = date_parser.parse(due_date)
+        with self._exclusive():
+            task = self._tasks.get(task_id)
+            if not task:
+                return False
 
-        task.updated_at = datetime.now()
-        self.save()
+            self._log_undo("update", task)
+            self._generation += 1
+            for index in self._indexes:
+                index.remove(task)
+            task.apply_update(title, description, priority, status, due_date_obj)
+            for index in self._indexes:
+                index.add(task)
+            self._record("update", task)
         return True
 
     def delete_task(self, task_id: str) -> bool:
@@ -137,57 +714,778 @@ class TaskManager:
         Returns:
             True if task was deleted, False if not found
         """
-        task = self.get_task(task_id)
-        if not task:
-            return False
+        self._ensure_loaded()
+        with self._exclusive():
+            task = self._tasks.get(task_id)
+            if not task:
+                return False
 
-        self.tasks.remove(task)
-        self.save()
+            self._log_undo("delete", task)
+            self._remove(task)
+            self._record("delete", task)
         return True
 
+    def add_tasks(self, tasks: Iterable[Mapping[str, Any]]) -> List[str]:
+        """
+        Add several tasks with a single save.
+
+        Args:
+            tasks: Keyword arguments for :meth:`add_task`, one mapping per task
+
+        Returns:
+            The IDs of the created tasks, in input order
+        """
+        with self.batch():
+            return [self.add_task(**kwargs) for kwargs in tasks]
+
+    def update_tasks(
+        self,
+        task_ids: Iterable[str],
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> int:
+        """
+        Apply the same update to several tasks with a single save.
+
+        Args:
+            task_ids: IDs of tasks to update; unknown IDs are skipped
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            Number of tasks updated
+        """
+        with self.batch():
+            return sum(
+                self.update_task(task_id, title, description, priority, status, due_date)
+                for task_id in task_ids
+            )
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        Delete several tasks with a single save.
+
+        Args:
+            task_ids: IDs of tasks to delete; unknown IDs are skipped
+
+        Returns:
+            Number of tasks deleted
+        """
+        with self.batch():
+            return sum(self.delete_task(task_id) for task_id in task_ids)
+
+    def import_tasks(
+        self,
+        path: Union[str, Path],
+        fmt: Optional[str] = None,
+        processes: Optional[int] = None,
+        chunk_size: int = 10_000,
+        strict: bool = False,
+    ) -> ImportReport:
+        """
+        Add every task in an NDJSON or CSV file with a single save.
+
+        The file is streamed and parsed in chunks, optionally in a process
+        pool, before the write lock is taken; see :mod:`tasklib.bulk` for
+        the accepted fields. Records that fail to parse or validate, or
+        whose ID already exists, are reported and skipped.
+
+        Args:
+            path: The file to import
+            fmt: ``"ndjson"`` or ``"csv"``; inferred from a ``.ndjson``,
+                ``.jsonl`` or ``.csv`` suffix when None
+            processes: Number of worker processes for parsing; records are
+                parsed in this process when None
+            chunk_size: Number of records parsed per chunk
+            strict: Import nothing if any record is rejected
+
+        Returns:
+            Number of tasks imported and the rejected records
+
+        Raises:
+            ValueError: If the format is unknown or cannot be inferred
+        """
+        self._ensure_loaded()
+        report = ImportReport()
+        parsed: List[Tuple[int, Task]] = []
+        for line, result in read_tasks(path, fmt, processes, chunk_size):
+            if isinstance(result, RowError):
+                report.errors.append(result)
+            else:
+                parsed.append((line, result))
+
+        with self.batch():
+            seen = set()
+            accepted = []
+            for line, task in parsed:
+                if task.id in self._tasks or task.id in seen:
+                    report.errors.append(RowError(line, f"Task {task.id} already exists"))
+                else:
+                    seen.add(task.id)
+                    accepted.append(task)
+            report.errors.sort(key=lambda error: error.line)
+            if strict and report.errors:
+                return report
+            for task in accepted:
+                self._log_undo("add", task)
+            self._insert_many(accepted)
+            for task in accepted:
+                self._record("add", task)
+            report.imported = len(accepted)
+        return report
+
+    def export_tasks(
+        self,
+        path: Union[str, Path],
+        fmt: Optional[str] = None,
+        tasks: Optional[Iterable[Task]] = None,
+    ) -> int:
+        """
+        Write tasks to an NDJSON or CSV file that :meth:`import_tasks` reads.
+
+        Tasks are written as they are iterated, so exporting from a lazy
+        manager streams from storage without loading.
+
+        Args:
+            path: The file to write; replaced atomically
+            fmt: ``"ndjson"`` or ``"csv"``; inferred from the suffix when None
+            tasks: Tasks to export, such as :meth:`iter_filter_tasks`
+                results; defaults to every task, in insertion order
+
+        Returns:
+            Number of tasks written
+
+        Raises:
+            ValueError: If the format is unknown or cannot be inferred
+        """
+        return write_tasks(path, self.iter_tasks() if tasks is None else tasks, fmt)
+
+    def metrics(self) -> Dict[str, OperationMetrics]:
+        """
+        Return the measurements recorded so far.
+
+        A registry shared between managers reports all of them together.
+
+        Returns:
+            Mapping of operation name to its call count, errors, latency
+            histogram, tasks scanned and bytes written; empty unless the
+            manager was created with ``metrics``
+        """
+        return self._metrics.snapshot() if self._metrics is not None else {}
+
+    def cache_stats(self) -> CacheStats:
+        """
+        Return the query cache counters.
+
+        Returns:
+            Hits, misses, evictions, expirations, invalidations and the
+            number of cached results; all zero unless the manager was
+            created with ``cache_size``
+        """
+        return self._cache.stats() if self._cache is not None else CacheStats()
+
+    def _cached(
+        self, key: Tuple[Any, ...], overdue_only: bool, query: Callable[[], Iterable[Task]]
+    ) -> List[Task]:
+        """Answer a query from the cache, or run and cache it; the caller holds the read lock."""
+        if self._cache is None:
+            return list(query())
+        results = self._cache.get(key, self._generation)
+        if results is not None:
+            return results
+        now = datetime.now()
+        results = list(query())
+        valid_until = None
+        if overdue_only:
+            # Until the next open task falls due, the overdue set cannot grow.
+            upcoming = self._open_due.first_due(now)
+            if upcoming is not None and upcoming.due_date is not None:
+                valid_until = _naive(upcoming.due_date)
+        self._cache.put(key, self._generation, results, valid_until)
+        return results
+
+    def _parse_date(self, value: Union[str, datetime]) -> datetime:
+        """Parse a due date, timing it when metrics are enabled."""
+        if self._metrics is None:
+            return parse_date(value)
+        return self._metrics.call("parse_date", parse_date, value)
+
+    def _scanned(self, operation: str, items: Iterable[T]) -> Iterable[T]:
+        """Count the items a query examines, when metrics are enabled."""
+        if self._metrics is None:
+            return items
+        return self._metrics.count_scanned(operation, items)
+
+    def stats(self) -> TaskStats:
+        """
+        Summarize the collection.
+
+        Counts come from the indexes, which every mutation keeps up to
+        date, so this never scans the tasks: the cost is a handful of
+        binary searches however many tasks there are.
+
+        Returns:
+            Counts per status and priority, overdue tasks and a due-date histogram
+        """
+        self._ensure_loaded()
+        now = datetime.now()
+        with self._lock.read():
+            histogram: Dict[str, int] = {}
+            previous = 0
+            for name, horizon in DUE_BUCKETS:
+                count = self._open_due.count_before(now + horizon)
+                histogram[name] = count - previous
+                previous = count
+            histogram["later"] = len(self._open_due) - previous
+            open_tasks = len(self._tasks) - len(self._by_status.get(Status.COMPLETED))
+            histogram["no_due_date"] = open_tasks - len(self._open_due)
+            return TaskStats(
+                total=len(self._tasks),
+                by_status={status: len(self._by_status.get(status)) for status in Status},
+                by_priority={
+                    priority: len(self._by_priority.get(priority)) for priority in Priority
+                },
+                overdue=histogram["overdue"],
+                due_histogram=histogram,
+            )
+
+    def count_by(
+        self,
+        field: str,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+    ) -> Dict[Any, int]:
+        """
+        Count matching tasks per priority or status with vectorized masks.
+
+        Args:
+            field: ``"priority"`` or ``"status"``
+            status: Only count tasks with this status
+            priority: Only count tasks with this priority
+            overdue_only: Only count overdue tasks
+
+        Returns:
+            Count per enum member, including members with no tasks
+
+        Raises:
+            ValueError: If the manager is not columnar or ``field`` cannot
+                be grouped by
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            columns = self._require_columns()
+            return columns.count_by(field, columns.mask(status, priority, overdue_only))
+
+    def to_table(self) -> Dict[str, Any]:
+        """
+        Export the task attributes as NumPy columns without copying them.
+
+        See :meth:`tasklib.columnar.ColumnarIndex.to_table` for the
+        encoding. The arrays are read-only views that stay valid until the
+        next mutation; copy them to keep them longer.
+
+        Returns:
+            Mapping of column name to array, one entry per task in
+            insertion order
+
+        Raises:
+            ValueError: If the manager is not columnar
+        """
+        self._ensure_loaded()
+        # Exporting may compact the columns, so it needs exclusive access.
+        with self._lock.write():
+            return self._require_columns().to_table()
+
+    def _require_columns(self) -> ColumnarIndex:
+        """Return the column store, or raise if the manager does not keep one."""
+        if self._columns is None:
+            raise ValueError("Column queries require TaskManager(columnar=True)")
+        return self._columns
+
+    def next_due(self, after: Optional[datetime] = None) -> Optional[Task]:
+        """
+        Get the next task to become overdue, in O(log n).
+
+        Args:
+            after: Only consider tasks due at or after this moment; defaults to now
+
+        Returns:
+            The open task with the earliest such due date, or None
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            return self._open_due.first_due(after if after is not None else datetime.now())
+
+    def overdue_since(self, moment: datetime, until: Optional[datetime] = None) -> List[Task]:
+        """
+        Get open tasks that became overdue in a time window, in O(log n + k).
+
+        Args:
+            moment: Start of the window (inclusive)
+            until: End of the window (exclusive); defaults to now
+
+        Returns:
+            Tasks that are not completed and are due in the window, by due date
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            return self._open_due.due_between(
+                moment, until if until is not None else datetime.now()
+            )
+
+    def watch_overdue(
+        self,
+        since: Optional[datetime] = None,
+        max_wait: float = 1.0,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[Task]:
+        """
+        Yield tasks as they become overdue.
+
+        Between sweeps the generator sleeps until the next open task falls
+        due, but never longer than ``max_wait`` so that tasks added with an
+        earlier due date are noticed. Each sweep costs O(log n) plus the
+        tasks it reports, however large the collection.
+
+        Each task is reported once, when its due date passes; a task
+        completed in time is never reported, nor is one whose due date is
+        moved to before the latest sweep. Consume it from a dedicated
+        thread on a manager created with ``thread_safe=True`` if other
+        threads modify the manager.
+
+        Args:
+            since: Report tasks due at or after this moment; defaults to
+                now, so tasks that are already overdue are skipped
+            max_wait: Longest sleep between sweeps, in seconds
+            stop: Event that ends the iteration once set
+
+        Yields:
+            Tasks in due date order
+        """
+        stop = stop if stop is not None else threading.Event()
+        last = since if since is not None else datetime.now()
+        while not stop.is_set():
+            now = datetime.now()
+            yield from self.overdue_since(last, now)
+            last = now
+            wait = max_wait
+            upcoming = self.next_due(now)
+            if upcoming is not None and upcoming.due_date is not None:
+                wait = min(wait, max(0.0, upcoming.due_date.timestamp() - time.time()))
+            stop.wait(wait)
+
+    def _sort_key(
+        self, sort_by: Optional[str] = None, descending: bool = False
+    ) -> Callable[[Task], Tuple[Any, ...]]:
+        """
+        Return a key function for ordering query results.
+
+        Keys are tuples of numbers that end in the insertion sequence
+        number, so they are unique, totally ordered and JSON-serializable
+        for cursors. Tasks without a due date sort last either way.
+
+        Raises:
+            ValueError: If ``sort_by`` is not a sortable field
+        """
+        order = self._order
+        sign = -1 if descending else 1
+        if sort_by is None:
+            return lambda task: (sign * order[task.id],)
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort_by!r}; expected one of {SORT_FIELDS}")
+        if sort_by == "priority":
+            return lambda task: (0, sign * _PRIORITY_RANK[task.priority], order[task.id])
+
+        def key(task: Task) -> Tuple[Any, ...]:
+            value: Optional[datetime] = getattr(task, sort_by)
+            if value is None:
+                return (1, 0.0, order[task.id])
+            return (0, sign * value.timestamp(), order[task.id])
+
+        return key
+
+    def cursor_after(
+        self, task: Task, sort_by: Optional[str] = None, descending: bool = False
+    ) -> str:
+        """
+        Return a cursor that resumes a query just after ``task``.
+
+        Pass it as ``cursor`` together with the same ``sort_by`` and
+        ``descending`` to fetch the next page. Unlike ``offset``, a cursor
+        stays correct when tasks before it are added or removed, and the
+        task itself may be deleted once the cursor is taken.
+
+        Args:
+            task: The last task of the previous page
+            sort_by: Sort field of the query
+            descending: Sort direction of the query
+
+        Returns:
+            An opaque cursor string
+
+        Raises:
+            ValueError: If the task is not in this manager
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            if task.id not in self._order:
+                raise ValueError(f"Task {task.id} is not in this manager")
+            return json.dumps(self._sort_key(sort_by, descending)(task))
+
+    def _select(
+        self,
+        tasks: Iterable[Task],
+        in_order: bool,
+        key: Callable[[Task], Tuple[Any, ...]],
+        limit: Optional[int],
+        offset: int,
+        cursor: Optional[str],
+    ) -> Iterator[Task]:
+        """
+        Order, page and lazily yield query results.
+
+        Args:
+            tasks: The matching tasks
+            in_order: Whether ``tasks`` already come in ``key`` order
+            key: Sort key from :meth:`_sort_key`
+            limit: Maximum number of tasks to yield
+            offset: Number of leading tasks to skip
+            cursor: Only yield tasks after this cursor
+        """
+        if cursor is not None:
+            after = tuple(json.loads(cursor))
+            tasks = (task for task in tasks if key(task) > after)
+        stop = None if limit is None else offset + limit
+        if in_order:
+            ordered: Iterator[Task] = iter(tasks)
+        elif stop is not None:
+            # Top-k selection: O(n log k) and never sorts the whole result.
+            ordered = iter(heapq.nsmallest(stop, tasks, key=key))
+        else:
+            ordered = _iter_sorted(tasks, key)
+        return islice(ordered, offset, stop)
+
+    def _index_order(self, sort_by: Optional[str], descending: bool) -> Optional[Iterator[Task]]:
+        """
+        Walk all tasks in sort order using the indexes, if they allow it.
+
+        The walk is lazy, so a query that stops after a page only pays for
+        the tasks it looked at.
+
+        Returns:
+            The tasks in :meth:`_sort_key` order, or None if no index keeps
+            that order
+        """
+        order = self._order.__getitem__
+        if sort_by is None:
+            return reversed(self._tasks.values()) if descending else iter(self._tasks.values())
+        if sort_by == "priority":
+            ranked = sorted(Priority, key=_PRIORITY_RANK.__getitem__, reverse=descending)
+            return (
+                task
+                for priority in ranked
+                for task in sorted(
+                    self._by_priority.get(priority).values(), key=lambda t: order(t.id)
+                )
+            )
+        if sort_by == "due_date":
+            return chain(
+                (
+                    task
+                    for group in self._by_due_date.iter_groups(descending)
+                    for task in sorted(group, key=lambda t: order(t.id))
+                ),
+                (task for task in self._tasks.values() if task.due_date is None),
+            )
+        return None
+
+    def _filter_candidates(
+        self, status: Optional[Status], priority: Optional[Priority], overdue_only: bool
+    ) -> List[Dict[str, Task]]:
+        """Return the index sets a filter intersects, smallest first."""
+        candidates: List[Dict[str, Task]] = []
+
+        if status is not None:
+            candidates.append(self._by_status.get(status))
+
+        if priority is not None:
+            candidates.append(self._by_priority.get(priority))
+
+        if overdue_only:
+            candidates.append(self._open_due.due_before(datetime.now()))
+
+        candidates.sort(key=len)
+        return candidates
+
+    def _filter_columns(
+        self, status: Optional[Status], priority: Optional[Priority], overdue_only: bool
+    ) -> Iterator[Task]:
+        """Yield the tasks matching every criterion, from the column store."""
+        columns = self._require_columns()
+        ids = columns.ids(columns.mask(status, priority, overdue_only))
+        return (self._tasks[task_id] for task_id in self._scanned("filter_tasks", ids))
+
+    def _filter_walk(
+        self, walk: Iterable[Task], candidates: List[Dict[str, Task]], limit: Optional[int]
+    ) -> Iterator[Task]:
+        """Keep the tasks of an ordered walk that are in every candidate set."""
+        tasks = iter(self._scanned("filter_tasks", walk))
+        if len(candidates) == 1 or (candidates and limit is None):
+            # One membership test per task; without a limit every task
+            # is visited, so intersecting the sets up front is cheaper.
+            matched = candidates[0]
+            if len(candidates) > 1:
+                rest = candidates[1:]
+                matched = {k: t for k, t in matched.items() if all(k in c for c in rest)}
+            return (t for t in tasks if t.id in matched)
+        if candidates:
+            return (t for t in tasks if all(t.id in c for c in candidates))
+        return tasks
+
+    def _filter(
+        self,
+        status: Optional[Status],
+        priority: Optional[Priority],
+        overdue_only: bool,
+        sort_by: Optional[str],
+        descending: bool,
+        limit: Optional[int],
+        offset: int,
+        cursor: Optional[str],
+    ) -> Iterator[Task]:
+        """Yield filter results; the caller holds the read lock."""
+        key = self._sort_key(sort_by, descending)
+        criteria = (status is not None) + (priority is not None) + overdue_only
+        if self._columns is not None and criteria > 1:
+            # One vectorized pass instead of probing one index per task; the
+            # matches come in insertion order.
+            tasks: Iterable[Task] = self._filter_columns(status, priority, overdue_only)
+            return self._select(
+                tasks, sort_by is None and not descending, key, limit, offset, cursor
+            )
+
+        candidates = self._filter_candidates(status, priority, overdue_only)
+        if not candidates or len(candidates[0]) * _SCAN_RATIO >= len(self._tasks):
+            # Most tasks match: walk them in sort order so pages stop early.
+            walk = self._index_order(sort_by, descending)
+            if walk is not None:
+                tasks = self._filter_walk(walk, candidates, limit)
+                return self._select(tasks, True, key, limit, offset, cursor)
+        if not candidates:
+            tasks = self._scanned("filter_tasks", self._tasks.values())
+            return self._select(tasks, False, key, limit, offset, cursor)
+
+        # Walk the smallest candidate set and probe the others.
+        others = candidates[1:]
+        tasks = (
+            t
+            for k, t in self._scanned("filter_tasks", candidates[0].items())
+            if all(k in other for other in others)
+        )
+        return self._select(tasks, False, key, limit, offset, cursor)
+
     def filter_tasks(
         self,
         status: Optional[Status] = None,
         priority: Optional[Priority] = None,
         overdue_only: bool = False,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Task]:
         """
         Filter tasks by criteria.
 
+        Until a lazy manager loads, a random-access storage backend answers
+        queries without ``sort_by`` or ``cursor`` without loading; the tasks
+        returned are then fresh copies. Otherwise results come from the
+        query cache, if enabled, while no task has changed since the same
+        query last ran and, for ``overdue_only``, no task has fallen due.
+
         Args:
             status: Filter by status
             priority: Filter by priority
             overdue_only: Only return overdue tasks
+            sort_by: Order by ``"priority"``, ``"due_date"``, ``"created_at"``
+                or ``"updated_at"`` instead of insertion order
+            descending: Reverse the sort order; ties stay in insertion order
+            limit: Maximum number of tasks to return
+            offset: Number of matching tasks to skip
+            cursor: Resume after a task, from :meth:`cursor_after`
 
         Returns:
             List of matching tasks
         """
-        filtered = self.tasks.copy()
+        if not self._loaded and self.storage.random_access and sort_by is None and cursor is None:
+            with self._lock.read():
+                if not self._loaded:
+                    with self._storage_lock(shared=True):
+                        return self.storage.filter_tasks(
+                            status, priority, overdue_only, descending, limit, offset
+                        )
+        self._ensure_loaded()
+        args = (status, priority, bool(overdue_only), sort_by, bool(descending))
+        page = (limit, offset, cursor)
+        with self._lock.read():
+            return self._cached(
+                ("filter",) + args + page, overdue_only, lambda: self._filter(*args, *page)
+            )
 
-        if status is not None:
-            filtered = [t for t in filtered if t.status == status]
+    def iter_filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Task]:
+        """
+        Like :meth:`filter_tasks`, but yield the tasks lazily.
 
-        if priority is not None:
-            filtered = [t for t in filtered if t.priority == priority]
+        Results in insertion order are produced as the tasks are scanned;
+        sorted results come off a heap one at a time, so stopping early
+        skips most of the sorting. As with :meth:`iter_tasks`, the manager
+        must not be modified during iteration unless it is thread-safe, in
+        which case the results are collected under the read lock first.
 
-        if overdue_only:
-            filtered = [t for t in filtered if t.is_overdue()]
+        Yields:
+            Matching tasks
+        """
+        self._ensure_loaded()
+        args = (status, priority, overdue_only, sort_by, descending, limit, offset, cursor)
+        if self._thread_safe:
+            with self._lock.read():
+                results = list(self._filter(*args))
+            yield from results
+        else:
+            yield from self._filter(*args)
+
+    def _search(
+        self,
+        query: str,
+        ranked: bool,
+        limit: Optional[int],
+        sort_by: Optional[str],
+        descending: bool,
+        offset: int,
+        cursor: Optional[str],
+    ) -> Iterator[Task]:
+        """Yield search results; the caller holds the read lock."""
+        if ranked and cursor is not None:
+            raise ValueError("Cursors are not supported for ranked searches")
+        scores = self._search_scores(query)
+        # The text index does not return matches in insertion order.
+        in_order = sort_by is None and not descending and not ranked and self._text_index is None
+        sort_key = self._sort_key(sort_by, descending)
+
+        def ranked_key(task: Task) -> Tuple[Any, ...]:
+            return (-scores[task.id],) + sort_key(task)
 
-        return filtered
+        tasks = (self._tasks[task_id] for task_id in scores)
+        return self._select(
+            tasks, in_order, ranked_key if ranked else sort_key, limit, offset, cursor
+        )
 
-    def search_tasks(self, query: str) -> List[Task]:
+    def _search_scores(self, query: str) -> Dict[str, int]:
+        """Score the tasks matching a search, in insertion order unless indexed."""
+        if self._text_index is not None:
+            scores = self._text_index.search(query)
+        else:
+            query_lower = query.lower()
+            scores = {}
+            for task in self._tasks.values():
+                score = match_score(query_lower, task.title.lower(), task.description.lower())
+                if score:
+                    scores[task.id] = score
+        if self._metrics is not None:
+            # With the text index, only the tasks it matched are examined.
+            examined = len(self._tasks) if self._text_index is None else len(scores)
+            self._metrics.add_scanned("search_tasks", examined)
+        return scores
+
+    def search_tasks(
+        self,
+        query: str,
+        ranked: bool = False,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[Task]:
         """
         Search tasks by title or description.
 
+        Results come from the query cache, if enabled, while no task has
+        changed since the same query last ran; queries differing only in
+        letter case share an entry.
+
         Args:
             query: Search query string
+            ranked: Order title matches before description-only matches;
+                ``sort_by`` then orders tasks with equal scores
+            limit: Maximum number of tasks to return
+            sort_by: Order by ``"priority"``, ``"due_date"``, ``"created_at"``
+                or ``"updated_at"`` instead of insertion order
+            descending: Reverse the sort order; ties stay in insertion order
+            offset: Number of matching tasks to skip
+            cursor: Resume after a task, from :meth:`cursor_after`; not
+                available for ranked searches
 
         Returns:
-            List of matching tasks
+            List of matching tasks, in insertion order unless ranked or sorted
         """
-        query_lower = query.lower()
-        return [
-            task
-            for task in self.tasks
-            if query_lower in task.title.lower() or query_lower in task.description.lower()
-        ]
+        self._ensure_loaded()
+        args = (bool(ranked), limit, sort_by, bool(descending), offset, cursor)
+        with self._lock.read():
+            return self._cached(
+                ("search", query.lower()) + args, False, lambda: self._search(query, *args)
+            )
+
+    def iter_search_tasks(
+        self,
+        query: str,
+        ranked: bool = False,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Task]:
+        """
+        Like :meth:`search_tasks`, but yield the tasks lazily.
+
+        The same rules as for :meth:`iter_filter_tasks` apply.
+
+        Yields:
+            Matching tasks
+        """
+        self._ensure_loaded()
+        args = (query, ranked, limit, sort_by, descending, offset, cursor)
+        if self._thread_safe:
+            with self._lock.read():
+                results = list(self._search(*args))
+            yield from results
+        else:
+            yield from self._search(*args)
+
+
+def _iter_sorted(tasks: Iterable[Task], key: Callable[[Task], Tuple[Any, ...]]) -> Iterator[Task]:
+    """Yield tasks in key order, popping a heap so early exits skip most of the sort."""
+    # Keys are unique, so the tuples never fall through to comparing tasks.
+    heap = [(key(task), task) for task in tasks]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[1]
@@ -0,0 +1,249 @@
+"""Opt-in instrumentation of task manager operations."""
+
+import copy
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Hook = Callable[[str, float], None]
+
+
+@dataclass
+class OperationMetrics:
+    """
+    Measurements of one kind of operation.
+
+    ``buckets[i]`` counts calls that took at most ``LATENCY_BUCKETS[i]``
+    seconds and more than the previous bound; the final entry counts the
+    slower ones.
+    """
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    tasks_scanned: int = 0
+    bytes_written: int = 0
+
+
+class _Timer:
+    """Context manager that records one timed call."""
+
+    __slots__ = ("_metrics", "_operation", "_start")
+
+    def __init__(self, metrics: "Metrics", operation: str):
+        self._metrics = metrics
+        self._operation = operation
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        seconds = time.perf_counter() - self._start
+        self._metrics.observe(self._operation, seconds, error=exc_type is not None)
+
+
+class Metrics:
+    """
+    Thread-safe registry of per-operation counts and latencies.
+
+    Pass an instance as ``TaskManager(metrics=...)`` to instrument a
+    manager; several managers may share one. Besides call counts, errors
+    and a latency histogram, operations that scan tasks record how many
+    they examined and storage writes record how many bytes they wrote.
+    Storage work is reported as ``storage.encode``, ``storage.decode`` and
+    ``storage.write``, and due date parsing as ``parse_date``, so their
+    cost can be told apart from the operations that trigger them.
+    """
+
+    def __init__(self, hooks: Iterable[Hook] = ()):
+        """
+        Initialize the registry.
+
+        Args:
+            hooks: Callbacks to run after every timed call, see :meth:`add_hook`
+        """
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationMetrics] = {}
+        self._hooks: List[Hook] = list(hooks)
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Register a callback to run after every timed call.
+
+        The callback receives the operation name and its duration in
+        seconds. It runs synchronously on the calling thread, so it should
+        be fast; exceptions it raises propagate to the caller.
+
+        Args:
+            hook: The callback
+        """
+        self._hooks.append(hook)
+
+    def _get(self, operation: str) -> OperationMetrics:
+        """Return the entry for an operation, creating it; the caller holds the lock."""
+        entry = self._operations.get(operation)
+        if entry is None:
+            entry = self._operations[operation] = OperationMetrics()
+        return entry
+
+    def time(self, operation: str) -> ContextManager[None]:
+        """Return a context manager that times the block as one call of ``operation``."""
+        return _Timer(self, operation)
+
+    def call(self, operation: str, func: Callable[..., T], *args: object) -> T:
+        """Call ``func(*args)``, timing it as one call of ``operation``."""
+        with _Timer(self, operation):
+            return func(*args)
+
+    def wrap(self, operation: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Return ``func`` wrapped so that every call is timed as ``operation``."""
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> T:
+            with _Timer(self, operation):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def observe(self, operation: str, seconds: float, error: bool = False) -> None:
+        """
+        Record one call of an operation.
+
+        Args:
+            operation: Operation name
+            seconds: How long the call took
+            error: Whether the call raised
+        """
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+        with self._lock:
+            entry = self._get(operation)
+            entry.count += 1
+            entry.errors += error
+            entry.total_seconds += seconds
+            entry.buckets[bucket] += 1
+        for hook in self._hooks:
+            hook(operation, seconds)
+
+    def add_scanned(self, operation: str, count: int) -> None:
+        """Record that an operation examined ``count`` tasks."""
+        with self._lock:
+            self._get(operation).tasks_scanned += count
+
+    def add_bytes_written(self, operation: str, count: int) -> None:
+        """Record that an operation wrote ``count`` bytes."""
+        with self._lock:
+            self._get(operation).bytes_written += count
+
+    def count_scanned(self, operation: str, items: Iterable[T]) -> Iterator[T]:
+        """Yield ``items``, recording how many were consumed as scanned by ``operation``."""
+        count = 0
+        try:
+            for item in items:
+                count += 1
+                yield item
+        finally:
+            self.add_scanned(operation, count)
+
+    def snapshot(self) -> Dict[str, OperationMetrics]:
+        """
+        Return a copy of the measurements.
+
+        Returns:
+            Mapping of operation name to its measurements
+        """
+        with self._lock:
+            return copy.deepcopy(self._operations)
+
+    def reset(self) -> None:
+        """Discard all measurements."""
+        with self._lock:
+            self._operations.clear()
+
+    def to_prometheus(self, prefix: str = "tasklib") -> str:
+        """
+        Render the measurements in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix of every metric name
+
+        Returns:
+            A latency histogram plus error, scanned-task and written-byte
+            counters, each labelled by operation
+        """
+        operations = sorted(self.snapshot().items())
+        lines = [
+            f"# HELP {prefix}_operation_seconds Time spent per operation.",
+            f"# TYPE {prefix}_operation_seconds histogram",
+        ]
+        for name, entry in operations:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), entry.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'{prefix}_operation_seconds_bucket{{operation="{name}",le="{le}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'{prefix}_operation_seconds_sum{{operation="{name}"}} {entry.total_seconds!r}'
+            )
+            lines.append(f'{prefix}_operation_seconds_count{{operation="{name}"}} {entry.count}')
+        for metric, attr, help_text in (
+            ("operation_errors_total", "errors", "Operations that raised."),
+            ("tasks_scanned_total", "tasks_scanned", "Tasks examined by queries."),
+            ("bytes_written_total", "bytes_written", "Bytes written to storage."),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, entry in operations:
+                lines.append(f'{prefix}_{metric}{{operation="{name}"}} {getattr(entry, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+class NullMetrics:
+    """Metrics that record nothing, used when instrumentation is disabled."""
+
+    # The methods keep the signatures of Metrics and ignore their arguments.
+    # pylint: disable=unused-argument
+
+    _context = nullcontext()
+
+    def time(self, operation: str) -> ContextManager[None]:
+        """Return a no-op context manager."""
+        return self._context
+
+    def call(self, operation: str, func: Callable[..., T], *args: object) -> T:
+        """Call ``func(*args)``."""
+        return func(*args)
+
+    def add_bytes_written(self, operation: str, count: int) -> None:
+        """Do nothing."""
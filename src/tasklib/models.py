@@ -1,11 +1,15 @@
 """Data models for task management."""
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
+import sys
 import uuid
 
+# Slotted instances drop the per-task __dict__; dataclass(slots=True) needs 3.10+.
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class Priority(Enum):
     """Task priority levels."""
@@ -25,7 +29,16 @@ class Status(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Value lookups without going through EnumMeta.__call__.
+_PRIORITIES = {priority.value: priority for priority in Priority}
+_STATUSES = {status.value: status for status in Status}
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Task:
     """
     Represents a task with title, description, priority, status, and dates.
@@ -46,35 +59,115 @@ class Task:
     priority: Priority = Priority.MEDIUM
     status: Status = Status.TODO
     due_date: Optional[datetime] = None
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
 
+    def apply_update(
+        self,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[datetime] = None,
+    ) -> None:
+        """
+        Set the fields that are not None and refresh ``updated_at``.
+
+        Args:
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New, already parsed, due date (optional)
+        """
+        if title is not None:
+            self.title = title
+        if description is not None:
+            self.description = description
+        if priority is not None:
+            self.priority = priority
+        if status is not None:
+            self.status = status
+        if due_date is not None:
+            self.due_date = due_date
+        self.updated_at = datetime.now()
+
     def to_dict(self) -> dict:
         """Convert task to dictionary for JSON serialization."""
-        data = asdict(self)
-        data["priority"] = self.priority.value
-        data["status"] = self.status.value
-        data["created_at"] = self.created_at.isoformat()
-        data["updated_at"] = self.updated_at.isoformat()
-        if self.due_date:
-            data["due_date"] = self.due_date.isoformat()
-        return data
+        # Built by hand: dataclasses.asdict deep-copies every field first.
+        due_date = self.due_date
+        return {
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "status": self.status.value,
+            "due_date": due_date.isoformat() if due_date else None,
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
         """Create task from dictionary."""
-        data = data.copy()
-        data["priority"] = Priority(data["priority"])
-        data["status"] = Status(data["status"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        if data.get("due_date"):
-            data["due_date"] = datetime.fromisoformat(data["due_date"])
-        return cls(**data)
-
-    def is_overdue(self) -> bool:
-        """Check if task is overdue."""
+        priority, status = data["priority"], data["status"]
+        created, updated = data["created_at"], data["updated_at"]
+        created_at = datetime.fromisoformat(created)
+        # Never-updated tasks share one datetime object for both timestamps.
+        updated_at = created_at if updated == created else datetime.fromisoformat(updated)
+        due_date = data.get("due_date")
+        return cls(
+            title=data["title"],
+            description=data.get("description", ""),
+            priority=_PRIORITIES.get(priority) or Priority(priority),
+            status=_STATUSES.get(status) or Status(status),
+            due_date=datetime.fromisoformat(due_date) if due_date else None,
+            id=data["id"] if "id" in data else _new_id(),
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check if task is overdue.
+
+        Args:
+            now: Current time, so a caller checking many tasks can read the
+                clock once; defaults to ``datetime.now()``
+        """
         if not self.due_date:
             return False
-        return self.status != Status.COMPLETED and datetime.now() > self.due_date
+        return self.status != Status.COMPLETED and (now or datetime.now()) > self.due_date
+
+
+# Due-date histogram buckets: each counts open tasks due before ``now + horizon``
+# and not in an earlier bucket. Tasks due later fall in "later".
+DUE_BUCKETS = (
+    ("overdue", timedelta(0)),
+    ("next_day", timedelta(days=1)),
+    ("next_week", timedelta(days=7)),
+    ("next_month", timedelta(days=30)),
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class TaskStats:
+    """
+    Summary counts for a task collection.
+
+    Attributes:
+        total: Number of tasks
+        by_status: Number of tasks per status, including zeros
+        by_priority: Number of tasks per priority, including zeros
+        overdue: Number of tasks past their due date and not completed
+        due_histogram: Number of tasks that are not completed per due-date
+            bucket: the names in ``DUE_BUCKETS``, then ``"later"`` and
+            ``"no_due_date"``
+    """
+
+    total: int
+    by_status: Dict[Status, int]
+    by_priority: Dict[Priority, int]
+    overdue: int
+    due_histogram: Dict[str, int]
@@ -0,0 +1,534 @@
+"""Task manager that partitions tasks across several storage files."""
+
+import os
+import re
+import shutil
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from tasklib.dates import parse_date
+from tasklib.indexes import match_score
+from tasklib.manager import TaskManager
+from tasklib.models import Task, TaskStats, Priority, Status
+from tasklib.storage import JSONStorage, Storage
+
+# Matches shard files and their sidecars, such as a journal written before any snapshot.
+_SHARD_NAME = re.compile(r"shard-(\d+)-of-(\d+)\.json")
+
+# reshard() writes the new layout into this subdirectory, then writes the
+# marker, holding the new shard count, once the layout is complete.
+_STAGING = ".reshard"
+_COMPLETE = "COMPLETE"
+
+# Shard managers opened by process pool workers, by shard path.
+_worker_managers: Dict[str, TaskManager] = {}
+
+
+def shard_path(directory: Union[str, Path], index: int, shards: int) -> Path:
+    """Return the storage file of one shard."""
+    return Path(directory) / f"shard-{index:03d}-of-{shards:03d}.json"
+
+
+def shard_for(task_id: str, shards: int) -> int:
+    """
+    Return the shard that owns a task.
+
+    Uses CRC-32 rather than :func:`hash`, which is salted per process.
+    """
+    return zlib.crc32(task_id.encode("utf-8")) % shards
+
+
+def _shard_counts(directory: Path) -> Set[int]:
+    """Return the shard counts of the layouts present in a directory."""
+    counts = set()
+    for path in directory.glob("shard-*-of-*.json*"):
+        match = _SHARD_NAME.match(path.name)
+        if match:
+            counts.add(int(match.group(2)))
+    return counts
+
+
+def _remove_layout(directory: Path, count: int) -> None:
+    """Delete the shard files of one layout, with their sidecars."""
+    for index in range(count):
+        path = shard_path(directory, index, count)
+        for old in directory.glob(path.name + "*"):
+            old.unlink()
+
+
+def _finish_reshard(directory: Path, discard_incomplete: bool) -> None:
+    """
+    Complete a reshard that was interrupted after its new layout was written.
+
+    The old layout is deleted and the staged files are moved into place;
+    every step can be repeated, so an interruption here is completed by
+    the next call.
+
+    Args:
+        directory: Directory holding the shard files
+        discard_incomplete: Delete a staged layout that is not marked
+            complete; only :func:`reshard` may, since another process
+            could still be writing it
+    """
+    staging = directory / _STAGING
+    if not staging.is_dir():
+        return
+    marker = staging / _COMPLETE
+    if not marker.exists():
+        if discard_incomplete:
+            shutil.rmtree(staging)
+        return
+    shards = int(marker.read_text(encoding="utf-8"))
+    for count in _shard_counts(directory) - {shards}:
+        _remove_layout(directory, count)
+    for path in staging.iterdir():
+        if path != marker:
+            os.replace(path, directory / path.name)
+    shutil.rmtree(staging)
+
+
+def _query_shard(
+    storage_class: Type[Storage], path: str, text_index: bool, method: str, args: Tuple[Any, ...]
+) -> List[Task]:
+    """Run a query against one shard; executed in a pool worker."""
+    manager = _worker_managers.get(path)
+    if manager is None:
+        # Shared managers reload only what changed since the previous query.
+        manager = TaskManager(storage=storage_class(path), text_index=text_index, shared=True)
+        _worker_managers[path] = manager
+    result: List[Task] = getattr(manager, method)(*args)
+    return result
+
+
+def _by_creation(task: Task) -> datetime:
+    return task.created_at
+
+
+class ShardedTaskManager:
+    """
+    Task manager that hash-partitions tasks by ID across several shards.
+
+    Each shard is a :class:`~tasklib.manager.TaskManager` with its own file
+    in ``directory``, so a mutation only rewrites or appends to one shard.
+    Operations on a single task go straight to the owning shard; listings,
+    filters and searches visit every shard and merge the results in
+    creation order.
+
+    With ``processes`` set, filters and searches run in a process pool.
+    Each worker keeps its own copy of the shards and refreshes it from disk
+    when a shard changes, so queries scale past one core at the cost of
+    pickling results back; it pays off for selective queries over large
+    shards. Mutations made inside an open :meth:`TaskManager.batch` of a
+    shard are not visible to workers until the batch is written.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        shards: int = 4,
+        storage_class: Type[Storage] = JSONStorage,
+        text_index: bool = False,
+        processes: Optional[int] = None,
+    ):
+        """
+        Initialize the sharded task manager.
+
+        Args:
+            directory: Directory holding the shard files; created if missing
+            shards: Number of shards; must match the shards already stored
+            storage_class: Storage backend for each shard, called with the
+                shard path
+            text_index: Maintain an n-gram index in every shard
+            processes: Number of worker processes for filters and searches;
+                queries run in this process when None
+
+        Raises:
+            ValueError: If ``directory`` already holds a different number
+                of shards; use :func:`reshard` to change it
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _finish_reshard(self.directory, discard_incomplete=False)
+        existing = _shard_counts(self.directory) - {shards}
+        if existing:
+            raise ValueError(
+                f"{self.directory} holds {sorted(existing)} shards, not {shards}; use reshard()"
+            )
+        self.storage_class = storage_class
+        self._text_index = text_index
+        self._paths = [shard_path(self.directory, i, shards) for i in range(shards)]
+        shared = processes is not None
+        self.shards = [
+            TaskManager(storage=storage_class(path), text_index=text_index, shared=shared)
+            for path in self._paths
+        ]
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if processes is not None:
+            self._pool = ProcessPoolExecutor(processes)
+
+    def shard_for(self, task_id: str) -> TaskManager:
+        """Return the shard that owns a task ID."""
+        return self.shards[shard_for(task_id, len(self.shards))]
+
+    def save(self, force: bool = False) -> None:
+        """
+        Save every shard.
+
+        Args:
+            force: Write even if nothing changed since the last save
+        """
+        for shard in self.shards:
+            shard.save(force)
+
+    def close(self) -> None:
+        """Close every shard and stop the worker processes."""
+        for shard in self.shards:
+            shard.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ShardedTaskManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in creation order, as a new list."""
+        return self.get_tasks()
+
+    def add_task(
+        self,
+        title: str,
+        description: str = "",
+        priority: Priority = Priority.MEDIUM,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> str:
+        """
+        Add a new task to the shard that owns its ID.
+
+        Args:
+            title: Task title
+            description: Task description
+            priority: Task priority
+            due_date: Due date as a datetime, ISO string or parseable date
+
+        Returns:
+            The ID of the created task
+        """
+        task = self._new_task(title, description, priority, due_date)
+        return self.shard_for(task.id).put_task(task)
+
+    def _new_task(
+        self,
+        title: str,
+        description: str = "",
+        priority: Priority = Priority.MEDIUM,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> Task:
+        now = datetime.now()
+        return Task(
+            title=title,
+            description=description,
+            priority=priority,
+            due_date=parse_date(due_date) if due_date else None,
+            created_at=now,
+            updated_at=now,
+        )
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Get a task by ID."""
+        return self.shard_for(task_id).get_task(task_id)
+
+    def get_tasks(self) -> List[Task]:
+        """Get all tasks, in creation order."""
+        tasks = [task for shard in self.shards for task in shard.get_tasks()]
+        tasks.sort(key=_by_creation)
+        return tasks
+
+    def update_task(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> bool:
+        """
+        Update an existing task.
+
+        Args:
+            task_id: ID of task to update
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            True if task was updated, False if not found
+        """
+        return self.shard_for(task_id).update_task(
+            task_id, title, description, priority, status, due_date
+        )
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task.
+
+        Args:
+            task_id: ID of task to delete
+
+        Returns:
+            True if task was deleted, False if not found
+        """
+        return self.shard_for(task_id).delete_task(task_id)
+
+    def _group(self, task_ids: Iterable[str]) -> DefaultDict[int, List[str]]:
+        """Group task IDs by the index of their shard."""
+        groups: DefaultDict[int, List[str]] = defaultdict(list)
+        for task_id in task_ids:
+            groups[shard_for(task_id, len(self.shards))].append(task_id)
+        return groups
+
+    def _put_tasks(self, tasks: Iterable[Task], skip_existing: bool = False) -> int:
+        """Add built tasks with one write per shard; return how many were added."""
+        groups: DefaultDict[int, List[Task]] = defaultdict(list)
+        for task in tasks:
+            groups[shard_for(task.id, len(self.shards))].append(task)
+        added = 0
+        for index, group in groups.items():
+            shard = self.shards[index]
+            with shard.batch():
+                for task in group:
+                    if skip_existing and shard.get_task(task.id) is not None:
+                        continue
+                    shard.put_task(task)
+                    added += 1
+        return added
+
+    def add_tasks(self, tasks: Iterable[Mapping[str, Any]]) -> List[str]:
+        """
+        Add several tasks with one write per shard.
+
+        Each shard's batch is atomic, but a failure in one shard does not
+        undo batches already written to others.
+
+        Args:
+            tasks: Keyword arguments for :meth:`add_task`, one mapping per task
+
+        Returns:
+            The IDs of the created tasks, in input order
+        """
+        built = [self._new_task(**kwargs) for kwargs in tasks]
+        self._put_tasks(built)
+        return [task.id for task in built]
+
+    def update_tasks(
+        self,
+        task_ids: Iterable[str],
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> int:
+        """
+        Apply the same update to several tasks with one write per shard.
+
+        Args:
+            task_ids: IDs of tasks to update; unknown IDs are skipped
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            Number of tasks updated
+        """
+        return sum(
+            self.shards[index].update_tasks(ids, title, description, priority, status, due_date)
+            for index, ids in self._group(task_ids).items()
+        )
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        Delete several tasks with one write per shard.
+
+        Args:
+            task_ids: IDs of tasks to delete; unknown IDs are skipped
+
+        Returns:
+            Number of tasks deleted
+        """
+        return sum(
+            self.shards[index].delete_tasks(ids) for index, ids in self._group(task_ids).items()
+        )
+
+    def _fan_out(self, method: str, *args: Any) -> List[Task]:
+        """Run a query on every shard, in the pool if there is one."""
+        if self._pool is None:
+            return [task for shard in self.shards for task in getattr(shard, method)(*args)]
+        futures = [
+            self._pool.submit(
+                _query_shard, self.storage_class, str(path), self._text_index, method, args
+            )
+            for path in self._paths
+        ]
+        return [task for future in futures for task in future.result()]
+
+    def filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+    ) -> List[Task]:
+        """
+        Filter tasks by criteria on every shard.
+
+        Args:
+            status: Filter by status
+            priority: Filter by priority
+            overdue_only: Only return overdue tasks
+
+        Returns:
+            List of matching tasks, in creation order
+        """
+        tasks = self._fan_out("filter_tasks", status, priority, overdue_only)
+        tasks.sort(key=_by_creation)
+        return tasks
+
+    def search_tasks(
+        self, query: str, ranked: bool = False, limit: Optional[int] = None
+    ) -> List[Task]:
+        """
+        Search tasks by title or description on every shard.
+
+        Args:
+            query: Search query string
+            ranked: Order title matches before description-only matches
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of matching tasks, in creation order unless ranked
+        """
+        tasks = self._fan_out("search_tasks", query, ranked, limit)
+        if ranked:
+            query_lower = query.lower()
+
+            def rank(task: Task) -> Tuple[int, datetime]:
+                score = match_score(query_lower, task.title.lower(), task.description.lower())
+                return (-score, task.created_at)
+
+            tasks.sort(key=rank)
+        else:
+            tasks.sort(key=_by_creation)
+        return tasks if limit is None else tasks[:limit]
+
+    def stats(self) -> TaskStats:
+        """
+        Summarize the collection by adding up each shard's counts.
+
+        Returns:
+            Counts per status and priority, overdue tasks and a due-date histogram
+        """
+        parts = [shard.stats() for shard in self.shards]
+        first = parts[0]
+        return TaskStats(
+            total=sum(part.total for part in parts),
+            by_status={key: sum(part.by_status[key] for part in parts) for key in first.by_status},
+            by_priority={
+                key: sum(part.by_priority[key] for part in parts) for key in first.by_priority
+            },
+            overdue=sum(part.overdue for part in parts),
+            due_histogram={
+                key: sum(part.due_histogram[key] for part in parts) for key in first.due_histogram
+            },
+        )
+
+    def migrate_from(self, storage: Storage) -> int:
+        """
+        Import every task from an unsharded store.
+
+        Tasks keep their IDs and timestamps; tasks whose ID already exists
+        are skipped.
+
+        Args:
+            storage: Storage backend holding the tasks, e.g. a
+                :class:`~tasklib.storage.JSONStorage` for ``tasks.json``
+
+        Returns:
+            Number of tasks imported
+        """
+        return self._put_tasks(storage.iter_tasks(), skip_existing=True)
+
+
+def reshard(
+    directory: Union[str, Path], shards: int, storage_class: Type[Storage] = JSONStorage
+) -> int:
+    """
+    Redistribute a sharded store across a different number of shards.
+
+    The new shard files are first written to a ``.reshard`` staging
+    subdirectory, which is marked complete once every shard is written.
+    Only then are the old files deleted and the new ones moved into
+    place. If this is interrupted before the mark, the old layout stays
+    intact and the next ``reshard`` discards the staged files; after the
+    mark, the next ``reshard`` or :class:`ShardedTaskManager` opening the
+    directory finishes the switch to the new layout. Close any
+    :class:`ShardedTaskManager` using the directory first.
+
+    Args:
+        directory: Directory holding the shard files
+        shards: New number of shards
+        storage_class: Storage backend of the shards
+
+    Returns:
+        Number of tasks in the store
+
+    Raises:
+        ValueError: If the directory already holds a layout with ``shards`` shards
+    """
+    directory = Path(directory)
+    _finish_reshard(directory, discard_incomplete=True)
+    counts = _shard_counts(directory)
+    if shards in counts:
+        raise ValueError(f"{directory} already holds {shards} shards")
+
+    groups: List[List[Task]] = [[] for _ in range(shards)]
+    for count in counts:
+        for index in range(count):
+            for task in storage_class(shard_path(directory, index, count)).iter_tasks():
+                groups[shard_for(task.id, shards)].append(task)
+
+    staging = directory / _STAGING
+    staging.mkdir()
+    for index, group in enumerate(groups):
+        group.sort(key=_by_creation)
+        storage_class(shard_path(staging, index, shards)).save(group)
+    pending = staging / (_COMPLETE + ".tmp")
+    pending.write_text(str(shards), encoding="utf-8")
+    os.replace(pending, staging / _COMPLETE)
+
+    _finish_reshard(directory, discard_incomplete=False)
+    return sum(len(group) for group in groups)
@@ -0,0 +1,512 @@
+"""SQLite-backed task manager."""
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from tasklib.dates import parse_date
+from tasklib.models import DUE_BUCKETS, Task, TaskStats, Priority, Status
+from tasklib.storage import JSONStorage
+
+_COLUMNS = "id, title, description, priority, status, due_date, created_at, updated_at"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    due_date TEXT,
+    due_ts REAL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS tasks_due_ts ON tasks (due_ts);
+"""
+
+# Trigram tokens give substring matching, the same semantics as the scan.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description, content='tasks', content_rowid='seq', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.seq, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.seq, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.seq, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.seq, new.title, new.description);
+END;
+"""
+
+_TRIGRAM_LENGTH = 3
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    """Lowercase like :meth:`str.lower`; SQL ``lower()`` only folds ASCII."""
+    return value.lower() if value is not None else None
+
+
+_SORT_COLUMNS = {
+    "priority": "CASE priority "
+    + " ".join(f"WHEN '{p.value}' THEN {rank}" for rank, p in enumerate(Priority))
+    + " END",
+    "due_date": "due_ts",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+def _order_by(sort_by: Optional[str], descending: bool) -> str:
+    """Build the ORDER BY terms for a sort field, ending with insertion order."""
+    direction = " DESC" if descending else ""
+    if sort_by is None:
+        return f"seq{direction}"
+    if sort_by not in _SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort_by!r}; expected one of {tuple(_SORT_COLUMNS)}")
+    column = _SORT_COLUMNS[sort_by]
+    # Tasks without a due date sort last in both directions.
+    nulls = "due_ts IS NULL, " if sort_by == "due_date" else ""
+    return f"{nulls}{column}{direction}, seq"
+
+
+class SQLiteTaskManager:
+    """
+    Task manager backed by an SQLite database.
+
+    Offers the same API as :class:`~tasklib.manager.TaskManager` but keeps
+    tasks on disk instead of in memory: opening is constant time, and
+    filters and searches run as indexed SQL queries. Searches use an FTS5
+    trigram index when the SQLite build provides one.
+    """
+
+    def __init__(self, storage_path: str = "tasks.db"):
+        """
+        Initialize the task manager.
+
+        Args:
+            storage_path: Path to the SQLite database file
+        """
+        self.storage_path = Path(storage_path)
+        self._conn = sqlite3.connect(str(self.storage_path), isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("py_lower", 1, _lower, deterministic=True)
+        self._batch_depth = 0
+        self.load()
+
+    def load(self) -> None:
+        """Open the database and create the schema if needed."""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+
+    def save(self) -> None:
+        """Flush the write-ahead log into the database file."""
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteTaskManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in insertion order, as a new list."""
+        return self.get_tasks()
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteTaskManager"]:
+        """
+        Group mutations into a single transaction.
+
+        Changes are committed when the outermost block exits. If an
+        exception escapes a block, that block's changes are rolled back
+        and the exception is re-raised. Blocks may be nested.
+
+        Yields:
+            This task manager
+        """
+        name = f"batch_{self._batch_depth}"
+        self._conn.execute(f"SAVEPOINT {name}")
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._conn.execute(f"ROLLBACK TO {name}")
+            self._conn.execute(f"RELEASE {name}")
+            raise
+        else:
+            self._conn.execute(f"RELEASE {name}")
+        finally:
+            self._batch_depth -= 1
+
+    def _row_to_task(self, row: sqlite3.Row) -> Task:
+        return Task.from_dict({key: row[key] for key in _COLUMNS.split(", ")})
+
+    def _query(self, where: str = "", params: Any = (), tail: str = "") -> List[Task]:
+        sql = f"SELECT {_COLUMNS} FROM tasks {where} {tail or 'ORDER BY seq'}"
+        return [self._row_to_task(row) for row in self._conn.execute(sql, params)]
+
+    def _insert(self, task: Task) -> None:
+        data = task.to_dict()
+        self._conn.execute(
+            f"INSERT INTO tasks ({_COLUMNS}, due_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                data["id"],
+                data["title"],
+                data["description"],
+                data["priority"],
+                data["status"],
+                data["due_date"],
+                data["created_at"],
+                data["updated_at"],
+                _timestamp(task.due_date),
+            ),
+        )
+
+    def add_task(
+        self,
+        title: str,
+        description: str = "",
+        priority: Priority = Priority.MEDIUM,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> str:
+        """
+        Add a new task.
+
+        Args:
+            title: Task title
+            description: Task description
+            priority: Task priority
+            due_date: Due date as a datetime, ISO string or parseable date
+
+        Returns:
+            The ID of the created task
+        """
+        due_date_obj = None
+        if due_date:
+            due_date_obj = parse_date(due_date)
+
+        task = Task(title=title, description=description, priority=priority, due_date=due_date_obj)
+        self._insert(task)
+        return task.id
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Get a task by ID."""
+        tasks = self._query("WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def get_tasks(self) -> List[Task]:
+        """Get all tasks."""
+        return self._query()
+
+    def update_task(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> bool:
+        """
+        Update an existing task.
+
+        Args:
+            task_id: ID of task to update
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            True if task was updated, False if not found
+        """
+        task = self.get_task(task_id)
+        if not task:
+            return False
+
+        task.apply_update(
+            title, description, priority, status, None if due_date is None else parse_date(due_date)
+        )
+        data = task.to_dict()
+        self._conn.execute(
+            "UPDATE tasks SET title = ?, description = ?, priority = ?, status = ?,"
+            " due_date = ?, due_ts = ?, updated_at = ? WHERE id = ?",
+            (
+                data["title"],
+                data["description"],
+                data["priority"],
+                data["status"],
+                data["due_date"],
+                _timestamp(task.due_date),
+                data["updated_at"],
+                task_id,
+            ),
+        )
+        return True
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task.
+
+        Args:
+            task_id: ID of task to delete
+
+        Returns:
+            True if task was deleted, False if not found
+        """
+        cursor = self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def add_tasks(self, tasks: Iterable[Mapping[str, Any]]) -> List[str]:
+        """
+        Add several tasks in one transaction.
+
+        Args:
+            tasks: Keyword arguments for :meth:`add_task`, one mapping per task
+
+        Returns:
+            The IDs of the created tasks, in input order
+        """
+        with self.batch():
+            return [self.add_task(**kwargs) for kwargs in tasks]
+
+    def update_tasks(
+        self,
+        task_ids: Iterable[str],
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        status: Optional[Status] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+    ) -> int:
+        """
+        Apply the same update to several tasks with one statement.
+
+        Args:
+            task_ids: IDs of tasks to update; unknown IDs are skipped
+            title: New title (optional)
+            description: New description (optional)
+            priority: New priority (optional)
+            status: New status (optional)
+            due_date: New due date (optional)
+
+        Returns:
+            Number of tasks updated
+        """
+        due = None if due_date is None else parse_date(due_date)
+        values = (
+            title,
+            description,
+            None if priority is None else priority.value,
+            None if status is None else status.value,
+            None if due is None else due.isoformat(),
+            _timestamp(due),
+            datetime.now().isoformat(),
+        )
+        # Fields passed as None keep their value through COALESCE.
+        with self.batch():
+            cursor = self._conn.executemany(
+                "UPDATE tasks SET title = COALESCE(?, title),"
+                " description = COALESCE(?, description), priority = COALESCE(?, priority),"
+                " status = COALESCE(?, status), due_date = COALESCE(?, due_date),"
+                " due_ts = COALESCE(?, due_ts), updated_at = ? WHERE id = ?",
+                (values + (task_id,) for task_id in task_ids),
+            )
+            return cursor.rowcount
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """
+        Delete several tasks with one statement.
+
+        Args:
+            task_ids: IDs of tasks to delete; unknown IDs are skipped
+
+        Returns:
+            Number of tasks deleted
+        """
+        with self.batch():
+            cursor = self._conn.executemany(
+                "DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in task_ids)
+            )
+            return cursor.rowcount
+
+    def filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Task]:
+        """
+        Filter tasks by criteria.
+
+        Args:
+            status: Filter by status
+            priority: Filter by priority
+            overdue_only: Only return overdue tasks
+            sort_by: Order by ``"priority"``, ``"due_date"``, ``"created_at"``
+                or ``"updated_at"`` instead of insertion order
+            descending: Reverse the sort order; ties stay in insertion order
+            limit: Maximum number of tasks to return
+            offset: Number of matching tasks to skip
+
+        Returns:
+            List of matching tasks
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+
+        if priority is not None:
+            clauses.append("priority = ?")
+            params.append(priority.value)
+
+        if overdue_only:
+            clauses.append("due_ts < ? AND status != ?")
+            params.extend([datetime.now().timestamp(), Status.COMPLETED.value])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.extend([-1 if limit is None else limit, offset])
+        return self._query(
+            where, params, f"ORDER BY {_order_by(sort_by, descending)} LIMIT ? OFFSET ?"
+        )
+
+    def search_tasks(
+        self,
+        query: str,
+        ranked: bool = False,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+    ) -> List[Task]:
+        """
+        Search tasks by title or description.
+
+        Args:
+            query: Search query string
+            ranked: Order title matches before description-only matches;
+                ``sort_by`` then orders tasks with equal scores
+            limit: Maximum number of tasks to return
+            sort_by: Order by ``"priority"``, ``"due_date"``, ``"created_at"``
+                or ``"updated_at"`` instead of insertion order
+            descending: Reverse the sort order; ties stay in insertion order
+            offset: Number of matching tasks to skip
+
+        Returns:
+            List of matching tasks, in insertion order unless ranked or sorted
+        """
+        query_lower = query.lower()
+        score = "(instr(py_lower(title), :q) > 0) * 2 + (instr(py_lower(description), :q) > 0)"
+        params: Dict[str, Any] = {
+            "q": query_lower,
+            "limit": -1 if limit is None else limit,
+            "offset": offset,
+        }
+
+        where = f"WHERE {score} > 0"
+        if self.has_fts and len(query_lower) >= _TRIGRAM_LENGTH:
+            where += " AND seq IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH :phrase)"
+            params["phrase"] = '"' + query_lower.replace('"', '""') + '"'
+
+        order = _order_by(sort_by, descending)
+        if ranked:
+            order = f"{score} DESC, {order}"
+        return self._query(where, params, f"ORDER BY {order} LIMIT :limit OFFSET :offset")
+
+    def stats(self) -> TaskStats:
+        """
+        Summarize the collection with aggregate queries.
+
+        Returns:
+            Counts per status and priority, overdue tasks and a due-date histogram
+        """
+        by_status = {status: 0 for status in Status}
+        for row in self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            by_status[Status(row[0])] = row[1]
+        by_priority = {priority: 0 for priority in Priority}
+        for row in self._conn.execute("SELECT priority, COUNT(*) FROM tasks GROUP BY priority"):
+            by_priority[Priority(row[0])] = row[1]
+
+        now = datetime.now()
+        bounds = [(now + horizon).timestamp() for _, horizon in DUE_BUCKETS]
+        row = self._conn.execute(
+            "SELECT COUNT(*), COUNT(due_ts), "
+            + ", ".join("COALESCE(SUM(due_ts < ?), 0)" for _ in bounds)
+            + " FROM tasks WHERE status != ?",
+            (*bounds, Status.COMPLETED.value),
+        ).fetchone()
+        open_tasks, with_due, cumulative = row[0], row[1], row[2:]
+
+        histogram: Dict[str, int] = {}
+        previous = 0
+        for (name, _), count in zip(DUE_BUCKETS, cumulative):
+            histogram[name] = count - previous
+            previous = count
+        histogram["later"] = with_due - previous
+        histogram["no_due_date"] = open_tasks - with_due
+        return TaskStats(
+            total=sum(by_status.values()),
+            by_status=by_status,
+            by_priority=by_priority,
+            overdue=histogram["overdue"],
+            due_histogram=histogram,
+        )
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Import every task from a ``tasks.json`` file.
+
+        Tasks keep their IDs and timestamps; tasks whose ID already exists
+        in the database are skipped.
+
+        Args:
+            json_path: Path to a file written by :class:`~tasklib.storage.JSONStorage`
+
+        Returns:
+            Number of tasks imported
+        """
+        imported = 0
+        with self.batch():
+            for task in JSONStorage(json_path).load():
+                try:
+                    self._insert(task)
+                except sqlite3.IntegrityError:
+                    continue
+                imported += 1
+        return imported
@@ -0,0 +1,721 @@
+"""Storage backends for task persistence."""
+
+import hashlib
+import json
+import os
+import re
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from tasklib.metrics import Metrics, NullMetrics
+from tasklib.models import Priority, Status, Task
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Inode, size and modification time of a file, or None if it does not exist.
+FileSignature = Optional[Tuple[int, int, int]]
+
+# A mutation read back from storage: op, task ID, and the task (None for deletes).
+Change = Tuple[str, str, Optional[Task]]
+
+
+class Durability(Enum):
+    """How far a save waits for data to reach the disk."""
+
+    NONE = "none"
+    FILE = "file"
+    DIRECTORY = "directory"
+
+
+def encode_tasks(tasks: Collection[Task], compact: bool = False) -> str:
+    """
+    Serialize tasks in the ``tasks.json`` format.
+
+    The output is identical to ``json.dumps(data, indent=2)``, or to
+    ``json.dumps(data, separators=(",", ":"))`` when compact. When
+    ``orjson`` is installed it is used for ASCII-only data, where its
+    output matches the standard library byte for byte.
+
+    Args:
+        tasks: Tasks to serialize
+        compact: Omit indentation and spaces after separators
+
+    Returns:
+        The JSON document as text
+    """
+    data = [task.to_dict() for task in tasks]
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        # json escapes everything outside printable ASCII; orjson does not.
+        if encoded.isascii() and b"\x7f" not in encoded:
+            return encoded.decode("ascii")
+    if compact:
+        return json.dumps(data, separators=(",", ":"))
+    return json.dumps(data, indent=2)
+
+
+def decode_tasks(text: Union[str, bytes]) -> List[Task]:
+    """
+    Parse a ``tasks.json`` document, using ``orjson`` when installed.
+
+    Args:
+        text: The JSON document
+
+    Returns:
+        The decoded tasks
+
+    Raises:
+        ValueError: If the document is not valid JSON (``json.JSONDecodeError``
+            and ``orjson.JSONDecodeError`` are both subclasses)
+    """
+    data = orjson.loads(text) if orjson is not None else json.loads(text)
+    return [Task.from_dict(task_data) for task_data in data]
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array without reading it whole.
+
+    Only the current chunk and the element being decoded are held in
+    memory. An empty file yields nothing. Elements are expected to be
+    objects: a bare number split across two chunks would be misread.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof, opened = "", 0, False, False
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+        if pos == len(buf):
+            if eof:
+                if opened:
+                    raise ValueError("Unterminated JSON array")
+                return
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            continue
+
+        char = buf[pos]
+        if not opened:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            opened, pos = True, pos + 1
+        elif char == ",":
+            pos += 1
+        elif char == "]":
+            return
+        else:
+            try:
+                value, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The element continues past the end of the buffer.
+                chunk = f.read(chunk_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            yield value
+
+
+def _snapshot_digest(data: bytes) -> str:
+    """Fingerprint snapshot contents, to tie a journal to the snapshot it follows."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _complete_length(f: IO[bytes], size: int, block_size: int = 4096) -> int:
+    """Return the length of a file up to and including its last newline."""
+    end = size
+    while end > 0:
+        start = max(end - block_size, 0)
+        f.seek(start)
+        index = f.read(end - start).rfind(b"\n")
+        if index >= 0:
+            return start + index + 1
+        end = start
+    return 0
+
+
+def _file_signature(path: Path) -> FileSignature:
+    """Return a fingerprint that changes whenever the file is written or replaced."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class Storage:
+    """
+    Base class for task storage backends.
+
+    A backend must be able to load and save the full task collection.
+    Backends that can persist a single mutation more cheaply than a full
+    rewrite override :meth:`record`, and those that can tell what another
+    process changed override :meth:`load_changes`. Backends that can read
+    single tasks without loading the collection override :meth:`read_task`
+    and :meth:`filter_tasks` and set :attr:`random_access`, which tells a
+    lazy manager to use them until it has to load.
+
+    ``metrics`` receives the time spent encoding, decoding and writing and
+    the number of bytes written; a manager created with ``metrics`` sets it.
+    """
+
+    metrics: Union[Metrics, NullMetrics] = NullMetrics()
+    random_access = False
+
+    def __init__(self, path: Union[str, Path], durability: Durability = Durability.NONE):
+        """
+        Initialize the storage backend.
+
+        Args:
+            path: Path to the primary storage file
+            durability: Whether writes are fsynced, and whether the
+                directory entry is fsynced after a rename
+        """
+        self.path = Path(path)
+        self.durability = durability
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock_file: Optional[IO[bytes]] = None
+        self._lock_depth = 0
+        self._lock_exclusive = False
+        # Guards the depth count, which threads holding a shared lock share.
+        self._lock_guard = threading.Lock()
+
+    @contextmanager
+    def lock(self, shared: bool = False) -> Iterator[None]:
+        """
+        Hold an advisory lock on the storage, shared between processes.
+
+        The lock is an ``flock`` on the ``<path>.lock`` sidecar file, so it
+        only coordinates processes that also take it. It is held per
+        process: requests made while it is held, by the holder or by other
+        threads, only count nesting, and the file is unlocked when the
+        last one exits. Threads must therefore exclude each other by other
+        means, as the manager's lock does. Requesting an exclusive lock
+        while a shared one is held raises :class:`RuntimeError`. Where
+        ``fcntl`` is unavailable this does nothing.
+
+        Args:
+            shared: Take a shared (reader) lock instead of an exclusive one
+        """
+        if fcntl is None:  # pragma: no cover - not available on Windows
+            yield
+            return
+        with self._lock_guard:
+            if self._lock_depth:
+                if not shared and not self._lock_exclusive:
+                    raise RuntimeError("Cannot upgrade a shared storage lock to an exclusive lock")
+            else:
+                if self._lock_file is None:
+                    self._lock_file = open(self.lock_path, "ab")
+                fcntl.flock(self._lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                self._lock_exclusive = not shared
+            self._lock_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock_guard:
+                self._lock_depth -= 1
+                if not self._lock_depth and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Release the lock file, if one was opened."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def signature(self) -> Tuple[FileSignature, ...]:
+        """
+        Return a cheap fingerprint of the stored data.
+
+        The fingerprint is built from ``stat`` calls and changes with every
+        write, by this process or another, so comparing it with an earlier
+        value tells whether the data needs reloading.
+        """
+        return (_file_signature(self.path),)
+
+    def load_changes(self) -> Optional[List[Change]]:
+        """
+        Read mutations written by others since this instance last read or wrote.
+
+        The default implementation cannot tell what changed and asks for a
+        full reload.
+
+        Returns:
+            The changes in the order they happened, or None if the caller
+            must reload everything with :meth:`load`
+        """
+        return None
+
+    def read_task(self, task_id: str) -> Optional[Task]:
+        """
+        Read one task without keeping the collection in memory.
+
+        The default implementation scans :meth:`iter_tasks`; backends that
+        set :attr:`random_access` find the task without decoding the rest.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            The task, or None if it is not stored
+        """
+        for task in self.iter_tasks():
+            if task.id == task_id:
+                return task
+        return None
+
+    def filter_tasks(
+        self,
+        status: Optional[Status] = None,
+        priority: Optional[Priority] = None,
+        overdue_only: bool = False,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Task]:
+        """
+        Read the tasks matching a filter without keeping the collection in memory.
+
+        The arguments mean the same as for :meth:`TaskManager.filter_tasks
+        <tasklib.manager.TaskManager.filter_tasks>`; results are in stored
+        order, reversed if ``descending``. The default implementation scans
+        :meth:`iter_tasks`; backends that set :attr:`random_access` test
+        only the fields involved.
+        """
+        now = datetime.now()
+        matches = [
+            task
+            for task in self.iter_tasks()
+            if (status is None or task.status == status)
+            and (priority is None or task.priority == priority)
+            and (not overdue_only or task.is_overdue(now))
+        ]
+        if descending:
+            matches.reverse()
+        stop = None if limit is None else offset + limit
+        return matches[offset:stop]
+
+    def _sync(self, f: IO[Any]) -> None:
+        """Flush an open file to disk if the durability setting asks for it."""
+        if self.durability is not Durability.NONE:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_atomic(self, path: Path, text: Union[str, bytes]) -> None:
+        """
+        Replace a file's contents so readers see either the old or new version.
+
+        The text, or raw bytes, is written to a temporary file in the same
+        directory, which is then renamed over the target.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            if path.exists():
+                os.chmod(tmp_name, stat.S_IMODE(path.stat().st_mode))
+            binary = isinstance(text, bytes)
+            mode, encoding = ("wb", None) if binary else ("w", "utf-8")
+            with self.metrics.time("storage.write"), open(fd, mode, encoding=encoding) as f:
+                f.write(text)
+                self._sync(f)
+                written = f.tell()
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.metrics.add_bytes_written("storage.write", written)
+        if self.durability is Durability.DIRECTORY and hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def load(self) -> List[Task]:
+        """Load all tasks from storage."""
+        raise NotImplementedError
+
+    def save(self, tasks: Collection[Task]) -> None:
+        """Persist the full task collection."""
+        raise NotImplementedError
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Iterate over stored tasks.
+
+        The default implementation loads the whole collection; backends
+        that can parse incrementally override it to stream in constant
+        memory.
+        """
+        return iter(self.load())
+
+    def record(
+        self, op: str, task: Task, tasks: Collection[Task]  # pylint: disable=unused-argument
+    ) -> None:
+        """
+        Persist a single mutation.
+
+        The default implementation rewrites the whole collection.
+
+        Args:
+            op: Mutation type, one of ``"add"``, ``"update"`` or ``"delete"``
+            task: The task that was mutated
+            tasks: The full task collection after the mutation
+        """
+        self.save(tasks)
+
+    def record_many(
+        self,
+        ops: Sequence[Tuple[str, Task]],  # pylint: disable=unused-argument
+        tasks: Collection[Task],
+    ) -> None:
+        """
+        Persist several mutations at once.
+
+        The default implementation rewrites the whole collection.
+
+        Args:
+            ops: Mutation type and task pairs, in the order they happened
+            tasks: The full task collection after the mutations
+        """
+        self.save(tasks)
+
+
+class JSONStorage(Storage):
+    """
+    Stores all tasks in a single JSON file, rewritten on every change.
+
+    Saves are atomic: a crash mid-write leaves the previous file intact.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        durability: Durability = Durability.NONE,
+        compact: bool = False,
+    ):
+        """
+        Initialize the JSON storage.
+
+        Args:
+            path: Path to the JSON file
+            durability: Whether writes are fsynced, and whether the
+                directory entry is fsynced after a rename
+            compact: Write JSON without indentation, about 30% fewer bytes
+        """
+        super().__init__(path, durability)
+        self.compact = compact
+
+    def load(self) -> List[Task]:
+        """
+        Load tasks from the JSON file.
+
+        Returns:
+            The stored tasks, or an empty list if the file does not exist
+            or is empty, as a freshly created temporary file is
+
+        Raises:
+            ValueError: If the file is not a valid task document. Saves
+                are atomic, so this means it was corrupted or edited by
+                hand; it is never treated as empty, which would let the
+                next save overwrite it
+        """
+        if not self.path.exists():
+            return []
+        with open(self.path, "rb") as f:
+            return self._decode(f.read())
+
+    def _decode(self, data: bytes) -> List[Task]:
+        """Decode the contents of the file; see :meth:`load`."""
+        if not data.strip():
+            return []
+        try:
+            return self.metrics.call("storage.decode", decode_tasks, data)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"{self.path} is not a valid task file: {exc!r}") from exc
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Stream tasks from the JSON file, parsing one element at a time.
+
+        Raises:
+            ValueError: If the file is malformed; tasks before the error
+                have already been yielded
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for task_data in _iter_json_array(f):
+                yield Task.from_dict(task_data)
+
+    def save(self, tasks: Collection[Task]) -> None:
+        """Save tasks to the JSON file."""
+        text = self.metrics.call("storage.encode", encode_tasks, tasks, self.compact)
+        self._write_atomic(self.path, text)
+
+
+class NDJSONStorage(JSONStorage):
+    """
+    Stores one task per line as newline-delimited JSON.
+
+    Lines are parsed independently, so :meth:`iter_tasks` streams the file
+    in constant memory and loading never holds the whole document.
+    """
+
+    def load(self) -> List[Task]:
+        """
+        Load tasks from the NDJSON file.
+
+        Raises:
+            ValueError: If a line is not a valid task, naming the line
+        """
+        return list(self.iter_tasks())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Stream tasks from the NDJSON file, one line at a time.
+
+        Raises:
+            ValueError: If a line is not a valid task, naming the line;
+                tasks before it have already been yielded
+        """
+        if not self.path.exists():
+            return
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    task = Task.from_dict(loads(line))
+                except (KeyError, TypeError, ValueError) as exc:
+                    raise ValueError(f"{self.path}, line {number}: invalid task: {exc!r}") from exc
+                yield task
+
+    def save(self, tasks: Collection[Task]) -> None:
+        """Save tasks to the NDJSON file."""
+        with self.metrics.time("storage.encode"):
+            text = "".join(
+                json.dumps(task.to_dict(), separators=(",", ":")) + "\n" for task in tasks
+            )
+        self._write_atomic(self.path, text)
+
+
+class JournalStorage(JSONStorage):
+    """
+    JSON snapshot plus an append-only journal of mutations.
+
+    Each mutation is appended to ``<path>.journal`` as one compact JSON
+    line, so a single edit costs O(1) I/O. Once the journal holds
+    ``compact_threshold`` records it is folded into a fresh snapshot.
+    The snapshot uses the same format as :class:`JSONStorage`.
+
+    The journal starts with a digest of the snapshot it applies to. A
+    crash after a new snapshot is written but before the journal is
+    reset leaves a journal whose digest does not match, and its records,
+    which the snapshot already holds, are skipped.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        compact_threshold: int = 1000,
+        durability: Durability = Durability.NONE,
+        compact: bool = False,
+    ):
+        """
+        Initialize the journal storage.
+
+        Args:
+            path: Path to the JSON snapshot file
+            compact_threshold: Number of journal records that triggers compaction
+            durability: Whether snapshot writes and journal appends are fsynced
+            compact: Write the snapshot without indentation
+        """
+        super().__init__(path, durability, compact)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.compact_threshold = compact_threshold
+        self._journal_size = 0
+        # Bytes of the journal already applied, and the snapshot they apply to.
+        self._journal_offset = 0
+        self._snapshot_signature: FileSignature = None
+        self._snapshot_digest: Optional[str] = None
+        # Set when the journal belongs to an older snapshot and must be restarted.
+        self._journal_stale = False
+
+    def _read_snapshot(self) -> bytes:
+        """Read the snapshot, remembering its signature and digest."""
+        self._snapshot_signature = _file_signature(self.path)
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        self._snapshot_digest = _snapshot_digest(data)
+        return data
+
+    def _journal_header(self) -> bytes:
+        """Return the first journal line, naming the snapshot the journal applies to."""
+        if self._snapshot_digest is None:
+            self._read_snapshot()
+        return json.dumps({"snapshot": self._snapshot_digest}).encode("utf-8") + b"\n"
+
+    def _read_journal(self) -> List[Change]:
+        """
+        Read the complete journal records past the current offset.
+
+        Raises:
+            ValueError: If a complete record is not valid, naming its offset
+        """
+        changes: List[Change] = []
+        if not self.journal_path.exists():
+            return changes
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn final line from an interrupted append; the next
+                    # append truncates it.
+                    break
+                offset = self._journal_offset
+                try:
+                    entry = json.loads(line)
+                    if offset == 0 and "snapshot" in entry:
+                        if entry["snapshot"] != self._snapshot_digest:
+                            self._journal_stale = True
+                            return changes
+                    elif entry["op"] == "delete":
+                        changes.append(("delete", entry["id"], None))
+                    else:
+                        task = Task.from_dict(entry["task"])
+                        changes.append((entry["op"], task.id, task))
+                except (KeyError, TypeError, ValueError) as exc:
+                    raise ValueError(
+                        f"{self.journal_path}, byte {offset}: invalid record: {exc!r}"
+                    ) from exc
+                self._journal_offset += len(line)
+        self._journal_size += len(changes)
+        return changes
+
+    def load(self) -> List[Task]:
+        """
+        Load the snapshot and replay the journal on top of it.
+
+        Raises:
+            ValueError: If the snapshot or a complete journal record is not valid
+        """
+        tasks: Dict[str, Task] = {task.id: task for task in self._decode(self._read_snapshot())}
+        self._journal_size = 0
+        self._journal_offset = 0
+        self._journal_stale = False
+        for _, task_id, task in self._read_journal():
+            if task is None:
+                tasks.pop(task_id, None)
+            else:
+                tasks[task_id] = task
+        return list(tasks.values())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Iterate over the tasks; the journal has to be replayed, so this loads them all."""
+        return iter(self.load())
+
+    def signature(self) -> Tuple[FileSignature, ...]:
+        """Return a fingerprint of the snapshot and the journal."""
+        return (_file_signature(self.path), _file_signature(self.journal_path))
+
+    def load_changes(self) -> Optional[List[Change]]:
+        """
+        Read journal records appended by others since the last read or write.
+
+        Returns:
+            The new records, or None if the snapshot was rewritten since
+            and a full reload is needed
+        """
+        if _file_signature(self.path) != self._snapshot_signature:
+            return None
+        journal = _file_signature(self.journal_path)
+        if (journal[1] if journal else 0) < self._journal_offset:
+            return None
+        return self._read_journal()
+
+    def save(self, tasks: Collection[Task]) -> None:
+        """Write a new snapshot and restart the journal."""
+        text = self.metrics.call("storage.encode", encode_tasks, tasks, self.compact)
+        data = text.encode("utf-8")
+        self._write_atomic(self.path, data)
+        self._snapshot_signature = _file_signature(self.path)
+        self._snapshot_digest = _snapshot_digest(data)
+        # Until this replaces the old journal, load skips the old journal's
+        # records, because its header names the previous snapshot.
+        header = self._journal_header()
+        self._write_atomic(self.journal_path, header)
+        self._journal_size = 0
+        self._journal_offset = len(header)
+        self._journal_stale = False
+
+    def record(self, op: str, task: Task, tasks: Collection[Task]) -> None:
+        """Append one mutation to the journal, compacting if needed."""
+        self.record_many([(op, task)], tasks)
+
+    def record_many(self, ops: Sequence[Tuple[str, Task]], tasks: Collection[Task]) -> None:
+        """
+        Append mutations to the journal in a single write, compacting if needed.
+
+        A torn final line left by an interrupted append is cut off first,
+        so the new records start on a line of their own.
+        """
+        if self._journal_size + len(ops) >= self.compact_threshold:
+            self.save(tasks)
+            return
+        with self.metrics.time("storage.encode"):
+            lines = []
+            for op, task in ops:
+                entry: Dict[str, Any]
+                if op == "delete":
+                    entry = {"op": op, "id": task.id}
+                else:
+                    entry = {"op": op, "task": task.to_dict()}
+                lines.append(json.dumps(entry, separators=(",", ":")) + "\n")
+            data = "".join(lines).encode("utf-8")
+        with self.metrics.time("storage.write"), open(self.journal_path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            complete = 0 if self._journal_stale else _complete_length(f, size)
+            if complete < size:
+                f.truncate(complete)
+            if complete == 0:
+                data = self._journal_header() + data
+                self._journal_stale = False
+            f.write(data)
+            self._sync(f)
+            self._journal_offset = f.tell()
+        self.metrics.add_bytes_written("storage.write", len(data))
+        self._journal_size += len(ops)
@@ -0,0 +1,76 @@
+"""Tests for the asyncio task manager."""
+
+import asyncio
+import threading
+
+from tasklib.aio import AsyncTaskManager
+from tasklib.models import Priority, Status
+from tasklib.storage import JSONStorage, JournalStorage
+
+
+class TestAsyncTaskManager:
+    """Test cases for AsyncTaskManager class."""
+
+    def test_crud(self, tmp_path):
+        """Test the async methods mirror TaskManager."""
+
+        async def scenario():
+            async with AsyncTaskManager(storage_path=str(tmp_path / "tasks.json")) as manager:
+                task_id = await manager.add_task("Write docs", priority=Priority.HIGH)
+                ids = await manager.add_tasks([{"title": "Review"}, {"title": "Release"}])
+                assert await manager.update_task(task_id, status=Status.IN_PROGRESS)
+                assert await manager.update_tasks(ids, status=Status.COMPLETED) == 2
+                assert await manager.delete_task(ids[1])
+                assert await manager.delete_tasks(["missing"]) == 0
+
+                assert (await manager.get_task(task_id)).status == Status.IN_PROGRESS
+                assert len(await manager.get_tasks()) == 2
+                completed = await manager.filter_tasks(status=Status.COMPLETED)
+                assert [t.title for t in completed] == ["Review"]
+                assert [t.title for t in await manager.search_tasks("docs")] == ["Write docs"]
+
+        asyncio.run(scenario())
+        titles = [t.title for t in JSONStorage(tmp_path / "tasks.json").load()]
+        assert titles == ["Write docs", "Review"]
+
+    def test_writes_do_not_block_the_loop(self, tmp_path, monkeypatch):
+        """Test storage writes happen off the event loop until flush."""
+        storage = JournalStorage(tmp_path / "tasks.json")
+        record_many = storage.record_many
+        release = threading.Event()
+        timed_out = []
+
+        def blocked_record_many(ops, tasks):
+            if not release.wait(5):
+                timed_out.append(len(ops))
+            record_many(ops, tasks)
+
+        monkeypatch.setattr(storage, "record_many", blocked_record_many)
+
+        async def scenario():
+            manager = AsyncTaskManager(storage=storage)
+            for i in range(20):
+                await manager.add_task(f"Task {i}")
+            # Every add returned while the writes were held back.
+            saved_before_flush = len(JournalStorage(storage.path).load())
+            release.set()
+            await manager.flush()
+            await manager.close()
+            return saved_before_flush
+
+        assert asyncio.run(scenario()) == 0
+        assert timed_out == []
+        assert len(JournalStorage(storage.path).load()) == 20
+
+    def test_calls_apply_in_order(self, tmp_path):
+        """Test concurrently scheduled calls run in the order they were made."""
+
+        async def scenario():
+            async with AsyncTaskManager(storage=JournalStorage(tmp_path / "tasks.json")) as manager:
+                task_id = await manager.add_task("Task")
+                await asyncio.gather(
+                    *(manager.update_task(task_id, title=f"Title {i}") for i in range(50))
+                )
+                return (await manager.get_task(task_id)).title
+
+        assert asyncio.run(scenario()) == "Title 49"
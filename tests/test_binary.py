@@ -0,0 +1,172 @@
+"""Tests for the binary snapshot format."""
+
+import struct
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from tasklib.binary import BinaryStorage, encode_snapshot, main, pack, unpack
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+from tasklib.storage import JSONStorage
+
+
+@pytest.fixture
+def tasks():
+    """A mix of tasks covering every column."""
+    now = datetime.now()
+    return [
+        Task(title="Late", priority=Priority.HIGH, due_date=now - timedelta(days=1)),
+        Task(title="Soon", priority=Priority.HIGH, due_date=now + timedelta(days=1)),
+        Task(
+            title="Done",
+            priority=Priority.LOW,
+            status=Status.COMPLETED,
+            due_date=now - timedelta(days=2),
+        ),
+        Task(title="Undated été", description="Unicode text"),
+    ]
+
+
+@pytest.fixture
+def storage(tmp_path, tasks):
+    """A snapshot holding the tasks."""
+    storage = BinaryStorage(tmp_path / "tasks.bin")
+    storage.save(tasks)
+    yield storage
+    storage.close()
+
+
+class TestBinaryStorage:
+    """Test cases for BinaryStorage class."""
+
+    def test_round_trip(self, storage, tasks):
+        """Test every field survives a save and load."""
+        assert [t.to_dict() for t in storage.load()] == [t.to_dict() for t in tasks]
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing snapshot reads as empty."""
+        storage = BinaryStorage(tmp_path / "missing.bin")
+        assert storage.load() == []
+        assert storage.read_task("x") is None
+        assert storage.filter_tasks(status=Status.TODO) == []
+
+    def test_empty_collection(self, tmp_path):
+        """Test a snapshot of no tasks."""
+        storage = BinaryStorage(tmp_path / "tasks.bin")
+        storage.save([])
+        assert storage.load() == []
+        assert storage.read_task("x") is None
+
+    def test_not_a_snapshot(self, tmp_path):
+        """Test other files are rejected."""
+        path = tmp_path / "tasks.bin"
+        path.write_text("[]" * 100)
+        with pytest.raises(ValueError):
+            BinaryStorage(path).load()
+
+    def test_read_task(self, storage, tasks):
+        """Test lookups by ID find every task and nothing else."""
+        for task in tasks:
+            assert storage.read_task(task.id).to_dict() == task.to_dict()
+        assert storage.read_task("unknown") is None
+
+    def test_filter_tasks(self, storage, tasks):
+        """Test filters match the in-memory semantics."""
+
+        def titles(**kwargs):
+            return [t.title for t in storage.filter_tasks(**kwargs)]
+
+        assert titles(priority=Priority.HIGH) == ["Late", "Soon"]
+        assert titles(status=Status.TODO, priority=Priority.HIGH) == ["Late", "Soon"]
+        assert titles(overdue_only=True) == ["Late"]
+        assert titles(status=Status.COMPLETED) == ["Done"]
+        assert titles(descending=True, limit=2) == [tasks[3].title, "Done"]
+        assert titles(offset=1, limit=1) == ["Soon"]
+
+    def test_save_remaps(self, storage, tasks):
+        """Test reads see a snapshot written after the file was mapped."""
+        assert storage.read_task(tasks[0].id) is not None
+        storage.save(tasks[1:])
+        assert storage.read_task(tasks[0].id) is None
+        assert len(storage.load()) == 3
+
+    def test_encode_layout(self, tasks):
+        """Test the header and that 8-byte sections are aligned."""
+        data = encode_snapshot(tasks)
+        magic, version, _, count, *sections = struct.unpack_from("<8sIIQQQQQQQ", data)
+        assert (magic, version, count) == (b"TASKBIN\x00", 1, 4)
+        index, offsets, due, _, _, records = sections
+        assert all(offset % 8 == 0 for offset in (index, offsets, due, records))
+
+
+class TestBinaryManager:
+    """Test cases for TaskManager on a binary snapshot."""
+
+    def test_reads_without_loading(self, storage, tasks):
+        """Test a lazy manager answers lookups and filters from the mapping."""
+        manager = TaskManager(storage=storage, lazy=True)
+        assert manager.get_task(tasks[1].id).title == "Soon"
+        assert [t.title for t in manager.filter_tasks(overdue_only=True)] == ["Late"]
+        assert not manager._loaded
+
+    def test_concurrent_lazy_reads(self, storage, tasks):
+        """Test threads reading a shared snapshot leave the storage lock balanced."""
+        manager = TaskManager(storage=storage, lazy=True, thread_safe=True, shared=True)
+        errors = []
+
+        def read():
+            try:
+                for _ in range(200):
+                    assert manager.get_task(tasks[1].id).title == "Soon"
+                    assert len(manager.filter_tasks(priority=Priority.HIGH)) == 2
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert storage._lock_depth == 0
+        manager.add_task("After")
+        assert len(manager.get_tasks()) == 5
+
+    def test_sorted_query_loads(self, storage):
+        """Test queries the snapshot cannot answer load the collection."""
+        manager = TaskManager(storage=storage, lazy=True)
+        result = manager.filter_tasks(priority=Priority.HIGH, sort_by="due_date", descending=True)
+        assert [t.title for t in result] == ["Soon", "Late"]
+        assert manager._loaded
+
+    def test_mutations_persist(self, storage, tasks):
+        """Test mutations load, then rewrite the snapshot."""
+        manager = TaskManager(storage=storage, lazy=True)
+        manager.update_task(tasks[0].id, status=Status.COMPLETED)
+        manager.add_task("New")
+
+        reopened = TaskManager(storage=BinaryStorage(storage.path), lazy=True)
+        assert reopened.get_task(tasks[0].id).status is Status.COMPLETED
+        assert reopened.filter_tasks(overdue_only=True) == []
+        assert len(reopened.get_tasks()) == 5
+
+
+class TestConversion:
+    """Test cases for the JSON converters."""
+
+    def test_pack_and_unpack(self, tmp_path, tasks):
+        """Test converting to binary and back preserves the JSON file."""
+        JSONStorage(tmp_path / "tasks.json").save(tasks)
+        assert pack(tmp_path / "tasks.json", tmp_path / "tasks.bin") == 4
+        assert unpack(tmp_path / "tasks.bin", tmp_path / "copy.json") == 4
+        assert (tmp_path / "copy.json").read_bytes() == (tmp_path / "tasks.json").read_bytes()
+
+    def test_command_line(self, tmp_path, tasks, capsys):
+        """Test the pack command."""
+        JSONStorage(tmp_path / "tasks.json").save(tasks)
+        main(["pack", str(tmp_path / "tasks.json"), str(tmp_path / "tasks.bin")])
+        assert "Converted 4 tasks" in capsys.readouterr().out
+        assert len(BinaryStorage(tmp_path / "tasks.bin").load()) == 4
@@ -0,0 +1,244 @@
+"""Tests for bulk import and export."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from tasklib.bulk import FIELDS, RowError, detect_format, read_tasks, write_tasks
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+from tasklib.storage import JournalStorage
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create an empty task manager."""
+    return TaskManager(storage_path=str(tmp_path / "tasks.json"))
+
+
+def write_lines(path, lines):
+    """Write text lines to a file."""
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+class TestReadTasks:
+    """Test cases for parsing import files."""
+
+    def test_ndjson_defaults(self, tmp_path):
+        """Test records only need a title."""
+        path = write_lines(tmp_path / "in.ndjson", ['{"title": "A"}', "", '{"title": "B"}'])
+        results = list(read_tasks(path))
+
+        assert [line for line, _ in results] == [1, 3]
+        task = results[0][1]
+        assert task.title == "A"
+        assert (task.priority, task.status, task.due_date) == (Priority.MEDIUM, Status.TODO, None)
+        assert task.created_at == task.updated_at
+
+    def test_ndjson_errors(self, tmp_path):
+        """Test invalid records are reported with their line numbers."""
+        path = write_lines(
+            tmp_path / "in.jsonl",
+            [
+                '{"title": "Good", "priority": "high", "due_date": "March 1 2030"}',
+                "{not json",
+                "[1, 2]",
+                '{"description": "untitled"}',
+                '{"title": "Bad", "priority": "urgent"}',
+                '{"title": 5}',
+                '{"title": "Bad date", "due_date": "someday"}',
+            ],
+        )
+        results = list(read_tasks(path))
+
+        good = results[0][1]
+        assert good.priority is Priority.HIGH
+        assert good.due_date == datetime(2030, 3, 1)
+        errors = [result for _, result in results[1:]]
+        assert all(isinstance(error, RowError) for error in errors)
+        assert [error.line for error in errors] == [2, 3, 4, 5, 6, 7]
+        assert "title" in errors[2].message
+        assert "urgent" in errors[3].message
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"title": "ok", "description": 5},
+            {"title": "x", "id": 7},
+            {"title": ["x"]},
+            {"title": "x", "due_date": 20300101},
+            {"title": "x", "created_at": True},
+        ],
+    )
+    def test_non_string_fields(self, tmp_path, record):
+        """Test fields that must be strings reject other JSON types."""
+        path = write_lines(tmp_path / "in.ndjson", [json.dumps(record)])
+        [(line, result)] = list(read_tasks(path))
+        assert isinstance(result, RowError)
+        assert "must be a string" in result.message
+
+    def test_oversized_date(self, tmp_path):
+        """Test a date too large for datetime rejects only its own record."""
+        path = write_lines(
+            tmp_path / "in.ndjson",
+            ['{"title": "Huge", "due_date": "99999999999999999999"}', '{"title": "Fine"}'],
+        )
+        [(_, error), (_, task)] = list(read_tasks(path))
+
+        assert error == RowError(1, "Date out of range: '99999999999999999999'")
+        assert task.title == "Fine"
+
+    def test_csv(self, tmp_path):
+        """Test CSV cells map to fields, with blanks treated as missing."""
+        path = write_lines(
+            tmp_path / "in.csv",
+            [
+                "title,priority,due_date,notes",
+                'Plain,,,"extra, ignored"',
+                '"Multi\nline",low,2030-01-02T03:04:05,',
+                "Short,high",
+            ],
+        )
+        results = list(read_tasks(path))
+
+        assert results[0][1].priority is Priority.MEDIUM
+        assert results[1][1].title == "Multi\nline"
+        assert results[1][1].due_date == datetime(2030, 1, 2, 3, 4, 5)
+        assert results[2] == (5, RowError(5, "expected 4 fields, found 2"))
+
+    def test_process_pool(self, tmp_path):
+        """Test parallel parsing keeps records in file order."""
+        lines = [json.dumps({"title": str(i)}) for i in range(50)]
+        lines[17] = "{broken"
+        path = write_lines(tmp_path / "in.ndjson", lines)
+        results = list(read_tasks(path, processes=2, chunk_size=7))
+
+        assert [line for line, _ in results] == list(range(1, 51))
+        assert isinstance(results[17][1], RowError)
+        assert results[49][1].title == "49"
+
+    def test_detect_format(self):
+        """Test formats are inferred from suffixes and validated."""
+        assert detect_format("tasks.CSV") == "csv"
+        assert detect_format("tasks.txt", "ndjson") == "ndjson"
+        with pytest.raises(ValueError):
+            detect_format("tasks.txt")
+        with pytest.raises(ValueError):
+            detect_format("tasks.csv", "xml")
+
+
+class TestWriteTasks:
+    """Test cases for exporting tasks."""
+
+    @pytest.mark.parametrize("name", ["out.ndjson", "out.csv"])
+    def test_round_trip(self, tmp_path, name):
+        """Test exported files import back to identical tasks."""
+        tasks = [
+            Task(title="A, with comma", description="two\nlines", due_date=datetime(2030, 1, 1)),
+            Task(title="B", priority=Priority.CRITICAL, status=Status.IN_PROGRESS),
+        ]
+        assert write_tasks(tmp_path / name, tasks) == 2
+        imported = [task for _, task in read_tasks(tmp_path / name)]
+        assert [t.to_dict() for t in imported] == [t.to_dict() for t in tasks]
+
+    def test_csv_header(self, tmp_path):
+        """Test CSV exports start with the task fields."""
+        write_tasks(tmp_path / "out.csv", [])
+        assert (tmp_path / "out.csv").read_text().strip() == ",".join(FIELDS)
+
+    def test_failed_export_keeps_old_file(self, tmp_path):
+        """Test an interrupted export leaves the previous file in place."""
+        path = write_lines(tmp_path / "out.ndjson", ["old"])
+
+        def tasks():
+            yield Task(title="A")
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(RuntimeError):
+            write_tasks(path, tasks())
+        assert path.read_text() == "old\n"
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestManagerImport:
+    """Test cases for TaskManager.import_tasks and export_tasks."""
+
+    def test_import_commits_once(self, tmp_path):
+        """Test valid rows are added with a single save and errors are reported."""
+        path = write_lines(tmp_path / "in.ndjson", ['{"title": "A"}', "oops", '{"title": "B"}'])
+        storage = JournalStorage(tmp_path / "tasks.json")
+        manager = TaskManager(storage=storage)
+        writes = []
+        original = storage.record_many
+        storage.record_many = lambda ops, tasks: writes.append(len(ops)) or original(ops, tasks)
+
+        report = manager.import_tasks(path)
+
+        assert report.imported == 2
+        assert [error.line for error in report.errors] == [2]
+        assert writes == [2]
+        reloaded = TaskManager(storage=JournalStorage(tmp_path / "tasks.json"))
+        assert [t.title for t in reloaded.get_tasks()] == ["A", "B"]
+
+    def test_duplicate_ids(self, manager, tmp_path):
+        """Test IDs already present, or repeated in the file, are rejected."""
+        existing = manager.add_task("Existing")
+        path = write_lines(
+            tmp_path / "in.ndjson",
+            [
+                json.dumps({"id": existing, "title": "Clash"}),
+                json.dumps({"id": "x", "title": "First"}),
+                json.dumps({"id": "x", "title": "Second"}),
+            ],
+        )
+        report = manager.import_tasks(path)
+
+        assert report.imported == 1
+        assert [error.line for error in report.errors] == [1, 3]
+        assert manager.get_task("x").title == "First"
+        assert manager.get_task(existing).title == "Existing"
+
+    def test_non_string_fields_are_not_saved(self, manager, tmp_path):
+        """Test rows with non-string fields are rejected, so searches keep working."""
+        path = write_lines(
+            tmp_path / "in.ndjson",
+            ['{"title": "ok", "description": 5}', '{"title": "x", "id": 7}', '{"title": "fine"}'],
+        )
+        report = manager.import_tasks(path)
+
+        assert report.imported == 1
+        assert [error.line for error in report.errors] == [1, 2]
+        assert [t.title for t in manager.search_tasks("fine")] == ["fine"]
+
+    def test_strict(self, manager, tmp_path):
+        """Test a strict import adds nothing when any row is rejected."""
+        path = write_lines(tmp_path / "in.ndjson", ['{"title": "A"}', "oops"])
+        report = manager.import_tasks(path, strict=True)
+        assert report.imported == 0
+        assert len(report.errors) == 1
+        assert manager.get_tasks() == []
+
+    def test_import_with_processes(self, manager, tmp_path):
+        """Test a pooled import adds every task in order."""
+        path = write_lines(
+            tmp_path / "in.ndjson", [json.dumps({"title": str(i)}) for i in range(30)]
+        )
+        report = manager.import_tasks(path, processes=2, chunk_size=4)
+        assert report.imported == 30
+        assert [t.title for t in manager.get_tasks()] == [str(i) for i in range(30)]
+
+    def test_export_filtered(self, manager, tmp_path):
+        """Test exporting a filter's results."""
+        manager.add_task("A", priority=Priority.HIGH)
+        manager.add_task("B")
+        count = manager.export_tasks(
+            tmp_path / "out.csv", tasks=manager.iter_filter_tasks(priority=Priority.HIGH)
+        )
+        assert count == 1
+        assert manager.export_tasks(tmp_path / "all.ndjson") == 2
+
+        copy = TaskManager(storage_path=str(tmp_path / "copy.json"))
+        assert copy.import_tasks(tmp_path / "all.ndjson").imported == 2
+        assert [t.to_dict() for t in copy.get_tasks()] == [t.to_dict() for t in manager.get_tasks()]
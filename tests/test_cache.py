@@ -0,0 +1,182 @@
+"""Tests for the query cache."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from tasklib.cache import QueryCache
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create a task manager with a query cache and a few tasks."""
+    manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), cache_size=4)
+    manager.add_tasks(
+        [
+            {"title": "Write report", "priority": Priority.HIGH},
+            {"title": "Read report", "priority": Priority.LOW},
+            {"title": "Call Bob", "priority": Priority.HIGH},
+        ]
+    )
+    return manager
+
+
+class TestQueryCache:
+    """Test cases for QueryCache class."""
+
+    def test_hit_and_miss(self):
+        """Test stored results are returned as new lists."""
+        cache = QueryCache()
+        task = Task(title="A")
+        assert cache.get("key", 1) is None
+        cache.put("key", 1, [task])
+
+        results = cache.get("key", 1)
+        assert results == [task]
+        results.clear()
+        assert cache.get("key", 1) == [task]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_generation_invalidates(self):
+        """Test a new generation drops every entry."""
+        cache = QueryCache()
+        cache.put("a", 1, [])
+        cache.put("b", 1, [])
+        assert cache.get("a", 2) is None
+        assert cache.stats().invalidations == 2
+        assert cache.stats().size == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = QueryCache(max_size=2)
+        cache.put("a", 1, [])
+        cache.put("b", 1, [])
+        cache.get("a", 1)
+        cache.put("c", 1, [])
+
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == []
+        assert cache.stats().evictions == 1
+
+    def test_ttl(self, monkeypatch):
+        """Test entries expire after the TTL."""
+        clock = [100.0]
+        monkeypatch.setattr("tasklib.cache.time.monotonic", lambda: clock[0])
+        cache = QueryCache(ttl=5)
+        cache.put("a", 1, [])
+        clock[0] = 105.0
+        assert cache.get("a", 1) == []
+        clock[0] = 105.5
+        assert cache.get("a", 1) is None
+        assert cache.stats().expirations == 1
+
+    def test_valid_until(self):
+        """Test entries expire after their validity moment."""
+        cache = QueryCache()
+        cache.put("past", 1, [], valid_until=datetime.now() - timedelta(seconds=1))
+        cache.put("future", 1, [], valid_until=datetime.now() + timedelta(hours=1))
+        assert cache.get("past", 1) is None
+        assert cache.get("future", 1) == []
+
+    def test_invalid_bounds(self):
+        """Test a non-positive size or TTL raises ValueError."""
+        with pytest.raises(ValueError):
+            QueryCache(max_size=0)
+        with pytest.raises(ValueError):
+            QueryCache(ttl=0)
+
+
+class TestManagerCache:
+    """Test cases for TaskManager query caching."""
+
+    def test_repeated_queries_hit(self, manager):
+        """Test repeated filters and searches are answered from the cache."""
+        first = manager.filter_tasks(priority=Priority.HIGH)
+        assert manager.filter_tasks(priority=Priority.HIGH) == first
+        manager.search_tasks("report")
+        assert [t.title for t in manager.search_tasks("REPORT")] == [
+            "Write report",
+            "Read report",
+        ]
+        stats = manager.cache_stats()
+        assert (stats.hits, stats.misses) == (2, 2)
+
+    def test_arguments_are_part_of_the_key(self, manager):
+        """Test different pages and orders are cached separately."""
+        assert len(manager.filter_tasks(priority=Priority.HIGH, limit=1)) == 1
+        assert len(manager.filter_tasks(priority=Priority.HIGH)) == 2
+        titles = [t.title for t in manager.filter_tasks(priority=Priority.HIGH, descending=True)]
+        assert titles == ["Call Bob", "Write report"]
+        assert manager.cache_stats().hits == 0
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda m, t: m.add_task("New report", priority=Priority.HIGH),
+            lambda m, t: m.update_task(t.id, priority=Priority.LOW),
+            lambda m, t: m.delete_task(t.id),
+        ],
+    )
+    def test_mutations_invalidate(self, manager, mutate):
+        """Test every kind of mutation invalidates cached results."""
+        before = manager.filter_tasks(priority=Priority.HIGH)
+        manager.search_tasks("report")
+        mutate(manager, before[0])
+
+        after = manager.filter_tasks(priority=Priority.HIGH)
+        assert [t.id for t in after] != [t.id for t in before]
+        assert after == TaskManager(storage_path=str(manager.storage_path)).filter_tasks(
+            priority=Priority.HIGH
+        )
+        assert manager.cache_stats().hits == 0
+
+    def test_rollback_invalidates(self, manager):
+        """Test results cached inside a rolled-back batch are not reused."""
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_task("Temporary", priority=Priority.HIGH)
+                assert len(manager.filter_tasks(priority=Priority.HIGH)) == 3
+                raise RuntimeError("abort")
+        assert len(manager.filter_tasks(priority=Priority.HIGH)) == 2
+
+    def test_overdue_results_expire_when_a_task_falls_due(self, manager):
+        """Test an overdue query is recomputed once another task becomes overdue."""
+        task = manager.filter_tasks(priority=Priority.LOW)[0]
+        manager.update_task(task.id, due_date=datetime.now() + timedelta(milliseconds=50))
+        assert manager.filter_tasks(overdue_only=True) == []
+        assert manager.filter_tasks(overdue_only=True) == []
+        assert manager.cache_stats().hits == 1
+
+        moment = task.due_date + timedelta(milliseconds=1)
+        while datetime.now() <= moment:
+            pass
+        assert manager.filter_tasks(overdue_only=True) == [task]
+        assert manager.cache_stats().expirations == 1
+
+    def test_completed_tasks_do_not_limit_overdue_results(self, manager):
+        """Test only open tasks bound how long overdue results stay valid."""
+        task = manager.filter_tasks(priority=Priority.LOW)[0]
+        manager.update_task(
+            task.id,
+            status=Status.COMPLETED,
+            due_date=datetime.now() + timedelta(milliseconds=1),
+        )
+        manager.filter_tasks(overdue_only=True)
+        moment = task.due_date + timedelta(milliseconds=1)
+        while datetime.now() <= moment:
+            pass
+        assert manager.filter_tasks(overdue_only=True) == []
+        assert manager.cache_stats().hits == 1
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test a manager without a cache reports empty stats."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        manager.add_task("A")
+        manager.filter_tasks()
+        manager.filter_tasks()
+        assert manager.cache_stats().hits == 0
+        assert manager.cache_stats().misses == 0
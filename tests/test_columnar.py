@@ -0,0 +1,214 @@
+"""Tests for the NumPy column store."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+
+np = pytest.importorskip("numpy")
+
+from tasklib.columnar import NO_DATE, PRIORITIES, STATUSES, ColumnarIndex, epoch_us  # noqa: E402
+
+
+def make_task(title, priority=Priority.MEDIUM, status=Status.TODO, due_date=None):
+    """Build a task with fixed timestamps."""
+    created = datetime(2026, 1, 1)
+    return Task(
+        title=title,
+        priority=priority,
+        status=status,
+        due_date=due_date,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+class TestColumnarIndex:
+    """Test cases for ColumnarIndex class."""
+
+    def test_add_and_mask(self):
+        """Test predicates select the matching rows in insertion order."""
+        index = ColumnarIndex(capacity=2)
+        tasks = [
+            make_task("A", Priority.HIGH),
+            make_task("B", Priority.LOW),
+            make_task("C", Priority.HIGH, Status.COMPLETED),
+        ]
+        for task in tasks:
+            index.add(task)
+
+        assert len(index) == 3
+        assert index.ids(index.mask(priority=Priority.HIGH)) == [tasks[0].id, tasks[2].id]
+        assert index.ids(index.mask(priority=Priority.HIGH, status=Status.TODO)) == [tasks[0].id]
+
+    def test_overdue_mask(self):
+        """Test overdue excludes completed tasks and tasks without a due date."""
+        now = datetime(2026, 6, 1)
+        past = now - timedelta(days=1)
+        tasks = [
+            make_task("Late", due_date=past),
+            make_task("Done", status=Status.COMPLETED, due_date=past),
+            make_task("Future", due_date=now + timedelta(days=1)),
+            make_task("Undated"),
+        ]
+        index = ColumnarIndex()
+        for task in tasks:
+            index.add(task)
+        assert index.ids(index.mask(overdue_only=True, now=now)) == [tasks[0].id]
+
+    def test_update_keeps_row_order(self):
+        """Test removing and re-adding a task revives its row in place."""
+        index = ColumnarIndex()
+        first, second = make_task("A"), make_task("B")
+        index.add(first)
+        index.add(second)
+        index.remove(first)
+        first.priority = Priority.CRITICAL
+        index.add(first)
+
+        assert index.ids(index.mask()) == [first.id, second.id]
+        assert index.to_table()["priority"][0] == PRIORITIES.index(Priority.CRITICAL)
+
+    def test_delete_then_add_appends(self):
+        """Test a deleted task added back gets a new row at the end."""
+        index = ColumnarIndex()
+        first, second = make_task("A"), make_task("B")
+        index.add(first)
+        index.add(second)
+        index.delete(first)
+        index.add(first)
+
+        assert index.ids(index.mask()) == [second.id, first.id]
+
+    def test_dead_rows_are_compacted(self):
+        """Test removed rows are dropped when the columns fill up."""
+        index = ColumnarIndex(capacity=4)
+        tasks = [make_task(str(i)) for i in range(4)]
+        for task in tasks:
+            index.add(task)
+        for task in tasks[:3]:
+            index.remove(task)
+        extra = make_task("extra")
+        index.add(extra)
+
+        assert index.ids(index.mask()) == [tasks[3].id, extra.id]
+        assert len(index.to_table()["id"]) == 2
+
+    def test_count_by(self):
+        """Test group-by counts include empty groups."""
+        index = ColumnarIndex()
+        for priority in (Priority.LOW, Priority.LOW, Priority.HIGH):
+            index.add(make_task("T", priority))
+
+        counts = index.count_by("priority")
+        assert counts[Priority.LOW] == 2
+        assert counts[Priority.HIGH] == 1
+        assert counts[Priority.CRITICAL] == 0
+        assert sum(index.count_by("status").values()) == 3
+
+    def test_count_by_invalid_field(self):
+        """Test grouping by an unsupported column raises ValueError."""
+        with pytest.raises(ValueError):
+            ColumnarIndex().count_by("title")
+
+    def test_to_table(self):
+        """Test the exported columns encode the task attributes."""
+        due = datetime(2026, 3, 1, 12, 30)
+        task = make_task("A", Priority.HIGH, Status.IN_PROGRESS, due)
+        undated = make_task("B")
+        index = ColumnarIndex()
+        index.add(task)
+        index.add(undated)
+
+        table = index.to_table()
+        assert table["id"].tolist() == [task.id, undated.id]
+        assert PRIORITIES[table["priority"][0]] is Priority.HIGH
+        assert STATUSES[table["status"][0]] is Status.IN_PROGRESS
+        assert table["due_date"][0] == epoch_us(due)
+        assert table["due_date"][1] == NO_DATE
+        assert table["created_at"].dtype == np.int64
+        assert not table["status"].flags.writeable
+
+
+class TestColumnarManager:
+    """Test cases for TaskManager with a column store."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a columnar manager with a mix of tasks."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), columnar=True)
+        past = datetime.now() - timedelta(days=1)
+        manager.add_tasks(
+            [
+                {"title": "A", "priority": Priority.HIGH, "due_date": past},
+                {"title": "B", "priority": Priority.HIGH},
+                {"title": "C", "priority": Priority.LOW, "due_date": past},
+                {"title": "D", "priority": Priority.HIGH, "due_date": past},
+            ]
+        )
+        return manager
+
+    def test_filter_matches_index_path(self, manager, tmp_path):
+        """Test multi-criteria filters return what the plain manager returns."""
+        plain = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        task_d = next(t for t in manager.get_tasks() if t.title == "D")
+        manager.update_task(task_d.id, status=Status.IN_PROGRESS)
+        plain.load()
+
+        for kwargs in (
+            {"priority": Priority.HIGH, "overdue_only": True},
+            {"priority": Priority.HIGH, "status": Status.TODO},
+            {"priority": Priority.HIGH, "overdue_only": True, "sort_by": "due_date"},
+            {"status": Status.TODO, "overdue_only": True, "descending": True, "limit": 1},
+        ):
+            expected = [t.id for t in plain.filter_tasks(**kwargs)]
+            assert [t.id for t in manager.filter_tasks(**kwargs)] == expected
+
+    def test_count_by(self, manager):
+        """Test group-by counts respect the predicates."""
+        assert manager.count_by("priority", overdue_only=True)[Priority.HIGH] == 2
+        assert manager.count_by("status")[Status.TODO] == 4
+
+    def test_columns_follow_mutations(self, manager):
+        """Test deletes and updates are reflected in the columns."""
+        task_a = manager.filter_tasks(priority=Priority.HIGH)[0]
+        manager.update_task(task_a.id, status=Status.COMPLETED)
+        task_b = manager.filter_tasks(priority=Priority.HIGH)[1]
+        manager.delete_task(task_b.id)
+
+        table = manager.to_table()
+        assert table["id"].tolist() == [t.id for t in manager.get_tasks()]
+        assert STATUSES[table["status"][0]] is Status.COMPLETED
+
+    def test_rollback_restores_row_order(self, manager):
+        """Test a rolled-back delete puts the task back in its original row."""
+        ids = [t.id for t in manager.get_tasks()]
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.delete_task(ids[0])
+                raise RuntimeError("abort")
+        assert manager.to_table()["id"].tolist() == ids
+
+    def test_readded_task_keeps_manager_order(self, manager, tmp_path):
+        """Test a task deleted and put back is ordered last, as in get_tasks."""
+        task = manager.get_tasks()[0]
+        manager.delete_task(task.id)
+        manager.put_task(task)
+        expected = [t.id for t in manager.get_tasks() if t.priority is Priority.HIGH]
+
+        result = manager.filter_tasks(status=Status.TODO, priority=Priority.HIGH)
+        assert [t.id for t in result] == expected
+        assert expected[-1] == task.id
+        limited = manager.filter_tasks(status=Status.TODO, priority=Priority.HIGH, limit=1)
+        assert [t.id for t in limited] == expected[:1]
+        assert manager.to_table()["id"].tolist() == [t.id for t in manager.get_tasks()]
+
+    def test_requires_columnar(self, tmp_path):
+        """Test column queries on a plain manager raise ValueError."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        with pytest.raises(ValueError):
+            manager.to_table()
+        with pytest.raises(ValueError):
+            manager.count_by("status")
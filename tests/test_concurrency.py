@@ -0,0 +1,193 @@
+"""Tests for locking and background persistence."""
+
+import threading
+import time
+
+import pytest
+
+from tasklib.concurrency import BackgroundSaver, ReadWriteLock
+from tasklib.manager import TaskManager
+from tasklib.models import Status
+from tasklib.storage import JSONStorage, JournalStorage
+
+
+class TestReadWriteLock:
+    """Test cases for ReadWriteLock class."""
+
+    def test_readers_share_the_lock(self):
+        """Test several threads can hold the read lock at once."""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
+
+    def test_writer_excludes_readers(self):
+        """Test a reader waits until the writer releases the lock."""
+        lock = ReadWriteLock()
+        events = []
+
+        def reader():
+            with lock.read():
+                events.append("read")
+
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            time.sleep(0.05)
+            events.append("write")
+        thread.join()
+
+        assert events == ["write", "read"]
+
+    def test_reentrant(self):
+        """Test nested reads, nested writes and reads under a write."""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+
+    def test_upgrade_raises(self):
+        """Test taking the write lock while reading is refused."""
+        lock = ReadWriteLock()
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                with lock.write():
+                    pass
+
+
+class TestBackgroundSaver:
+    """Test cases for BackgroundSaver class."""
+
+    def test_requests_coalesce(self):
+        """Test a burst of requests is served by few flushes."""
+        calls = []
+        saver = BackgroundSaver(lambda: calls.append(1), delay=0.05)
+        for _ in range(100):
+            saver.schedule()
+        saver.wait()
+        saver.close()
+
+        assert 1 <= len(calls) <= 2
+
+    def test_error_is_raised_by_wait(self):
+        """Test a failed flush is reported to the caller of wait."""
+
+        def fail():
+            raise OSError("disk full")
+
+        saver = BackgroundSaver(fail, delay=0)
+        saver.schedule()
+        with pytest.raises(OSError):
+            saver.wait()
+        saver.close()
+
+
+class TestThreadSafeManager:
+    """Test cases for TaskManager shared between threads."""
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test tasks added from many threads are all kept and saved."""
+        storage = JournalStorage(tmp_path / "tasks.json")
+        manager = TaskManager(storage=storage, thread_safe=True)
+
+        def writer(n):
+            for i in range(50):
+                task_id = manager.add_task(title=f"Task {n}-{i}")
+                manager.update_task(task_id, status=Status.COMPLETED)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(manager.filter_tasks(status=Status.COMPLETED)) == 400
+        assert len(JournalStorage(storage.path).load()) == 400
+
+    def test_readers_see_consistent_state(self, tmp_path):
+        """Test filters run while another thread mutates the manager."""
+        manager = TaskManager(storage=JournalStorage(tmp_path / "tasks.json"), thread_safe=True)
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    manager.filter_tasks(status=Status.TODO)
+                    manager.search_tasks("Task")
+                    list(manager.iter_tasks())
+                except Exception as exc:  # pragma: no cover - reported below
+                    errors.append(exc)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        with manager.batch():
+            for i in range(200):
+                manager.add_task(title=f"Task {i}")
+        for i in range(200):
+            manager.add_task(title=f"Task {i}")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    def test_background_save(self, tmp_path):
+        """Test background saving persists every mutation after flush."""
+        storage = JournalStorage(tmp_path / "tasks.json")
+        with TaskManager(storage=storage, background_save=True) as manager:
+            ids = [manager.add_task(title=f"Task {i}") for i in range(100)]
+            manager.delete_task(ids[0])
+            manager.flush()
+
+            reloaded = TaskManager(storage=JournalStorage(storage.path))
+            assert len(reloaded.get_tasks()) == 99
+
+    def test_writers_do_not_wait_for_background_writes(self, tmp_path):
+        """Test mutations proceed while the background saver is writing."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        writing, release = threading.Event(), threading.Event()
+        record_many = storage.record_many
+
+        def blocking_record_many(ops, tasks):
+            writing.set()
+            release.wait(5)
+            record_many(ops, tasks)
+
+        storage.record_many = blocking_record_many
+        with TaskManager(storage=storage, background_save=True) as manager:
+            first = manager.add_task(title="First")
+            assert writing.wait(5)
+            writer = threading.Thread(
+                target=manager.update_task, args=(first,), kwargs={"title": "Renamed"}
+            )
+            writer.start()
+            writer.join(5)
+            blocked = writer.is_alive()
+            release.set()
+            manager.flush()
+
+        assert not blocked
+        assert [t.title for t in JSONStorage(storage.path).load()] == ["Renamed"]
+
+    def test_close_writes_pending_changes(self, tmp_path):
+        """Test closing the manager waits for the background saver."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), background_save=True)
+        manager.add_task(title="Task")
+        manager.close()
+
+        assert [t.title for t in JSONStorage(tmp_path / "tasks.json").load()] == ["Task"]
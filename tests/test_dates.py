@@ -0,0 +1,58 @@
+"""Tests for date parsing helpers."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from tasklib import dates
+from tasklib.dates import parse_date
+
+
+class TestParseDate:
+    """Test cases for parse_date function."""
+
+    def test_iso_date(self):
+        """Test a plain ISO date parses to midnight."""
+        assert parse_date("2026-12-31") == datetime(2026, 12, 31)
+
+    def test_iso_datetime_with_offset(self):
+        """Test an ISO timestamp keeps its offset."""
+        parsed = parse_date("2026-12-31T10:30:00+02:00")
+
+        assert parsed == datetime(2026, 12, 31, 8, 30, tzinfo=timezone.utc)
+        assert parsed.utcoffset() == timedelta(hours=2)
+
+    def test_free_form(self):
+        """Test non-ISO strings fall back to dateutil."""
+        assert parse_date("Dec 31 2026 5pm") == datetime(2026, 12, 31, 17, 0)
+
+    def test_datetime_passthrough(self):
+        """Test datetime values are returned unchanged."""
+        value = datetime(2026, 1, 1, 9, 0)
+
+        assert parse_date(value) is value
+
+    def test_invalid(self):
+        """Test unparseable strings raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_date("not a date")
+
+    def test_out_of_range(self):
+        """Test oversized numeric dates raise ValueError, not OverflowError."""
+        with pytest.raises(ValueError, match="out of range"):
+            parse_date("99999999999999999999")
+
+    def test_partial_dates_follow_today(self, monkeypatch):
+        """Test cached results for strings without a date are not reused the next day."""
+
+        class FakeDate(date):
+            current = date(2030, 1, 1)
+
+            @classmethod
+            def today(cls):
+                return cls.current
+
+        monkeypatch.setattr(dates, "date", FakeDate)
+        assert parse_date("17:00") == datetime(2030, 1, 1, 17, 0)
+        FakeDate.current = date(2030, 1, 2)
+        assert parse_date("17:00") == datetime(2030, 1, 2, 17, 0)
@@ -0,0 +1,149 @@
+"""Tests for the change feed."""
+
+import pytest
+
+from tasklib.feed import ChangeFeed
+from tasklib.manager import TaskManager
+from tasklib.models import Status, Task
+from tasklib.storage import JournalStorage
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create a task manager with a small feed."""
+    return TaskManager(storage_path=str(tmp_path / "tasks.json"), feed_size=5)
+
+
+class TestChangeFeed:
+    """Test cases for ChangeFeed class."""
+
+    def test_sequence_numbers(self):
+        """Test events are numbered consecutively and typed by op."""
+        feed = ChangeFeed()
+        task = Task(title="A")
+        feed.publish([("add", task), ("update", task), ("delete", task)])
+
+        events = feed.changes_since(0)
+        assert [(e.seq, e.type) for e in events] == [
+            (1, "created"),
+            (2, "updated"),
+            (3, "deleted"),
+        ]
+        assert feed.seq == 3
+        assert feed.changes_since(2) == events[2:]
+        assert feed.changes_since(3) == []
+
+    def test_events_hold_copies(self):
+        """Test later changes to a task do not alter published events."""
+        feed = ChangeFeed()
+        task = Task(title="Before")
+        feed.publish([("add", task)])
+        task.title = "After"
+        assert feed.changes_since(0)[0].task.title == "Before"
+
+    def test_overflow(self):
+        """Test replay fails once the requested events were evicted."""
+        feed = ChangeFeed(capacity=2)
+        feed.publish([("add", Task(title=str(i))) for i in range(3)])
+
+        assert feed.changes_since(0) is None
+        assert [e.seq for e in feed.changes_since(1)] == [2, 3]
+
+    def test_reset(self):
+        """Test a reset is delivered and ends replay across it."""
+        feed = ChangeFeed()
+        received = []
+        feed.subscribe(received.append)
+        feed.publish([("add", Task(title="A"))])
+        feed.reset()
+
+        assert [e.type for e in received] == ["created", "reset"]
+        assert feed.changes_since(0) is None
+        assert feed.changes_since(2) == []
+
+    def test_no_history(self):
+        """Test a feed without history still numbers and delivers events."""
+        feed = ChangeFeed(capacity=0)
+        feed.publish([("add", Task(title="A"))])
+        received = []
+        feed.subscribe(received.append)
+        feed.publish([("add", Task(title="B"))])
+
+        assert [e.seq for e in received] == [2]
+        assert feed.changes_since(0) is None
+        assert feed.changes_since(2) == []
+
+
+class TestManagerFeed:
+    """Test cases for the TaskManager change feed."""
+
+    def test_mutations_are_published(self, manager):
+        """Test add, update and delete produce events in order."""
+        received = []
+        manager.subscribe(received.append)
+        task_id = manager.add_task("A")
+        manager.update_task(task_id, status=Status.COMPLETED)
+        manager.delete_task(task_id)
+
+        assert [(e.type, e.task_id) for e in received] == [
+            ("created", task_id),
+            ("updated", task_id),
+            ("deleted", task_id),
+        ]
+        assert received[1].task.status is Status.COMPLETED
+        assert manager.changes_since(0) == received
+        assert manager.last_seq == 3
+
+    def test_unsubscribe(self, manager):
+        """Test a cancelled subscription receives nothing more."""
+        received = []
+        unsubscribe = manager.subscribe(received.append)
+        manager.add_task("A")
+        unsubscribe()
+        manager.add_task("B")
+        assert len(received) == 1
+
+    def test_batch_publishes_on_commit(self, manager):
+        """Test a batch publishes once it commits and a rollback publishes nothing."""
+        received = []
+        manager.subscribe(received.append)
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_task("Discarded")
+                raise RuntimeError("abort")
+        assert received == []
+
+        with manager.batch():
+            manager.add_task("A")
+            assert received == []
+            manager.add_task("B")
+        assert [e.task.title for e in received] == ["A", "B"]
+
+    def test_consumer_falls_behind(self, manager):
+        """Test replay past the feed size asks the consumer to rescan."""
+        seq = manager.last_seq
+        manager.add_tasks([{"title": str(i)} for i in range(6)])
+        assert manager.changes_since(seq) is None
+        assert len(manager.changes_since(manager.last_seq - 5)) == 5
+
+    def test_reload_resets(self, manager):
+        """Test a full reload publishes a reset event."""
+        manager.add_task("A")
+        manager.load()
+        assert manager.changes_since(0) is None
+        assert manager.changes_since(manager.last_seq) == []
+
+    def test_refresh_publishes_external_changes(self, tmp_path):
+        """Test changes picked up from the journal are published."""
+        path = tmp_path / "tasks.json"
+        writer = TaskManager(storage=JournalStorage(path))
+        reader = TaskManager(storage=JournalStorage(path))
+        task_id = writer.add_task("A")
+        reader.refresh()
+        received = []
+        reader.subscribe(received.append)
+
+        writer.update_task(task_id, title="B")
+        writer.delete_task(task_id)
+        assert reader.refresh()
+        assert [(e.type, e.task.title) for e in received] == [("updated", "B"), ("deleted", "B")]
@@ -0,0 +1,149 @@
+"""Tests for secondary indexes."""
+
+from datetime import datetime, timedelta, timezone
+
+from tasklib.indexes import AttributeIndex, DueDateIndex, OpenDueDateIndex, TextIndex
+from tasklib.models import Status, Task
+
+
+class TestAttributeIndex:
+    """Test cases for AttributeIndex class."""
+
+    def test_add_and_remove(self):
+        """Test tasks move between buckets."""
+        index = AttributeIndex("status")
+        task = Task(title="Task")
+        index.add(task)
+        assert index.get(Status.TODO) == {task.id: task}
+
+        index.remove(task)
+        task.status = Status.COMPLETED
+        index.add(task)
+        assert index.get(Status.TODO) == {}
+        assert index.get(Status.COMPLETED) == {task.id: task}
+
+    def test_missing_value(self):
+        """Test looking up a value with no tasks."""
+        assert AttributeIndex("status").get(Status.CANCELLED) == {}
+
+
+class TestDueDateIndex:
+    """Test cases for DueDateIndex class."""
+
+    def test_due_before_is_sorted_and_exclusive(self):
+        """Test range lookup returns tasks strictly before the bound."""
+        now = datetime.now()
+        index = DueDateIndex()
+        late = Task(title="Late", due_date=now - timedelta(days=1))
+        later = Task(title="Later", due_date=now - timedelta(days=2))
+        exact = Task(title="Exact", due_date=now)
+        for task in (late, later, exact, Task(title="Undated")):
+            index.add(task)
+
+        assert list(index.due_before(now).values()) == [later, late]
+
+    def test_remove(self):
+        """Test removed tasks are no longer returned."""
+        now = datetime.now()
+        index = DueDateIndex()
+        task = Task(title="Task", due_date=now - timedelta(days=1))
+        index.add(task)
+        index.remove(task)
+
+        assert index.due_before(now) == {}
+
+    def test_mixed_timezones(self):
+        """Test aware and naive due dates can share the index."""
+        index = DueDateIndex()
+        aware = Task(title="Aware", due_date=datetime.now(timezone.utc) - timedelta(hours=1))
+        naive = Task(title="Naive", due_date=datetime.now() - timedelta(hours=2))
+        index.add(aware)
+        index.add(naive)
+
+        assert list(index.due_before(datetime.now())) == [naive.id, aware.id]
+
+    def test_iter_groups(self):
+        """Test tasks are grouped by due date in either direction."""
+        start = datetime(2026, 1, 1)
+        first = Task(title="First", due_date=start)
+        second = Task(title="Second", due_date=start + timedelta(days=1))
+        tied = Task(title="Tied", due_date=start + timedelta(days=1))
+        index = DueDateIndex()
+        for task in (second, first, tied, Task(title="Undated")):
+            index.add(task)
+
+        groups = list(index.iter_groups())
+        assert [len(group) for group in groups] == [1, 2]
+        assert groups[0] == [first] and set(t.id for t in groups[1]) == {second.id, tied.id}
+        assert [len(group) for group in index.iter_groups(descending=True)] == [2, 1]
+
+
+class TestOpenDueDateIndex:
+    """Test cases for OpenDueDateIndex class."""
+
+    def test_counts_only_open_tasks(self):
+        """Test completed and undated tasks are not counted."""
+        now = datetime.now()
+        index = OpenDueDateIndex()
+        done = Task(title="Done", due_date=now - timedelta(days=1), status=Status.COMPLETED)
+        late = Task(title="Late", due_date=now - timedelta(days=1))
+        future = Task(title="Future", due_date=now + timedelta(days=1))
+        for task in (done, late, future, Task(title="Undated")):
+            index.add(task)
+
+        assert len(index) == 2
+        assert index.count_before(now) == 1
+        assert index.first_due(now) is future
+        assert index.due_between(now - timedelta(days=2), now) == [late]
+
+        index.remove(late)
+        assert index.count_before(now) == 0
+
+    def test_add_many_matches_add(self):
+        """Test a bulk build holds the same entries as adding one at a time."""
+        now = datetime.now()
+        tasks = [
+            Task(title=str(i), due_date=now + timedelta(hours=(i * 7) % 5 - 2)) for i in range(10)
+        ]
+        tasks[3].status = Status.COMPLETED
+        tasks.append(Task(title="Undated"))
+        one_by_one, bulk = OpenDueDateIndex(), OpenDueDateIndex()
+        for task in tasks:
+            one_by_one.add(task)
+        bulk.add_many(tasks)
+
+        assert len(bulk) == 9
+        assert list(bulk.iter_groups()) == list(one_by_one.iter_groups())
+
+
+class TestTextIndex:
+    """Test cases for TextIndex class."""
+
+    def test_substring_semantics(self):
+        """Test matches inside words, across word boundaries and by case."""
+        index = TextIndex()
+        task = Task(title="Deploy Service", description="Roll out v2")
+        index.add(task)
+
+        assert index.search("PLOY SER") == {task.id: 2}
+        assert index.search("out v") == {task.id: 1}
+        assert index.search("ploy x") == {}
+
+    def test_short_query_scans(self):
+        """Test queries shorter than the n-gram length still match."""
+        index = TextIndex(n=3)
+        task = Task(title="ab")
+        index.add(task)
+
+        assert index.search("b") == {task.id: 2}
+
+    def test_remove_uses_indexed_text(self):
+        """Test removal works after the task text has changed."""
+        index = TextIndex()
+        task = Task(title="Original")
+        index.add(task)
+        task.title = "Changed"
+        index.remove(task)
+
+        assert index.search("orig") == {}
+        assert index.search("chan") == {}
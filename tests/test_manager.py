@@ -2,6 +2,7 @@
 
 import pytest
 import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from tasklib.manager import TaskManager
@@ -176,3 +177,311 @@ class TestTaskManager:
         assert task is not None
         assert task.title == "Persistent Task"
         assert task.priority == Priority.HIGH
+
+    def test_delete_preserves_order(self, manager):
+        """Test deleting a task keeps the order of the remaining tasks."""
+        ids = [manager.add_task(title=f"Task {i}") for i in range(5)]
+        manager.delete_task(ids[2])
+
+        assert [t.title for t in manager.get_tasks()] == ["Task 0", "Task 1", "Task 3", "Task 4"]
+        assert manager.get_task(ids[2]) is None
+        assert manager.get_task(ids[3]).title == "Task 3"
+
+    def test_update_preserves_order(self, manager):
+        """Test updating a task does not move it."""
+        ids = [manager.add_task(title=f"Task {i}") for i in range(3)]
+        manager.update_task(ids[0], title="First")
+
+        assert [t.title for t in manager.get_tasks()] == ["First", "Task 1", "Task 2"]
+
+    def test_assigning_tasks_rebuilds_index(self, manager):
+        """Test assigning the tasks list keeps id lookups in sync."""
+        task_id = manager.add_task(title="Task")
+        task = manager.get_task(task_id)
+        manager.tasks = []
+
+        assert manager.get_task(task_id) is None
+        manager.tasks = [task]
+        assert manager.get_task(task_id) is task
+
+    def test_filter_follows_updates(self, manager):
+        """Test filters reflect status and priority changes."""
+        task_id = manager.add_task(title="Task", priority=Priority.LOW)
+        manager.update_task(task_id, status=Status.IN_PROGRESS, priority=Priority.HIGH)
+
+        assert manager.filter_tasks(status=Status.TODO) == []
+        assert manager.filter_tasks(priority=Priority.LOW) == []
+        assert [t.id for t in manager.filter_tasks(status=Status.IN_PROGRESS)] == [task_id]
+
+        manager.delete_task(task_id)
+        assert manager.filter_tasks(priority=Priority.HIGH) == []
+
+    def test_filter_combined_keeps_insertion_order(self, manager):
+        """Test combined filters return tasks in insertion order."""
+        past_date = (datetime.now() - timedelta(days=1)).isoformat()
+        older_date = (datetime.now() - timedelta(days=3)).isoformat()
+        first = manager.add_task(title="First", priority=Priority.HIGH, due_date=past_date)
+        other = manager.add_task(title="Other", priority=Priority.LOW, due_date=older_date)
+        second = manager.add_task(title="Second", priority=Priority.HIGH, due_date=older_date)
+        manager.update_task(first, status=Status.IN_PROGRESS)
+
+        result = manager.filter_tasks(priority=Priority.HIGH, overdue_only=True)
+        assert [t.id for t in result] == [first, second]
+
+        manager.update_task(second, status=Status.COMPLETED)
+        assert [t.id for t in manager.filter_tasks(overdue_only=True)] == [first, other]
+
+    def test_filter_overdue_after_due_date_change(self, manager):
+        """Test moving a due date into the future clears the overdue flag."""
+        past_date = (datetime.now() - timedelta(days=1)).isoformat()
+        future_date = (datetime.now() + timedelta(days=1)).isoformat()
+        task_id = manager.add_task(title="Task", due_date=past_date)
+        manager.update_task(task_id, due_date=future_date)
+
+        assert manager.filter_tasks(overdue_only=True) == []
+
+    @pytest.mark.parametrize("text_index", [False, True])
+    def test_search_ranked_with_limit(self, temp_storage, text_index):
+        """Test ranked search puts title matches first and honours the limit."""
+        manager = TaskManager(storage_path=temp_storage, text_index=text_index)
+        manager.add_task(title="Web Development", description="Learn Python Django")
+        manager.add_task(title="Python Project", description="Learn Python")
+        manager.add_task(title="Python Scripts")
+
+        ranked = manager.search_tasks("python", ranked=True)
+        assert [t.title for t in ranked] == ["Python Project", "Python Scripts", "Web Development"]
+
+        assert [t.title for t in manager.search_tasks("python", limit=2)] == [
+            "Web Development",
+            "Python Project",
+        ]
+
+    def test_search_with_text_index_tracks_mutations(self, temp_storage):
+        """Test the text index follows updates and deletes."""
+        manager = TaskManager(storage_path=temp_storage, text_index=True)
+        task_id = manager.add_task(title="Write report")
+        other_id = manager.add_task(title="Report bug", description="in parser")
+
+        manager.update_task(task_id, title="Write summary")
+        assert [t.id for t in manager.search_tasks("report")] == [other_id]
+        assert [t.id for t in manager.search_tasks("SUMMARY")] == [task_id]
+        assert [t.id for t in manager.search_tasks("rs")] == [other_id]
+
+        manager.delete_task(other_id)
+        assert manager.search_tasks("report") == []
+        assert len(manager.search_tasks("")) == 1
+
+    def test_add_tasks_saves_once(self, manager, monkeypatch):
+        """Test bulk add persists with a single storage call."""
+        calls = []
+        monkeypatch.setattr(manager.storage, "save", lambda tasks: calls.append(len(tasks)))
+
+        ids = manager.add_tasks([{"title": "A"}, {"title": "B", "priority": Priority.HIGH}])
+
+        assert calls == [2]
+        assert [manager.get_task(task_id).title for task_id in ids] == ["A", "B"]
+
+    def test_update_and_delete_tasks(self, manager):
+        """Test bulk update and delete report how many tasks changed."""
+        ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(3)])
+
+        assert manager.update_tasks(ids[:2] + ["missing"], status=Status.COMPLETED) == 2
+        assert len(manager.filter_tasks(status=Status.COMPLETED)) == 2
+        assert manager.delete_tasks([ids[0], "missing"]) == 1
+        assert [t.id for t in manager.get_tasks()] == ids[1:]
+
+    def test_batch_persists_on_exit(self, temp_storage):
+        """Test mutations inside a batch are saved when it exits."""
+        manager = TaskManager(storage_path=temp_storage)
+        with manager.batch():
+            task_id = manager.add_task(title="Batched")
+            manager.update_task(task_id, status=Status.IN_PROGRESS)
+            assert TaskManager(storage_path=temp_storage).get_tasks() == []
+
+        reloaded = TaskManager(storage_path=temp_storage)
+        assert reloaded.get_task(task_id).status == Status.IN_PROGRESS
+
+    def test_batch_rolls_back_on_error(self, manager):
+        """Test an exception inside a batch reverts in-memory state."""
+        keep = manager.add_task(title="Keep", priority=Priority.LOW)
+        drop = manager.add_task(title="Drop")
+
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_task(title="New")
+                manager.update_task(keep, title="Changed", priority=Priority.HIGH)
+                manager.delete_task(drop)
+                raise RuntimeError("boom")
+
+        assert [t.id for t in manager.get_tasks()] == [keep, drop]
+        assert manager.get_task(keep).title == "Keep"
+        assert [t.id for t in manager.filter_tasks(priority=Priority.LOW)] == [keep]
+        assert manager.filter_tasks(priority=Priority.HIGH) == []
+
+    def test_nested_batch_rolls_back_inner_only(self, manager):
+        """Test a failed inner batch keeps the outer batch's changes."""
+        with manager.batch():
+            outer = manager.add_task(title="Outer")
+            with pytest.raises(ValueError):
+                with manager.batch():
+                    manager.add_task(title="Inner")
+                    raise ValueError("inner")
+
+        assert [t.id for t in manager.get_tasks()] == [outer]
+
+    def test_add_task_with_datetime_due_date(self, manager):
+        """Test due dates can be passed as datetime objects."""
+        due = datetime(2026, 12, 31, 9, 0)
+        task_id = manager.add_task(title="Task", due_date=due)
+        manager.update_task(task_id, due_date=due + timedelta(days=1))
+
+        assert manager.get_task(task_id).due_date == datetime(2027, 1, 1, 9, 0)
+
+    def test_sorted_filter(self, manager):
+        """Test sorting by priority and due date, with ties in insertion order."""
+        a = manager.add_task(title="A", priority=Priority.LOW, due_date="2026-03-01")
+        b = manager.add_task(title="B", priority=Priority.CRITICAL)
+        c = manager.add_task(title="C", priority=Priority.LOW, due_date="2026-01-01")
+        d = manager.add_task(title="D", priority=Priority.HIGH, due_date="2026-02-01")
+
+        assert [t.id for t in manager.filter_tasks(sort_by="priority")] == [a, c, d, b]
+        by_priority = manager.filter_tasks(sort_by="priority", descending=True)
+        assert [t.id for t in by_priority] == [b, d, a, c]
+        assert [t.id for t in manager.filter_tasks(sort_by="due_date")] == [c, d, a, b]
+        by_due = manager.filter_tasks(sort_by="due_date", descending=True)
+        assert [t.id for t in by_due] == [a, d, c, b]
+        with pytest.raises(ValueError):
+            manager.filter_tasks(sort_by="title")
+
+    def test_filter_pages(self, manager):
+        """Test limit, offset and cursors page through the same ordering."""
+        ids = manager.add_tasks(
+            [{"title": f"Task {i}", "priority": list(Priority)[i % 4]} for i in range(40)]
+        )
+        everything = [t.id for t in manager.filter_tasks(sort_by="priority", descending=True)]
+        assert sorted(everything) == sorted(ids)
+
+        page = manager.filter_tasks(sort_by="priority", descending=True, limit=15, offset=10)
+        assert [t.id for t in page] == everything[10:25]
+
+        cursor = manager.cursor_after(page[-1], sort_by="priority", descending=True)
+        manager.delete_task(page[-1].id)
+        following = manager.filter_tasks(
+            sort_by="priority", descending=True, limit=10, cursor=cursor
+        )
+        assert [t.id for t in following] == everything[25:35]
+
+    def test_filter_pages_in_insertion_order(self, manager):
+        """Test unsorted pages of a broad filter follow insertion order."""
+        ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(30)])
+        manager.update_task(ids[3], status=Status.COMPLETED)
+        todo = [task_id for task_id in ids if task_id != ids[3]]
+
+        first = manager.filter_tasks(status=Status.TODO, limit=10)
+        assert [t.id for t in first] == todo[:10]
+        cursor = manager.cursor_after(first[-1])
+        rest = manager.filter_tasks(status=Status.TODO, cursor=cursor)
+        assert [t.id for t in rest] == todo[10:]
+
+    def test_iter_filter_tasks_is_lazy(self, manager):
+        """Test the generator variant matches the list and can stop early."""
+        manager.add_tasks(
+            [{"title": f"Task {i}", "due_date": f"2026-01-{i + 1:02d}"} for i in range(9)]
+        )
+
+        stream = manager.iter_filter_tasks(sort_by="due_date", descending=True)
+        assert next(stream).title == "Task 8"
+        assert [t.title for t in stream] == [f"Task {i}" for i in range(7, -1, -1)]
+        assert list(manager.iter_filter_tasks(limit=2, offset=1)) == manager.get_tasks()[1:3]
+
+    def test_search_pages(self, manager):
+        """Test search results can be sorted, paged and streamed."""
+        ids = manager.add_tasks(
+            [{"title": f"Report {i}", "priority": list(Priority)[i % 4]} for i in range(12)]
+            + [{"title": "Other"}]
+        )
+        by_priority = manager.search_tasks("report", sort_by="priority")
+        assert [t.id for t in by_priority] == ids[0:12:4] + ids[1:12:4] + ids[2:12:4] + ids[3:12:4]
+        assert manager.search_tasks("report", sort_by="priority", limit=4, offset=2) == (
+            by_priority[2:6]
+        )
+        assert list(manager.iter_search_tasks("report", limit=3)) == manager.get_tasks()[:3]
+        with pytest.raises(ValueError):
+            manager.search_tasks("report", ranked=True, cursor="[0]")
+
+    def test_stats_track_mutations(self, manager):
+        """Test stats follow adds, updates and deletes."""
+        now = datetime.now()
+        late = manager.add_task(title="Late", due_date=now - timedelta(days=1))
+        soon = manager.add_task(
+            title="Soon", priority=Priority.HIGH, due_date=now + timedelta(hours=1)
+        )
+        manager.add_task(title="Week", due_date=now + timedelta(days=3))
+        manager.add_task(title="Year", due_date=now + timedelta(days=365))
+        undated = manager.add_task(title="Undated", priority=Priority.LOW)
+
+        stats = manager.stats()
+        assert stats.total == 5
+        assert stats.by_status[Status.TODO] == 5
+        assert stats.by_priority == {
+            Priority.LOW: 1,
+            Priority.MEDIUM: 3,
+            Priority.HIGH: 1,
+            Priority.CRITICAL: 0,
+        }
+        assert stats.overdue == 1
+        assert stats.due_histogram == {
+            "overdue": 1,
+            "next_day": 1,
+            "next_week": 1,
+            "next_month": 0,
+            "later": 1,
+            "no_due_date": 1,
+        }
+
+        manager.update_task(late, status=Status.COMPLETED)
+        manager.update_task(soon, due_date=now - timedelta(hours=1))
+        manager.delete_task(undated)
+
+        stats = manager.stats()
+        assert stats.total == 4
+        assert stats.by_status[Status.COMPLETED] == 1
+        assert stats.overdue == 1
+        assert stats.due_histogram["next_day"] == 0
+        assert stats.due_histogram["no_due_date"] == 0
+        assert stats.overdue == len(manager.filter_tasks(overdue_only=True))
+
+    def test_next_due_and_overdue_since(self, manager):
+        """Test the overdue tracker ignores completed and undated tasks."""
+        now = datetime.now()
+        old = manager.add_task(title="Old", due_date=now - timedelta(days=3))
+        recent = manager.add_task(title="Recent", due_date=now - timedelta(hours=1))
+        done = manager.add_task(title="Done", due_date=now - timedelta(minutes=5))
+        upcoming = manager.add_task(title="Upcoming", due_date=now + timedelta(hours=1))
+        manager.add_task(title="Undated")
+        manager.update_task(done, status=Status.COMPLETED)
+
+        assert manager.next_due().id == upcoming
+        assert manager.next_due(now - timedelta(days=1)).id == recent
+        since = manager.overdue_since(now - timedelta(days=1))
+        assert [t.id for t in since] == [recent]
+        assert [t.id for t in manager.overdue_since(now - timedelta(days=7))] == [old, recent]
+
+        manager.update_task(upcoming, status=Status.COMPLETED)
+        assert manager.next_due() is None
+
+    def test_watch_overdue_yields_tasks_as_they_fall_due(self, manager):
+        """Test the watcher reports each task once, when it becomes overdue."""
+        now = datetime.now()
+        manager.add_task(title="Already", due_date=now - timedelta(minutes=1))
+        manager.add_task(title="First", due_date=now + timedelta(milliseconds=50))
+        manager.add_task(title="Second", due_date=now + timedelta(milliseconds=100))
+        stop = threading.Event()
+
+        seen = []
+        for task in manager.watch_overdue(max_wait=0.02, stop=stop):
+            seen.append((task.title, datetime.now() >= task.due_date))
+            if len(seen) == 2:
+                stop.set()
+
+        assert seen == [("First", True), ("Second", True)]
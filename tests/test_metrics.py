@@ -0,0 +1,155 @@
+"""Tests for operation metrics."""
+
+import pytest
+
+from tasklib.manager import TaskManager
+from tasklib.metrics import LATENCY_BUCKETS, Metrics
+from tasklib.models import Priority, Status
+from tasklib.storage import JournalStorage
+
+
+class TestMetrics:
+    """Test cases for the Metrics registry."""
+
+    def test_observe_fills_histogram(self):
+        """Test each call lands in the first bucket whose bound it does not exceed."""
+        metrics = Metrics()
+        metrics.observe("op", 0.00005)
+        metrics.observe("op", LATENCY_BUCKETS[1])
+        metrics.observe("op", 10.0, error=True)
+
+        entry = metrics.snapshot()["op"]
+        assert entry.count == 3
+        assert entry.errors == 1
+        assert entry.total_seconds == pytest.approx(10.00005 + LATENCY_BUCKETS[1])
+        assert entry.buckets[0] == 1
+        assert entry.buckets[1] == 1
+        assert entry.buckets[-1] == 1
+
+    def test_time_records_errors(self):
+        """Test a timed block that raises is counted as an error."""
+        metrics = Metrics()
+        with pytest.raises(KeyError):
+            with metrics.time("op"):
+                raise KeyError("x")
+        assert metrics.snapshot()["op"].errors == 1
+
+    def test_hooks_receive_calls(self):
+        """Test hooks are called with the operation name and duration."""
+        calls = []
+        metrics = Metrics(hooks=[lambda name, seconds: calls.append((name, seconds))])
+        metrics.call("op", sum, [1, 2])
+        assert [name for name, _ in calls] == ["op"]
+        assert calls[0][1] >= 0
+
+    def test_count_scanned(self):
+        """Test only the items actually consumed are counted."""
+        metrics = Metrics()
+        items = metrics.count_scanned("op", range(10))
+        assert next(items) == 0
+        assert next(items) == 1
+        items.close()
+        assert metrics.snapshot()["op"].tasks_scanned == 2
+
+    def test_snapshot_is_a_copy(self):
+        """Test later calls do not change an earlier snapshot."""
+        metrics = Metrics()
+        metrics.observe("op", 0.1)
+        snapshot = metrics.snapshot()
+        metrics.observe("op", 0.1)
+        assert snapshot["op"].count == 1
+
+    def test_reset(self):
+        """Test reset discards all measurements."""
+        metrics = Metrics()
+        metrics.observe("op", 0.1)
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_to_prometheus(self):
+        """Test the text exposition format output."""
+        metrics = Metrics()
+        metrics.observe("save", 0.002)
+        metrics.add_bytes_written("storage.write", 42)
+        text = metrics.to_prometheus()
+
+        assert "# TYPE tasklib_operation_seconds histogram" in text
+        assert 'tasklib_operation_seconds_bucket{operation="save",le="0.001"} 0' in text
+        assert 'tasklib_operation_seconds_bucket{operation="save",le="0.0025"} 1' in text
+        assert 'tasklib_operation_seconds_bucket{operation="save",le="+Inf"} 1' in text
+        assert 'tasklib_operation_seconds_count{operation="save"} 1' in text
+        assert 'tasklib_bytes_written_total{operation="storage.write"} 42' in text
+        assert text.endswith("\n")
+
+
+class TestManagerMetrics:
+    """Test cases for TaskManager instrumentation."""
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test a manager records nothing unless metrics are enabled."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        manager.add_task("Task")
+        assert manager.metrics() == {}
+        assert "add_task" not in vars(manager)
+
+    def test_operations_are_counted(self, tmp_path):
+        """Test public operations and storage work are timed."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), metrics=True)
+        task_id = manager.add_task("Task", due_date="March 1 2030")
+        manager.get_task(task_id)
+        manager.update_task(task_id, status=Status.COMPLETED)
+        manager.filter_tasks(status=Status.COMPLETED)
+        manager.search_tasks("task")
+
+        metrics = manager.metrics()
+        for name in ("load", "add_task", "get_task", "update_task", "filter_tasks"):
+            assert metrics[name].count == 1
+        assert metrics["parse_date"].count == 1
+        assert metrics["storage.encode"].count == 2
+        assert metrics["storage.write"].count == 2
+        assert metrics["storage.write"].bytes_written > 0
+
+    def test_bytes_written(self, tmp_path):
+        """Test bytes written match the file size for a full save."""
+        path = tmp_path / "tasks.json"
+        manager = TaskManager(storage_path=str(path), metrics=True)
+        manager.add_task("Task")
+        assert manager.metrics()["storage.write"].bytes_written == path.stat().st_size
+
+    def test_journal_bytes_written(self, tmp_path):
+        """Test journal appends count the bytes they append."""
+        storage = JournalStorage(tmp_path / "tasks.json")
+        manager = TaskManager(storage=storage, metrics=True)
+        manager.add_task("Task")
+        assert manager.metrics()["storage.write"].bytes_written == (
+            storage.journal_path.stat().st_size
+        )
+
+    def test_tasks_scanned(self, tmp_path):
+        """Test queries record how many tasks they examined."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), metrics=True)
+        manager.add_tasks([{"title": f"Task {i}", "priority": Priority.LOW} for i in range(20)])
+        manager.add_task("Urgent", priority=Priority.CRITICAL)
+
+        manager.filter_tasks(priority=Priority.CRITICAL)
+        assert manager.metrics()["filter_tasks"].tasks_scanned == 1
+
+        manager.search_tasks("urgent")
+        assert manager.metrics()["search_tasks"].tasks_scanned == 21
+
+    def test_shared_registry(self, tmp_path):
+        """Test managers can share one registry."""
+        metrics = Metrics()
+        first = TaskManager(storage_path=str(tmp_path / "a.json"), metrics=metrics)
+        second = TaskManager(storage_path=str(tmp_path / "b.json"), metrics=metrics)
+        first.add_task("A")
+        second.add_task("B")
+        assert metrics.snapshot()["add_task"].count == 2
+        assert first.metrics() == second.metrics()
+
+    def test_errors_are_counted(self, tmp_path):
+        """Test an operation that raises is counted as an error."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"), metrics=True)
+        with pytest.raises(ValueError):
+            manager.filter_tasks(sort_by="title")
+        assert manager.metrics()["filter_tasks"].errors == 1
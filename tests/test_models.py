@@ -1,6 +1,11 @@
 """Tests for task models."""
 
+import sys
+from dataclasses import fields
 from datetime import datetime, timedelta
+
+import pytest
+
 from tasklib.models import Task, Priority, Status
 
 
@@ -51,6 +56,32 @@ class TestTask:
         assert "created_at" in data
         assert "updated_at" in data
 
+    def test_task_to_dict_matches_dataclass_layout(self):
+        """Test to_dict keeps field order and None for a missing due date."""
+        task = Task(title="Task")
+
+        assert list(task.to_dict()) == [f.name for f in fields(Task)]
+        assert task.to_dict()["due_date"] is None
+
+    def test_task_from_dict_defaults(self):
+        """Test optional keys fall back to field defaults."""
+        data = Task(title="Task").to_dict()
+        del data["description"], data["id"], data["due_date"]
+
+        restored = Task.from_dict(data)
+
+        assert restored.description == ""
+        assert restored.id
+        assert restored.due_date is None
+
+    def test_task_from_dict_invalid_priority(self):
+        """Test an unknown priority value raises ValueError."""
+        data = Task(title="Task").to_dict()
+        data["priority"] = "urgent"
+
+        with pytest.raises(ValueError):
+            Task.from_dict(data)
+
     def test_task_from_dict(self):
         """Test task deserialization from dictionary."""
         original = Task(
@@ -69,6 +100,21 @@ class TestTask:
         assert restored.status == original.status
         assert restored.id == original.id
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slots need Python 3.10+")
+    def test_task_has_no_instance_dict(self):
+        """Test tasks are slotted to keep them small."""
+        task = Task(title="Slotted")
+
+        assert not hasattr(task, "__dict__")
+
+    def test_task_from_dict_shares_unchanged_timestamps(self):
+        """Test never-updated tasks reuse one datetime for both timestamps."""
+        now = datetime.now()
+        restored = Task.from_dict(Task(title="Task", created_at=now, updated_at=now).to_dict())
+
+        assert restored.updated_at is restored.created_at
+        assert restored.created_at == now
+
     def test_task_is_overdue_false(self):
         """Test is_overdue returns False for future tasks."""
         future_date = datetime.now() + timedelta(days=1)
@@ -90,6 +136,14 @@ class TestTask:
 
         assert not task.is_overdue()
 
+    def test_task_is_overdue_at_given_time(self):
+        """Test is_overdue compares against a supplied current time."""
+        due = datetime(2026, 1, 1)
+        task = Task(title="Task", due_date=due)
+
+        assert not task.is_overdue(now=due - timedelta(seconds=1))
+        assert task.is_overdue(now=due + timedelta(seconds=1))
+
     def test_task_is_overdue_no_date(self):
         """Test is_overdue returns False when no due date."""
         task = Task(title="No Deadline Task")
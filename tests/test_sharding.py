@@ -0,0 +1,181 @@
+"""Tests for the sharded task manager."""
+
+import os
+
+import pytest
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status
+from tasklib.sharding import ShardedTaskManager, reshard, shard_for
+from tasklib.storage import JournalStorage, JSONStorage
+
+
+class TestShardedTaskManager:
+    """Test cases for ShardedTaskManager class."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a four-shard manager in a temporary directory."""
+        with ShardedTaskManager(tmp_path / "shards", shards=4) as manager:
+            yield manager
+
+    def test_tasks_route_to_owning_shard(self, manager):
+        """Test each task is stored only in the shard its ID hashes to."""
+        ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(40)])
+
+        for task_id in ids:
+            owner = shard_for(task_id, 4)
+            assert [shard.get_task(task_id) is not None for shard in manager.shards] == [
+                index == owner for index in range(4)
+            ]
+        assert all(shard.get_tasks() for shard in manager.shards)
+
+    def test_shard_for_is_stable(self):
+        """Test routing does not depend on the per-process hash seed."""
+        assert shard_for("00000000-0000-0000-0000-000000000000", 7) == 5
+
+    def test_point_operations(self, manager):
+        """Test get, update and delete reach the owning shard."""
+        task_id = manager.add_task("Task", priority=Priority.HIGH, due_date="2026-01-01")
+
+        assert manager.update_task(task_id, status=Status.COMPLETED)
+        assert manager.get_task(task_id).status == Status.COMPLETED
+        assert manager.delete_task(task_id)
+        assert manager.get_task(task_id) is None
+        assert not manager.delete_task(task_id)
+
+    def test_bulk_operations(self, manager):
+        """Test bulk updates and deletes are split across shards."""
+        ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(20)])
+
+        assert manager.update_tasks(ids[:10] + ["missing"], status=Status.COMPLETED) == 10
+        assert manager.delete_tasks(ids[15:]) == 5
+        assert len(manager.filter_tasks(status=Status.COMPLETED)) == 10
+        assert [t.id for t in manager.get_tasks()] == ids[:15]
+
+    def test_search_merges_in_order(self, manager):
+        """Test search results from all shards are merged and limited."""
+        ids = manager.add_tasks(
+            [{"title": f"Task {i}", "description": "urgent" if i % 2 else ""} for i in range(20)]
+            + [{"title": "urgent fix"}]
+        )
+
+        assert [t.id for t in manager.search_tasks("urgent")] == ids[1:20:2] + ids[20:]
+        ranked = manager.search_tasks("urgent", ranked=True, limit=3)
+        assert [t.id for t in ranked] == [ids[20], ids[1], ids[3]]
+
+    def test_stats_add_up_shards(self, manager):
+        """Test sharded stats sum the shards' counts."""
+        ids = manager.add_tasks(
+            [{"title": f"Task {i}", "due_date": "2020-01-01"} for i in range(12)]
+        )
+        manager.update_tasks(ids[:5], status=Status.COMPLETED)
+
+        stats = manager.stats()
+        assert stats.total == 12
+        assert stats.by_status[Status.COMPLETED] == 5
+        assert stats.overdue == stats.due_histogram["overdue"] == 7
+
+    def test_mismatched_shard_count_raises(self, tmp_path):
+        """Test opening a store with the wrong shard count is refused."""
+        with ShardedTaskManager(tmp_path, shards=2) as manager:
+            manager.add_task("Task")
+
+        with pytest.raises(ValueError):
+            ShardedTaskManager(tmp_path, shards=3)
+
+    def test_process_pool_queries(self, tmp_path):
+        """Test filters and searches give the same answers from worker processes."""
+        with ShardedTaskManager(tmp_path, shards=3, processes=2) as manager:
+            ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(30)])
+            manager.update_tasks(ids[::3], status=Status.COMPLETED)
+
+            completed = manager.filter_tasks(status=Status.COMPLETED)
+            assert [t.id for t in completed] == ids[::3]
+            manager.delete_task(ids[0])
+            assert [t.id for t in manager.filter_tasks(status=Status.COMPLETED)] == ids[3::3]
+            assert [t.title for t in manager.search_tasks("Task 7")] == ["Task 7"]
+
+
+class TestResharding:
+    """Test cases for reshard and migrate_from."""
+
+    def test_reshard_keeps_every_task(self, tmp_path):
+        """Test resharding moves tasks to their new shards and removes old files."""
+        with ShardedTaskManager(tmp_path, shards=2, storage_class=JournalStorage) as manager:
+            ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(25)])
+
+        assert reshard(tmp_path, 5, storage_class=JournalStorage) == 25
+        assert not list(tmp_path.glob("shard-*-of-002.json*"))
+
+        with ShardedTaskManager(tmp_path, shards=5, storage_class=JournalStorage) as manager:
+            assert [t.id for t in manager.get_tasks()] == ids
+            assert all(manager.shard_for(i).get_task(i) for i in ids)
+
+    def test_reshard_to_existing_layout_raises(self, tmp_path):
+        """Test resharding onto the current shard count is refused."""
+        with ShardedTaskManager(tmp_path, shards=2) as manager:
+            manager.add_task("Task")
+        with pytest.raises(ValueError):
+            reshard(tmp_path, 2)
+
+    def test_reshard_interrupted_while_writing(self, tmp_path, monkeypatch):
+        """Test a failure before the new layout is complete keeps the old one."""
+        with ShardedTaskManager(tmp_path, shards=2) as manager:
+            ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(20)])
+        saves = []
+        original = JSONStorage.save
+
+        def save(storage, tasks):
+            saves.append(storage.path)
+            if len(saves) == 2:
+                raise OSError("disk full")
+            original(storage, tasks)
+
+        monkeypatch.setattr(JSONStorage, "save", save)
+        with pytest.raises(OSError):
+            reshard(tmp_path, 3)
+        monkeypatch.undo()
+
+        with ShardedTaskManager(tmp_path, shards=2) as manager:
+            assert [t.id for t in manager.get_tasks()] == ids
+        assert reshard(tmp_path, 3) == 20
+        with ShardedTaskManager(tmp_path, shards=3) as manager:
+            assert [t.id for t in manager.get_tasks()] == ids
+        assert not (tmp_path / ".reshard").exists()
+
+    def test_reshard_interrupted_while_switching(self, tmp_path, monkeypatch):
+        """Test a failure while swapping layouts is completed by the next open."""
+        with ShardedTaskManager(tmp_path, shards=2) as manager:
+            ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(20)])
+        replace = os.replace
+        calls = []
+
+        def flaky_replace(src, dst):
+            calls.append(dst)
+            # Three shard saves and the completion marker succeed, then one
+            # staged shard is moved into place before the failure.
+            if len(calls) == 6:
+                raise OSError("interrupted")
+            replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", flaky_replace)
+        with pytest.raises(OSError):
+            reshard(tmp_path, 3)
+        monkeypatch.undo()
+        assert list(tmp_path.glob("shard-*-of-003.json"))
+        assert not list(tmp_path.glob("shard-*-of-002.json"))
+
+        with ShardedTaskManager(tmp_path, shards=3) as manager:
+            assert [t.id for t in manager.get_tasks()] == ids
+        assert not (tmp_path / ".reshard").exists()
+
+    def test_migrate_from_single_file(self, tmp_path):
+        """Test importing a tasks.json keeps IDs and skips duplicates."""
+        source = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        ids = source.add_tasks([{"title": f"Task {i}"} for i in range(10)])
+
+        with ShardedTaskManager(tmp_path / "shards", shards=3) as manager:
+            assert manager.migrate_from(JSONStorage(tmp_path / "tasks.json")) == 10
+            assert manager.migrate_from(JSONStorage(tmp_path / "tasks.json")) == 0
+            assert [t.id for t in manager.get_tasks()] == ids
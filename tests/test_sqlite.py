@@ -0,0 +1,169 @@
+"""Tests for the SQLite-backed task manager."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status
+from tasklib.sqlite import SQLiteTaskManager
+
+
+class TestSQLiteTaskManager:
+    """Test cases for SQLiteTaskManager class."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create an SQLiteTaskManager in a temporary directory."""
+        with SQLiteTaskManager(storage_path=str(tmp_path / "tasks.db")) as manager:
+            yield manager
+
+    def test_crud(self, manager):
+        """Test adding, updating and deleting tasks."""
+        task_id = manager.add_task(
+            title="Task", description="Details", priority=Priority.HIGH, due_date="2026-12-31"
+        )
+        task = manager.get_task(task_id)
+        assert task.title == "Task"
+        assert task.priority == Priority.HIGH
+        assert task.due_date == datetime(2026, 12, 31)
+
+        assert manager.update_task(task_id, title="Renamed", status=Status.IN_PROGRESS)
+        task = manager.get_task(task_id)
+        assert task.title == "Renamed"
+        assert task.status == Status.IN_PROGRESS
+
+        assert manager.delete_task(task_id)
+        assert manager.get_task(task_id) is None
+        assert not manager.delete_task(task_id)
+        assert not manager.update_task(task_id, title="Gone")
+
+    def test_persistence(self, tmp_path):
+        """Test tasks survive reopening the database."""
+        path = str(tmp_path / "tasks.db")
+        with SQLiteTaskManager(storage_path=path) as manager:
+            task_id = manager.add_task(title="Persistent")
+
+        with SQLiteTaskManager(storage_path=path) as manager:
+            assert [t.id for t in manager.get_tasks()] == [task_id]
+
+    def test_filter(self, manager):
+        """Test filters are evaluated in SQL."""
+        past_date = (datetime.now() - timedelta(days=1)).isoformat()
+        future_date = (datetime.now() + timedelta(days=1)).isoformat()
+        overdue = manager.add_task(title="Overdue", priority=Priority.HIGH, due_date=past_date)
+        manager.add_task(title="Future", priority=Priority.HIGH, due_date=future_date)
+        done = manager.add_task(title="Done", due_date=past_date)
+        manager.update_task(done, status=Status.COMPLETED)
+
+        assert [t.id for t in manager.filter_tasks(overdue_only=True)] == [overdue]
+        assert len(manager.filter_tasks(priority=Priority.HIGH)) == 2
+        assert [t.id for t in manager.filter_tasks(status=Status.COMPLETED)] == [done]
+        assert len(manager.filter_tasks()) == 3
+
+    def test_search(self, manager):
+        """Test substring search, ranking and limits."""
+        manager.add_task(title="Web Development", description="Learn Python Django")
+        manager.add_task(title="Python Project", description="Learn Python")
+        manager.add_task(title="Java Project", description="Learn Java")
+
+        assert [t.title for t in manager.search_tasks("PYTHON")] == [
+            "Web Development",
+            "Python Project",
+        ]
+        assert [t.title for t in manager.search_tasks("python", ranked=True, limit=1)] == [
+            "Python Project"
+        ]
+        assert [t.title for t in manager.search_tasks("va")] == ["Java Project"]
+
+    @pytest.mark.parametrize("query", ["école", "ÉCO", "éc", "ärger", "ÄRG"])
+    def test_search_non_ascii(self, manager, tmp_path, query):
+        """Test searches fold non-ASCII case like TaskManager does."""
+        manager.add_task(title="École", description="Kein Ärger")
+        manager.add_task(title="Ecology")
+        reference = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        reference.add_task(title="École", description="Kein Ärger")
+        reference.add_task(title="Ecology")
+
+        expected = [t.title for t in reference.search_tasks(query)]
+        assert [t.title for t in manager.search_tasks(query)] == expected == ["École"]
+
+    def test_search_after_update(self, manager):
+        """Test the search index follows updates and deletes."""
+        task_id = manager.add_task(title="Write report")
+        manager.update_task(task_id, title="Write summary")
+
+        assert manager.search_tasks("report") == []
+        assert [t.id for t in manager.search_tasks("summary")] == [task_id]
+        manager.delete_task(task_id)
+        assert manager.search_tasks("summary") == []
+
+    def test_batch_rolls_back(self, manager):
+        """Test a failed batch leaves the database unchanged."""
+        keep = manager.add_task(title="Keep")
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_task(title="New")
+                manager.delete_task(keep)
+                raise RuntimeError("boom")
+
+        assert [t.id for t in manager.get_tasks()] == [keep]
+
+    def test_bulk_operations(self, manager):
+        """Test bulk add, update and delete."""
+        ids = manager.add_tasks([{"title": f"Task {i}"} for i in range(3)])
+
+        assert manager.update_tasks(ids, status=Status.COMPLETED) == 3
+        assert manager.delete_tasks(ids[:2] + ["missing"]) == 2
+        assert [t.id for t in manager.filter_tasks(status=Status.COMPLETED)] == ids[2:]
+
+    def test_bulk_update_keeps_unset_fields(self, manager):
+        """Test a bulk update changes only the fields it is given."""
+        first = manager.add_task(title="Draft", description="Notes", priority=Priority.HIGH)
+        second = manager.add_task(title="Other", due_date="2026-01-01")
+
+        assert manager.update_tasks([first, second], title="Final", due_date="2026-05-01") == 2
+
+        task = manager.get_task(first)
+        assert (task.title, task.description, task.priority) == ("Final", "Notes", Priority.HIGH)
+        assert task.due_date == datetime(2026, 5, 1)
+        assert [t.id for t in manager.search_tasks("final")] == [first, second]
+        assert [t.id for t in manager.filter_tasks(sort_by="due_date")] == [first, second]
+
+    def test_sorting_and_paging(self, manager):
+        """Test sort_by, descending, limit and offset."""
+        a = manager.add_task(title="A", priority=Priority.LOW, due_date="2026-03-01")
+        b = manager.add_task(title="B", priority=Priority.CRITICAL)
+        c = manager.add_task(title="C", priority=Priority.LOW, due_date="2026-01-01")
+
+        assert [t.id for t in manager.filter_tasks(sort_by="priority")] == [a, c, b]
+        by_due = manager.filter_tasks(sort_by="due_date", descending=True)
+        assert [t.id for t in by_due] == [a, c, b]
+        assert [t.id for t in manager.filter_tasks(limit=1, offset=1)] == [b]
+        page = manager.search_tasks("", sort_by="priority", descending=True, limit=2)
+        assert [t.id for t in page] == [b, a]
+
+    def test_stats_match_in_memory_manager(self, manager, tmp_path):
+        """Test SQL aggregates give the same summary as TaskManager.stats."""
+        memory = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        now = datetime.now()
+        rows = [
+            {"title": "Late", "due_date": now - timedelta(days=1)},
+            {"title": "Soon", "priority": Priority.HIGH, "due_date": now + timedelta(hours=2)},
+            {"title": "Later", "due_date": now + timedelta(days=90)},
+            {"title": "Undated", "priority": Priority.CRITICAL},
+        ]
+        for target in (manager, memory):
+            ids = target.add_tasks(rows)
+            target.update_task(ids[2], status=Status.COMPLETED)
+
+        assert manager.stats() == memory.stats()
+
+    def test_migrate_from_json(self, manager, tmp_path):
+        """Test importing an existing tasks.json keeps IDs and order."""
+        json_manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        ids = json_manager.add_tasks([{"title": "First"}, {"title": "Second"}])
+
+        assert manager.migrate_from_json(str(tmp_path / "tasks.json")) == 2
+        assert manager.migrate_from_json(str(tmp_path / "tasks.json")) == 0
+        assert [t.id for t in manager.get_tasks()] == ids
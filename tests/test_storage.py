@@ -0,0 +1,531 @@
+"""Tests for storage backends."""
+
+import json
+import multiprocessing
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from tasklib.manager import TaskManager
+from tasklib.models import Priority, Status, Task
+from tasklib import storage as storage_module
+from tasklib.storage import (
+    Durability,
+    JournalStorage,
+    JSONStorage,
+    NDJSONStorage,
+    decode_tasks,
+    encode_tasks,
+)
+
+requires_fcntl = pytest.mark.skipif(storage_module.fcntl is None, reason="needs fcntl.flock")
+
+
+def _add_from_process(path, journal, count):
+    """Add tasks through a shared manager; run in a worker process."""
+    storage = JournalStorage(path, compact_threshold=7) if journal else JSONStorage(path)
+    manager = TaskManager(storage=storage, shared=True)
+    for i in range(count):
+        task_id = manager.add_task(title=f"Task {i}")
+        manager.update_task(task_id, status=Status.COMPLETED)
+    manager.close()
+
+
+class TestEncoding:
+    """Test cases for encode_tasks and decode_tasks."""
+
+    @pytest.mark.parametrize("title", ["Plain", "Caf\u00e9 \u2615", "Tab\tand\x7f", ""])
+    def test_encode_matches_stdlib_json(self, title):
+        """Test the encoder output is byte-compatible with json.dumps(indent=2)."""
+        tasks = [Task(title=title, description="Line\nbreak"), Task(title="Other")]
+
+        expected = json.dumps([task.to_dict() for task in tasks], indent=2)
+        assert encode_tasks(tasks) == expected
+
+    def test_encode_without_orjson(self, monkeypatch):
+        """Test the standard library path produces the same document."""
+        tasks = [Task(title="Caf\u00e9")]
+        expected = encode_tasks(tasks)
+        monkeypatch.setattr("tasklib.storage.orjson", None)
+
+        assert encode_tasks(tasks) == expected
+        assert decode_tasks(expected) == tasks
+
+    def test_encode_empty(self):
+        """Test encoding an empty collection."""
+        assert encode_tasks([]) == "[]"
+
+    def test_round_trip(self):
+        """Test decoding restores the encoded tasks."""
+        task = Task(title="Caf\u00e9", priority=Priority.HIGH)
+
+        assert decode_tasks(encode_tasks([task])) == [task]
+
+
+class TestJSONStorage:
+    """Test cases for JSONStorage class."""
+
+    def test_missing_file_loads_empty(self, tmp_path):
+        """Test loading from a file that does not exist."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        assert storage.load() == []
+
+    def test_iter_tasks_streams_saved_file(self, tmp_path):
+        """Test streaming yields the same tasks as load."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        tasks = [Task(title=f"Task {i}", description="x" * 5000) for i in range(30)]
+        storage.save(tasks)
+
+        assert list(storage.iter_tasks()) == tasks
+
+    def test_iter_tasks_empty_file(self, tmp_path):
+        """Test streaming an empty file yields nothing."""
+        path = tmp_path / "tasks.json"
+        path.write_text("", encoding="utf-8")
+
+        assert list(JSONStorage(path).iter_tasks()) == []
+
+    def test_iter_tasks_truncated_file(self, tmp_path):
+        """Test streaming a truncated file raises after the complete tasks."""
+        path = tmp_path / "tasks.json"
+        JSONStorage(path).save([Task(title="A"), Task(title="B")])
+        path.write_text(path.read_text(encoding="utf-8")[:-20], encoding="utf-8")
+
+        stream = JSONStorage(path).iter_tasks()
+        assert next(stream).title == "A"
+        with pytest.raises(ValueError):
+            next(stream)
+
+    def test_empty_file_loads_empty(self, tmp_path):
+        """Test an empty file, which holds nothing to lose, loads as empty."""
+        path = tmp_path / "tasks.json"
+        path.write_text("", encoding="utf-8")
+        assert JSONStorage(path).load() == []
+
+    @pytest.mark.parametrize("text", ["[{bad", '[{"title": "No fields"}]', '{"a": 1}'])
+    def test_corrupt_file_raises(self, tmp_path, text):
+        """Test a corrupt file raises instead of loading as empty and being overwritten."""
+        path = tmp_path / "tasks.json"
+        path.write_text(text, encoding="utf-8")
+
+        with pytest.raises(ValueError, match="not a valid task file"):
+            JSONStorage(path).load()
+        with pytest.raises(ValueError):
+            TaskManager(storage_path=str(path))
+        assert path.read_text(encoding="utf-8") == text
+
+    def test_manager_uses_json_storage_by_default(self, tmp_path):
+        """Test TaskManager falls back to JSON storage."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        assert isinstance(manager.storage, JSONStorage)
+        assert manager.storage_path == tmp_path / "tasks.json"
+
+    def test_default_random_access_reads(self, tmp_path):
+        """Test read_task and filter_tasks work on storages without random access."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        tasks = [
+            Task(title="Open", priority=Priority.HIGH, due_date=datetime(2000, 1, 1)),
+            Task(title="Done", priority=Priority.HIGH, status=Status.COMPLETED),
+            Task(title="Low", priority=Priority.LOW),
+        ]
+        storage.save(tasks)
+
+        assert storage.read_task(tasks[1].id).title == "Done"
+        assert storage.read_task("unknown") is None
+        high = storage.filter_tasks(priority=Priority.HIGH, descending=True)
+        assert [t.title for t in high] == ["Done", "Open"]
+        assert [t.title for t in storage.filter_tasks(overdue_only=True)] == ["Open"]
+        assert [t.title for t in storage.filter_tasks(limit=1, offset=1)] == ["Done"]
+
+
+class TestAtomicWrites:
+    """Test cases for atomic, durable saves."""
+
+    @pytest.mark.parametrize("durability", list(Durability))
+    def test_save_replaces_file(self, tmp_path, durability):
+        """Test every durability level writes the file and leaves no temp files."""
+        storage = JSONStorage(tmp_path / "tasks.json", durability=durability)
+        storage.save([Task(title="A")])
+        storage.save([Task(title="B")])
+
+        assert [t.title for t in storage.load()] == ["B"]
+        assert [p.name for p in tmp_path.iterdir()] == ["tasks.json"]
+
+    def test_failed_save_keeps_previous_file(self, tmp_path, monkeypatch):
+        """Test a crash while writing leaves the old contents in place."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        storage.save([Task(title="Original")])
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("tasklib.storage.os.replace", fail)
+        with pytest.raises(OSError):
+            storage.save([Task(title="Replacement")])
+
+        assert [t.title for t in storage.load()] == ["Original"]
+        assert [p.name for p in tmp_path.iterdir()] == ["tasks.json"]
+
+    def test_compact_format(self, tmp_path):
+        """Test compact output is smaller and loads the same tasks."""
+        tasks = [Task(title=f"Task {i}") for i in range(10)]
+        indented = JSONStorage(tmp_path / "indented.json")
+        compact = JSONStorage(tmp_path / "compact.json", compact=True)
+        indented.save(tasks)
+        compact.save(tasks)
+
+        assert compact.path.stat().st_size < 0.8 * indented.path.stat().st_size
+        assert compact.load() == indented.load() == tasks
+
+
+class TestDirtyTracking:
+    """Test cases for skipping saves when nothing changed."""
+
+    def test_save_skipped_when_clean(self, tmp_path, monkeypatch):
+        """Test save only writes after a change or when forced."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+        calls = []
+        monkeypatch.setattr(manager.storage, "save", lambda tasks: calls.append(len(tasks)))
+
+        manager.save()
+        assert calls == []
+
+        manager.tasks = [Task(title="Assigned")]
+        manager.save()
+        manager.save()
+        assert calls == [1]
+
+        manager.save(force=True)
+        assert calls == [1, 1]
+
+    def test_failed_write_stays_dirty(self, tmp_path, monkeypatch):
+        """Test a mutation whose write failed is saved by the next save."""
+        manager = TaskManager(storage_path=str(tmp_path / "tasks.json"))
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(manager.storage, "record", fail)
+        with pytest.raises(OSError):
+            manager.add_task(title="Task")
+        monkeypatch.undo()
+
+        manager.save()
+        assert [t.title for t in JSONStorage(tmp_path / "tasks.json").load()] == ["Task"]
+
+
+class TestNDJSONStorage:
+    """Test cases for NDJSONStorage class."""
+
+    def test_one_task_per_line(self, tmp_path):
+        """Test tasks are written one per line and read back."""
+        storage = NDJSONStorage(tmp_path / "tasks.ndjson")
+        manager = TaskManager(storage=storage)
+        manager.add_tasks([{"title": "A"}, {"title": "B", "priority": Priority.HIGH}])
+
+        lines = storage.path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["A", "B"]
+        reloaded = TaskManager(storage=NDJSONStorage(storage.path))
+        assert reloaded.get_tasks() == manager.get_tasks()
+
+    def test_lazy_manager_streams_without_loading(self, tmp_path):
+        """Test a lazy manager streams from storage until first use."""
+        storage = NDJSONStorage(tmp_path / "tasks.ndjson")
+        storage.save([Task(title="A"), Task(title="B")])
+
+        manager = TaskManager(storage=storage, lazy=True)
+        assert [t.title for t in manager.iter_tasks()] == ["A", "B"]
+        assert manager._tasks == {}
+
+        manager.add_task(title="C")
+        assert [t.title for t in manager.iter_tasks()] == ["A", "B", "C"]
+
+    def test_malformed_line_raises(self, tmp_path):
+        """Test a bad line raises with its number instead of discarding the store."""
+        path = tmp_path / "tasks.ndjson"
+        NDJSONStorage(path).save([Task(title=str(i)) for i in range(5)])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("{bad\n")
+        before = path.read_text(encoding="utf-8")
+
+        with pytest.raises(ValueError, match="line 6"):
+            NDJSONStorage(path).load()
+        with pytest.raises(ValueError, match="line 6"):
+            TaskManager(storage=NDJSONStorage(path))
+        assert path.read_text(encoding="utf-8") == before
+
+
+class TestJournalStorage:
+    """Test cases for JournalStorage class."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create a journal storage in a temporary directory."""
+        return JournalStorage(tmp_path / "tasks.json", compact_threshold=100)
+
+    def test_mutations_append_to_journal(self, storage):
+        """Test each mutation appends one journal record."""
+        manager = TaskManager(storage=storage)
+        task_id = manager.add_task(title="Task")
+        manager.update_task(task_id, status=Status.IN_PROGRESS)
+        manager.delete_task(task_id)
+
+        header, *lines = storage.journal_path.read_text(encoding="utf-8").splitlines()
+        assert "snapshot" in json.loads(header)
+        assert [json.loads(line)["op"] for line in lines] == ["add", "update", "delete"]
+        assert not storage.path.exists()
+
+    def test_replay_restores_state(self, storage):
+        """Test load replays the journal on top of the snapshot."""
+        manager = TaskManager(storage=storage)
+        keep_id = manager.add_task(title="Keep", priority=Priority.HIGH)
+        drop_id = manager.add_task(title="Drop")
+        manager.update_task(keep_id, title="Kept")
+        manager.delete_task(drop_id)
+
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in reloaded.get_tasks()] == ["Kept"]
+        assert reloaded.get_task(keep_id).priority == Priority.HIGH
+
+    def test_compaction_on_threshold(self, tmp_path):
+        """Test the journal is folded into the snapshot at the threshold."""
+        storage = JournalStorage(tmp_path / "tasks.json", compact_threshold=3)
+        manager = TaskManager(storage=storage)
+        for i in range(4):
+            manager.add_task(title=f"Task {i}")
+
+        assert len(json.loads(storage.path.read_text(encoding="utf-8"))) == 3
+        assert len(storage.journal_path.read_text(encoding="utf-8").splitlines()) == 2
+
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in reloaded.get_tasks()] == [f"Task {i}" for i in range(4)]
+
+    def test_torn_final_record_is_ignored(self, storage):
+        """Test a partially written journal line does not break load."""
+        manager = TaskManager(storage=storage)
+        manager.add_task(title="Complete")
+        with open(storage.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "task": {"ti')
+
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in reloaded.get_tasks()] == ["Complete"]
+
+    def test_append_after_torn_record_starts_new_line(self, storage):
+        """Test writes after a torn journal line survive a reload."""
+        manager = TaskManager(storage=storage)
+        manager.add_task(title="Before")
+        with open(storage.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "task": {"ti')
+
+        restarted = TaskManager(storage=JournalStorage(storage.path))
+        restarted.add_task(title="After")
+        restarted.add_task(title="Later")
+
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in reloaded.get_tasks()] == ["Before", "After", "Later"]
+
+    def test_invalid_record_before_the_end_raises(self, storage):
+        """Test a complete journal line that cannot be parsed is not skipped."""
+        manager = TaskManager(storage=storage)
+        manager.add_task(title="First")
+        with open(storage.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "task": {"ti\n')
+        manager.add_task(title="Second")
+
+        with pytest.raises(ValueError, match="invalid record"):
+            JournalStorage(storage.path).load()
+
+    def test_crash_before_journal_reset_skips_old_journal(self, tmp_path, monkeypatch):
+        """Test a journal left over from before the latest snapshot is not replayed."""
+        storage = JournalStorage(tmp_path / "tasks.json", compact_threshold=2)
+        manager = TaskManager(storage=storage)
+        task_id = manager.add_task(title="v1")
+        write_atomic = JournalStorage._write_atomic
+
+        def crash_on_journal(self, path, text):
+            if path == self.journal_path:
+                raise OSError("crashed")
+            write_atomic(self, path, text)
+
+        monkeypatch.setattr(JournalStorage, "_write_atomic", crash_on_journal)
+        with pytest.raises(OSError):
+            # Reaches the threshold: v2 goes to the snapshot, not the journal.
+            manager.update_task(task_id, title="v2")
+        monkeypatch.undo()
+
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert reloaded.get_task(task_id).title == "v2"
+        reloaded.add_task(title="After")
+        restarted = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in restarted.get_tasks()] == ["v2", "After"]
+
+    def test_save_writes_snapshot_compatible_with_json_storage(self, storage):
+        """Test a forced save produces a plain JSON snapshot."""
+        manager = TaskManager(storage=storage)
+        manager.add_task(title="Task")
+        manager.save(force=True)
+
+        assert len(storage.journal_path.read_text(encoding="utf-8").splitlines()) == 1
+        assert [t.title for t in JSONStorage(storage.path).load()] == ["Task"]
+
+    def test_iter_tasks_replays_journal(self, storage):
+        """Test iterating includes mutations that are only in the journal."""
+        manager = TaskManager(storage=storage)
+        manager.add_task(title="Journaled")
+
+        assert [t.title for t in JournalStorage(storage.path).iter_tasks()] == ["Journaled"]
+
+    def test_batch_appends_all_records_in_one_write(self, storage):
+        """Test a batch appends its mutations to the journal together."""
+        manager = TaskManager(storage=storage)
+        with manager.batch():
+            task_id = manager.add_task(title="Task")
+            manager.update_task(task_id, title="Renamed")
+
+        lines = storage.journal_path.read_text(encoding="utf-8").splitlines()[1:]
+        assert [json.loads(line)["op"] for line in lines] == ["add", "update"]
+        reloaded = TaskManager(storage=JournalStorage(storage.path))
+        assert [t.title for t in reloaded.get_tasks()] == ["Renamed"]
+
+
+class TestSharedStorage:
+    """Test cases for several managers sharing one storage file."""
+
+    @requires_fcntl
+    def test_lock_excludes_other_instances(self, tmp_path):
+        """Test an exclusive lock blocks another storage on the same file."""
+        first = JSONStorage(tmp_path / "tasks.json")
+        second = JSONStorage(tmp_path / "tasks.json")
+        events = []
+
+        def take_lock():
+            with second.lock():
+                events.append("second")
+
+        with first.lock():
+            thread = threading.Thread(target=take_lock)
+            thread.start()
+            time.sleep(0.05)
+            events.append("first")
+        thread.join()
+        first.close()
+        second.close()
+
+        assert events == ["first", "second"]
+
+    @requires_fcntl
+    def test_lock_upgrade_raises(self, tmp_path):
+        """Test requesting an exclusive lock inside a shared one is refused."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        with storage.lock(shared=True):
+            with storage.lock(shared=True):
+                pass
+            with pytest.raises(RuntimeError):
+                with storage.lock():
+                    pass
+        storage.close()
+
+    @requires_fcntl
+    def test_shared_lock_from_threads(self, tmp_path):
+        """Test threads sharing the lock leave it released, so it can be taken exclusively."""
+        storage = JSONStorage(tmp_path / "tasks.json")
+        barrier = threading.Barrier(8)
+
+        def hold():
+            with storage.lock(shared=True):
+                barrier.wait()
+            for _ in range(200):
+                with storage.lock(shared=True):
+                    pass
+
+        threads = [threading.Thread(target=hold) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert storage._lock_depth == 0
+        with storage.lock():
+            assert storage._lock_exclusive
+        storage.close()
+
+    def test_signature_changes_on_write(self, tmp_path):
+        """Test the storage fingerprint changes with every save and append."""
+        storage = JournalStorage(tmp_path / "tasks.json")
+        signatures = [storage.signature()]
+        storage.save([Task(title="A")])
+        signatures.append(storage.signature())
+        storage.record("add", Task(title="B"), [])
+        signatures.append(storage.signature())
+
+        assert len(set(signatures)) == 3
+
+    def test_json_managers_do_not_lose_updates(self, tmp_path):
+        """Test two managers on one JSON file both keep their tasks."""
+        path = str(tmp_path / "tasks.json")
+        first = TaskManager(storage_path=path, shared=True)
+        second = TaskManager(storage_path=path, shared=True)
+        first.add_task(title="First")
+        second.add_task(title="Second")
+
+        assert [t.title for t in first.get_tasks()] == ["First", "Second"]
+        assert [t.title for t in JSONStorage(path).load()] == ["First", "Second"]
+
+    def test_journal_refresh_is_incremental(self, tmp_path, monkeypatch):
+        """Test journal changes are applied without reloading the snapshot."""
+        path = tmp_path / "tasks.json"
+        first = TaskManager(storage=JournalStorage(path), shared=True)
+        second = TaskManager(storage=JournalStorage(path), shared=True)
+        keep_id = first.add_task(title="Keep")
+        drop_id = first.add_task(title="Drop")
+        kept = second.get_task(keep_id)
+
+        def fail():
+            raise AssertionError("full reload")
+
+        monkeypatch.setattr(second.storage, "load", fail)
+        first.update_task(keep_id, status=Status.COMPLETED)
+        first.delete_task(drop_id)
+
+        assert second.get_task(drop_id) is None
+        assert second.get_task(keep_id) is kept
+        assert second.filter_tasks(status=Status.COMPLETED) == [kept]
+        assert second.refresh() is False
+
+    def test_journal_compaction_forces_full_reload(self, tmp_path):
+        """Test a snapshot rewritten by another manager is reloaded."""
+        path = tmp_path / "tasks.json"
+        first = TaskManager(storage=JournalStorage(path, compact_threshold=2), shared=True)
+        second = TaskManager(storage=JournalStorage(path), shared=True)
+        for i in range(3):
+            first.add_task(title=f"Task {i}")
+
+        assert [t.title for t in second.get_tasks()] == ["Task 0", "Task 1", "Task 2"]
+
+    def test_shared_rejects_background_save(self, tmp_path):
+        """Test shared storage cannot be written from a background thread."""
+        with pytest.raises(ValueError):
+            TaskManager(
+                storage_path=str(tmp_path / "tasks.json"), shared=True, background_save=True
+            )
+
+    @requires_fcntl
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_concurrent_processes(self, tmp_path, journal):
+        """Test worker processes writing one file lose no updates."""
+        path = tmp_path / "tasks.json"
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_add_from_process, args=(path, journal, 15)) for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        storage = JournalStorage(path) if journal else JSONStorage(path)
+        tasks = storage.load()
+        assert len(tasks) == 60
+        assert all(task.status == Status.COMPLETED for task in tasks)